@@ -0,0 +1,43 @@
+"""add_name_trigram_indexes
+
+Revision ID: a3c8e1f5d907
+Revises: f17b3d9e6c52
+Create Date: 2026-10-17 16:20:09.447213
+
+pg_trgm GIN indexes for fuzzy people and tag profile search
+(app/utils/name_search.py). Postgres only; SQLite searches with LIKE.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e1f5d907'
+down_revision: Union[str, None] = 'f17b3d9e6c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_users_username_trgm', 'users', 'username'),
+    ('ix_users_display_name_trgm', 'users', 'display_name'),
+    ('ix_users_full_name_trgm', 'users', 'full_name'),
+    ('ix_tag_profiles_name_trgm', 'tag_profiles', 'name'),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(name, table, [column], unique=False,
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table, postgresql_using='gin')
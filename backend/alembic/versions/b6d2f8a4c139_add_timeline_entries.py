@@ -0,0 +1,47 @@
+"""add_timeline_entries
+
+Revision ID: b6d2f8a4c139
+Revises: a3c8e1f5d907
+Create Date: 2026-10-17 18:02:44.615380
+
+Precomputed per-viewer "following" feed (app/services/timeline.py).
+Populate existing data afterwards with scripts/rebuild_timelines.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f8a4c139'
+down_revision: Union[str, None] = 'a3c8e1f5d907'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'timeline_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'event_id')
+    )
+    op.create_index('ix_timeline_user_start_date', 'timeline_entries', ['user_id', 'start_date', 'event_id'], unique=False)
+    op.create_index('ix_timeline_user_created_at', 'timeline_entries', ['user_id', 'created_at', 'event_id'], unique=False)
+    op.create_index('ix_timeline_author_user', 'timeline_entries', ['author_id', 'user_id'], unique=False)
+    op.create_index('ix_timeline_event', 'timeline_entries', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timeline_event', table_name='timeline_entries')
+    op.drop_index('ix_timeline_author_user', table_name='timeline_entries')
+    op.drop_index('ix_timeline_user_created_at', table_name='timeline_entries')
+    op.drop_index('ix_timeline_user_start_date', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
@@ -0,0 +1,37 @@
+"""add_event_keyset_indexes
+
+Revision ID: c41d7e9a2f03
+Revises: 1b7097086e16
+Create Date: 2026-10-17 09:12:31.518204
+
+Composite (date, id) indexes backing keyset pagination of event lists.
+events.created_at becomes NOT NULL: a NULL sort key sorts first under DESC
+on Postgres, can never be reached by a "created_at < cursor" page and
+cannot be written into a cursor.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a2f03'
+down_revision: Union[str, None] = '1b7097086e16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows from before created_at had a default get their event date
+    op.execute("UPDATE events SET created_at = COALESCE(start_date, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.alter_column('events', 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_events_start_date_id', 'events', ['start_date', 'id'], unique=False)
+    op.create_index('ix_events_created_at_id', 'events', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_created_at_id', table_name='events')
+    op.drop_index('ix_events_start_date_id', table_name='events')
+    op.alter_column('events', 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,61 @@
+"""add_event_audience
+
+Revision ID: c9e4a7b2d815
+Revises: b6d2f8a4c139
+Create Date: 2026-10-17 19:36:12.804117
+
+Materialized audience (ACL) of followers / close_family / custom_group
+events (app/services/event_audience.py), backfilled here with the same
+rules so EVENT_PRIVACY_BACKEND=audience is correct right after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a7b2d815'
+down_revision: Union[str, None] = 'b6d2f8a4c139'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_SQL = """
+INSERT INTO event_audience (event_id, user_id)
+SELECT e.id, f.follower_id
+FROM events e
+JOIN follows f ON f.following_id = e.author_id AND f.status = 'accepted'
+WHERE COALESCE(e.privacy_level, '') = 'followers'
+   OR (COALESCE(e.privacy_level, '') = 'close_family' AND f.is_close_family = TRUE)
+UNION
+SELECT e.id, m.user_id
+FROM events e
+JOIN custom_group_members m ON m.group_id = e.custom_group_id
+WHERE COALESCE(e.privacy_level, '') = 'custom_group'
+UNION
+SELECT e.id, f.follower_id
+FROM events e
+JOIN event_tags t ON t.event_id = e.id AND t.status = 'accepted'
+JOIN follows f ON f.following_id = t.tagged_user_id AND f.status = 'accepted'
+WHERE COALESCE(e.privacy_level, '') NOT IN ('public', 'private', 'followers', 'close_family')
+  AND NOT (COALESCE(e.privacy_level, '') = 'custom_group' AND e.custom_group_id IS NULL)
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_audience',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('event_id', 'user_id')
+    )
+    op.create_index('ix_event_audience_user_event', 'event_audience', ['user_id', 'event_id'], unique=False)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_audience_user_event', table_name='event_audience')
+    op.drop_table('event_audience')
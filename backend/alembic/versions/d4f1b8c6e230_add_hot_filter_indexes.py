@@ -0,0 +1,61 @@
+"""add_hot_filter_indexes
+
+Revision ID: d4f1b8c6e230
+Revises: c9e4a7b2d815
+Create Date: 2026-10-17 21:04:47.362918
+
+Composite indexes for the hot lookups (follow checks, author pages, tag
+requests, comment threads, galleries, viewer notification rate limits),
+and partial indexes over live events (is_deleted = false). media_likes
+needs nothing new: uq_media_like_user (event_image_id, user_id) already
+serves lookups by event_image_id.
+
+scripts/replay_query_plans.py compares plans and timings with and without
+these indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1b8c6e230'
+down_revision: Union[str, None] = 'c9e4a7b2d815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_follows_follower_following_status', 'follows', ['follower_id', 'following_id', 'status'], unique=False)
+    op.create_index('ix_follows_following_status', 'follows', ['following_id', 'status'], unique=False)
+    op.create_index(
+        'ix_events_live_start_date_id', 'events', ['start_date', 'id'], unique=False,
+        postgresql_where=sa.text('is_published = true AND is_deleted = false'),
+        sqlite_where=sa.text('is_published = 1 AND is_deleted = 0')
+    )
+    op.create_index(
+        'ix_events_author_published_start_date', 'events', ['author_id', 'is_published', 'start_date'], unique=False,
+        postgresql_where=sa.text('is_deleted = false'),
+        sqlite_where=sa.text('is_deleted = 0')
+    )
+    op.create_index('ix_event_tags_tagged_user_status', 'event_tags', ['tagged_user_id', 'status'], unique=False)
+    op.create_index('ix_event_tags_event_status', 'event_tags', ['event_id', 'status'], unique=False)
+    op.create_index('ix_comments_event_created_at', 'comments', ['event_id', 'created_at'], unique=False)
+    op.create_index('ix_event_images_event_order', 'event_images', ['event_id', 'order_index'], unique=False)
+    op.create_index(
+        'ix_viewer_notification_logs_viewer_author_sent', 'viewer_notification_logs',
+        ['viewer_id', 'event_author_id', 'sent_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_viewer_notification_logs_viewer_author_sent', table_name='viewer_notification_logs')
+    op.drop_index('ix_event_images_event_order', table_name='event_images')
+    op.drop_index('ix_comments_event_created_at', table_name='comments')
+    op.drop_index('ix_event_tags_event_status', table_name='event_tags')
+    op.drop_index('ix_event_tags_tagged_user_status', table_name='event_tags')
+    op.drop_index('ix_events_author_published_start_date', table_name='events')
+    op.drop_index('ix_events_live_start_date_id', table_name='events')
+    op.drop_index('ix_follows_following_status', table_name='follows')
+    op.drop_index('ix_follows_follower_following_status', table_name='follows')
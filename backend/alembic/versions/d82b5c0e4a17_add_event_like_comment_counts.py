@@ -0,0 +1,36 @@
+"""add_event_like_comment_counts
+
+Revision ID: d82b5c0e4a17
+Revises: c41d7e9a2f03
+Create Date: 2026-10-17 11:03:52.240917
+
+Denormalized like/comment counters on events, backfilled from the source tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82b5c0e4a17'
+down_revision: Union[str, None] = 'c41d7e9a2f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('like_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('events', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing likes/comments
+    op.execute("""
+        UPDATE events SET
+            like_count = (SELECT COUNT(*) FROM likes WHERE likes.event_id = events.id),
+            comment_count = (SELECT COUNT(*) FROM comments WHERE comments.event_id = events.id)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'comment_count')
+    op.drop_column('events', 'like_count')
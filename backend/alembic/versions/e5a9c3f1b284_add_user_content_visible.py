@@ -0,0 +1,37 @@
+"""add_user_content_visible
+
+Revision ID: e5a9c3f1b284
+Revises: d82b5c0e4a17
+Create Date: 2026-10-17 13:27:05.664310
+
+Materialized author-visibility flag, backfilled with the same rule as
+utils.privacy.is_user_subscription_active().
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f1b284'
+down_revision: Union[str, None] = 'd82b5c0e4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('content_visible', sa.Boolean(), nullable=False, server_default=sa.true()))
+    op.execute("""
+        UPDATE users SET content_visible = COALESCE(
+            (subscription_tier IN ('premium', 'family') AND subscription_status IN ('active', 'canceled'))
+            OR (subscription_status = 'trial' AND (trial_end_date IS NULL OR trial_end_date > CURRENT_TIMESTAMP)),
+            false
+        )
+    """)
+    op.create_index(op.f('ix_users_content_visible'), 'users', ['content_visible'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_content_visible'), table_name='users')
+    op.drop_column('users', 'content_visible')
@@ -0,0 +1,55 @@
+"""add_event_search_index
+
+Revision ID: f17b3d9e6c52
+Revises: e5a9c3f1b284
+Create Date: 2026-10-17 15:02:44.118530
+
+Full-text search over events (see app/utils/event_search.py).
+
+Postgres: weighted tsvector column with a GIN index, backfilled here with
+tags stripped by regexp. SQLite: an FTS5 table seeded with the raw
+description; run scripts/rebuild_search_index.py afterwards to re-index
+plain text.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f17b3d9e6c52'
+down_revision: Union[str, None] = 'e5a9c3f1b284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.add_column('events', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute("""
+            UPDATE events SET search_vector =
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector('english', regexp_replace(coalesce(description, ''), '<[^>]+>', ' ', 'g')), 'C')
+        """)
+        op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+    else:
+        op.add_column('events', sa.Column('search_vector', sa.Text(), nullable=True))
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts "
+            "USING fts5(title, summary, body, tokenize='porter unicode61')"
+        )
+        op.execute("""
+            INSERT INTO events_fts (rowid, title, summary, body)
+            SELECT id, coalesce(title, ''), coalesce(summary, ''), coalesce(description, '') FROM events
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_events_search_vector', table_name='events', postgresql_using='gin')
+    else:
+        op.execute("DROP TABLE IF EXISTS events_fts")
+    op.drop_column('events', 'search_vector')
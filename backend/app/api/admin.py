@@ -347,13 +347,60 @@ def toggle_event_visibility(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
+    from ..services.timeline import fan_out_event
+
     event.is_deleted = not event.is_deleted
+    fan_out_event(db, event)  # Removes a hidden event, restores a restored one
     db.commit()
 
     action = "hidden" if event.is_deleted else "restored"
     return {"message": f"Event '{event.title}' {action}", "is_deleted": event.is_deleted}
 
 
+@router.post("/events/recount-counters")
+def recount_counters(
+    current_user: User = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """Rebuild denormalized like/comment counters on events. Superuser only."""
+    from ..utils.event_counters import recount_event_counters
+
+    corrected = recount_event_counters(db)
+    return {"message": f"Corrected counters on {corrected} events", "events_corrected": corrected}
+
+
+@router.post("/users/sweep-expired-trials")
+def sweep_trials(
+    current_user: User = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """Hide content from users whose trial has lapsed. Superuser only."""
+    from ..utils.privacy import sweep_expired_trials
+
+    hidden = sweep_expired_trials(db)
+    return {"message": f"Hid content for {hidden} expired trial users", "users_hidden": hidden}
+
+
+@router.get("/db/pool")
+def db_pool_status(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Connection pool mode, checkout/wait/overflow counters for this process. Superuser only."""
+    from ..core.database import get_pool_status
+
+    return get_pool_status()
+
+
+@router.get("/cpu/pool")
+def cpu_pool_status(
+    current_user: User = Depends(get_current_superuser)
+):
+    """CPU pool mode, limits and admission/rejection counters for this process. Superuser only."""
+    from ..utils.cpu_pool import get_cpu_pool_status
+
+    return get_cpu_pool_status()
+
+
 # ========================================
 # Feedback Management
 # ========================================
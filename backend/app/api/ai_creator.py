@@ -244,8 +244,15 @@ async def cluster_photos_endpoint(
         raise HTTPException(status_code=400, detail="Too many photos (max 500 per import)")
 
     from ..utils.photo_clustering import cluster_photos
+    from ..utils.cpu_pool import run_cpu_bound, CPUPoolSaturated
     try:
-        return cluster_photos([p.model_dump() for p in request.photos])
+        return await run_cpu_bound(cluster_photos, [p.model_dump() for p in request.photos])
+    except CPUPoolSaturated:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many imports are being analyzed right now. Please try again in a moment.",
+            headers={"Retry-After": "5"}
+        )
     except Exception as e:
         logger.error(f"Photo clustering failed: {e}")
         raise HTTPException(status_code=500, detail="Could not analyze these photos. Please try again.")
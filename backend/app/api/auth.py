@@ -10,6 +10,7 @@ from ..schemas.user import UserCreate, UserLogin, UserResponse, Token
 from ..services.email_service import send_welcome_email
 from ..models.invited_viewer import InvitedViewer
 from ..models.follow import Follow
+from ..utils.social_graph import invalidate_graph_snapshot
 from sqlalchemy import func
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -359,8 +360,16 @@ def create_supabase_profile(
 
         # Commit invitation/follow changes
         if invitations_processed:
+            from ..services.timeline import refresh_timeline_pair
+            from ..services.event_audience import refresh_audience_pair
+            for inv in invitations_processed:
+                refresh_timeline_pair(db, user.id, inv.inviter_id)
+                refresh_timeline_pair(db, inv.inviter_id, user.id)
+                refresh_audience_pair(db, user.id, inv.inviter_id)
+                refresh_audience_pair(db, inv.inviter_id, user.id)
             db.commit()
             db.refresh(user)
+            invalidate_graph_snapshot(user.id, *[inv.inviter_id for inv in invitations_processed])
 
         # Send welcome email
         try:
@@ -11,6 +11,7 @@ from ..models.event import Event
 from ..models.comment import Comment
 from ..models.comment_reaction import CommentReaction, REACTION_TYPES
 from ..services.email_service import send_new_comment_email
+from ..utils.event_counters import adjust_comment_count
 
 router = APIRouter(prefix="/events", tags=["comments"])
 
@@ -78,6 +79,7 @@ def create_comment(
     )
 
     db.add(new_comment)
+    adjust_comment_count(db, event_id, 1)
     db.commit()
     db.refresh(new_comment)
 
@@ -198,7 +200,13 @@ def delete_comment(
     if comment.author_id != current_user.id and event.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
 
+    # Replies cascade with the comment (max depth 2), so count the whole thread
+    removed = 1
+    for reply in comment.replies:
+        removed += 1 + len(reply.replies)
+
     db.delete(comment)
+    adjust_comment_count(db, event_id, -removed)
     db.commit()
 
     return {"message": "Comment deleted successfully"}
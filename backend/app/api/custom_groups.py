@@ -6,6 +6,9 @@ from ..core.deps import get_current_user
 from ..models.user import User
 from ..models.custom_group import CustomGroup, CustomGroupMember
 from ..models.follow import Follow
+from ..utils.social_graph import invalidate_graph_snapshot, invalidate_graph_snapshots
+from ..services.timeline import refresh_group_member, refresh_event_timelines
+from ..services.event_audience import rebuild_event_audience, refresh_audience_pair
 from ..schemas.custom_group import (
     CustomGroupCreate,
     CustomGroupUpdate,
@@ -154,6 +157,7 @@ def create_custom_group(
             })
 
         db.commit()
+        invalidate_graph_snapshots(m["user_id"] for m in members)
 
     return {
         "id": new_group.id,
@@ -232,8 +236,15 @@ def delete_custom_group(
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
+    member_ids = [m.user_id for m in group.members]
+    event_ids = [e.id for e in group.events]
+
     db.delete(group)
+    # Its events lose their group, so members lose them from their timelines
+    refresh_event_timelines(db, event_ids)
+    rebuild_event_audience(db, event_ids)
     db.commit()
+    invalidate_graph_snapshots(member_ids)
 
     return {"message": "Group deleted successfully"}
 
@@ -283,7 +294,10 @@ def add_group_member(
         user_id=user_id
     )
     db.add(member)
+    refresh_group_member(db, group_id, [user_id])
+    refresh_audience_pair(db, user_id, current_user.id)
     db.commit()
+    invalidate_graph_snapshot(user_id)
 
     return {"message": "Member added successfully"}
 
@@ -314,6 +328,9 @@ def remove_group_member(
         raise HTTPException(status_code=404, detail="Member not found in group")
 
     db.delete(member)
+    refresh_group_member(db, group_id, [user_id])
+    refresh_audience_pair(db, user_id, current_user.id)
     db.commit()
+    invalidate_graph_snapshot(user_id)
 
     return {"message": "Member removed successfully"}
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Optional
 from ..core.database import get_db
 from ..core.deps import get_current_user, get_current_user_optional
+from ..core.query_stats import query_budget
 from ..models.user import User
 from ..models.event import Event
 from ..models.event_tag import EventTag
 from ..models.tag_profile import TagProfile
-from ..models.follow import Follow
+from ..utils.batch_loader import BatchLoader, get_batch_loader
+from ..utils.event_projection import event_card_options
+from ..services.event_audience import rebuild_event_audience
 from ..schemas.event_tag import (
     EventTagCreate,
     EventTagBulkCreate,
@@ -20,42 +22,51 @@ from ..schemas.event_tag import (
 router = APIRouter(prefix="/events", tags=["event-tags"])
 
 
-def build_tag_response(tag: EventTag, db: Session) -> EventTagResponse:
-    """Build a complete tag response with user/profile details."""
-    response = EventTagResponse(
-        id=tag.id,
-        event_id=tag.event_id,
-        tagged_by_id=tag.tagged_by_id,
-        status=tag.status,
-        created_at=tag.created_at,
-        tagged_user_id=tag.tagged_user_id,
-        tag_profile_id=tag.tag_profile_id
-    )
+def build_tag_responses(tags: List[EventTag], loader: BatchLoader) -> List[EventTagResponse]:
+    """Build complete tag responses with user/profile details (one query per table)."""
+    loader.prime(User, (tag.tagged_user_id for tag in tags))
+    loader.prime(TagProfile, (tag.tag_profile_id for tag in tags if not tag.tagged_user_id))
+    loader.prime(User, (profile.created_by_id for profile in loader.get_many(TagProfile)))
+
+    responses = []
+    for tag in tags:
+        response = EventTagResponse(
+            id=tag.id,
+            event_id=tag.event_id,
+            tagged_by_id=tag.tagged_by_id,
+            status=tag.status,
+            created_at=tag.created_at,
+            tagged_user_id=tag.tagged_user_id,
+            tag_profile_id=tag.tag_profile_id
+        )
+
+        if tag.tagged_user_id:
+            user = loader.get(User, tag.tagged_user_id)
+            if user:
+                response.tagged_user_username = user.username
+                response.tagged_user_display_name = user.display_name or user.full_name
+                response.tagged_user_avatar_url = user.avatar_url
+        elif tag.tag_profile_id:
+            profile = loader.get(TagProfile, tag.tag_profile_id)
+            if profile:
+                response.tag_profile_name = profile.name
+                response.tag_profile_photo_url = profile.photo_url
+                response.tag_profile_relationship = profile.relationship_to_creator
+                creator = loader.get(User, profile.created_by_id)
+                if creator:
+                    response.tag_profile_created_by_username = creator.username
+
+        responses.append(response)
+
+    return responses
 
-    if tag.tagged_user_id:
-        user = db.query(User).filter(User.id == tag.tagged_user_id).first()
-        if user:
-            response.tagged_user_username = user.username
-            response.tagged_user_display_name = user.display_name or user.full_name
-            response.tagged_user_avatar_url = user.avatar_url
-    elif tag.tag_profile_id:
-        profile = db.query(TagProfile).filter(TagProfile.id == tag.tag_profile_id).first()
-        if profile:
-            response.tag_profile_name = profile.name
-            response.tag_profile_photo_url = profile.photo_url
-            response.tag_profile_relationship = profile.relationship_to_creator
-            creator = db.query(User).filter(User.id == profile.created_by_id).first()
-            if creator:
-                response.tag_profile_created_by_username = creator.username
-
-    return response
-
-
-@router.get("/{event_id}/tags", response_model=List[EventTagResponse])
+
+@router.get("/{event_id}/tags", response_model=List[EventTagResponse], dependencies=[Depends(query_budget(8))])
 def get_event_tags(
     event_id: int,
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all tags for an event. Only accepted tags are returned for non-owners."""
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -71,7 +82,7 @@ def get_event_tags(
         query = query.filter(EventTag.status == "accepted")
 
     tags = query.all()
-    return [build_tag_response(tag, db) for tag in tags]
+    return build_tag_responses(tags, loader)
 
 
 @router.post("/{event_id}/tags", response_model=List[EventTagResponse])
@@ -80,7 +91,8 @@ def add_event_tags(
     tags: EventTagBulkCreate,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """
     Add tags to an event. Only the event owner can add tags.
@@ -166,9 +178,11 @@ def add_event_tags(
         db.flush()  # Get the ID without committing
         created_tags.append(new_tag)
 
+    # Followers of accepted tagged users may now see the event
+    rebuild_event_audience(db, [event_id])
     db.commit()
 
-    return [build_tag_response(tag, db) for tag in created_tags]
+    return build_tag_responses(created_tags, loader)
 
 
 @router.delete("/{event_id}/tags/{tag_id}")
@@ -209,6 +223,7 @@ def remove_event_tag(
         )
 
     db.delete(tag)
+    rebuild_event_audience(db, [event_id])
     db.commit()
 
     return {"message": "Tag removed"}
@@ -218,10 +233,11 @@ def remove_event_tag(
 tag_requests_router = APIRouter(prefix="/me", tags=["tag-requests"])
 
 
-@tag_requests_router.get("/tag-requests", response_model=List[TagRequestResponse])
+@tag_requests_router.get("/tag-requests", response_model=List[TagRequestResponse], dependencies=[Depends(query_budget(6))])
 def get_my_tag_requests(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all pending tag requests for the current user."""
     tags = db.query(EventTag).filter(
@@ -229,10 +245,13 @@ def get_my_tag_requests(
         EventTag.status == "pending"
     ).order_by(EventTag.created_at.desc()).all()
 
+    loader.options(Event, event_card_options()).prime(Event, (tag.event_id for tag in tags))
+    loader.prime(User, (tag.tagged_by_id for tag in tags))
+
     results = []
     for tag in tags:
-        event = db.query(Event).filter(Event.id == tag.event_id).first()
-        tagged_by = db.query(User).filter(User.id == tag.tagged_by_id).first()
+        event = loader.get(Event, tag.event_id)
+        tagged_by = loader.get(User, tag.tagged_by_id)
 
         if event and tagged_by:
             results.append(TagRequestResponse(
@@ -290,6 +309,7 @@ def accept_tag_request(
         )
 
     tag.status = "accepted"
+    rebuild_event_audience(db, [tag.event_id])
     db.commit()
 
     return {"message": "Tag accepted"}
@@ -328,7 +348,8 @@ def reject_tag_request(
 @tag_requests_router.get("/tag-requests/sent", response_model=List[TagRequestResponse])
 def get_my_sent_tag_requests(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all tag requests that the current user has sent (where they are the tagger)."""
     tags = db.query(EventTag).filter(
@@ -336,10 +357,13 @@ def get_my_sent_tag_requests(
         EventTag.tagged_user_id.isnot(None)  # Only user tags, not profile tags
     ).order_by(EventTag.created_at.desc()).all()
 
+    loader.options(Event, event_card_options()).prime(Event, (tag.event_id for tag in tags))
+    loader.prime(User, (tag.tagged_user_id for tag in tags))
+
     results = []
     for tag in tags:
-        event = db.query(Event).filter(Event.id == tag.event_id).first()
-        tagged_user = db.query(User).filter(User.id == tag.tagged_user_id).first()
+        event = loader.get(Event, tag.event_id)
+        tagged_user = loader.get(User, tag.tagged_user_id)
 
         if event and tagged_user:
             results.append(TagRequestResponse(
@@ -367,43 +391,39 @@ def get_my_sent_tag_requests(
 def get_tagged_events(
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all events where the current user is tagged (accepted tags only)."""
+    from ..utils.pagination import paginate_events, NEXT_CURSOR_HEADER
+    from ..utils.serialization import EVENT_SUMMARIES, event_summary, json_response
+    from sqlalchemy.orm import selectinload
+
     tagged_event_ids = db.query(EventTag.event_id).filter(
         EventTag.tagged_user_id == current_user.id,
         EventTag.status == "accepted"
     ).subquery()
 
-    events = db.query(Event).filter(
+    query = db.query(Event).options(
+        event_card_options(),
+        selectinload(Event.author)
+    ).filter(
         Event.id.in_(tagged_event_ids),
         Event.is_published == True,
         Event.is_deleted == False
-    ).order_by(Event.start_date.desc()).offset(skip).limit(limit).all()
-
-    results = []
-    for event in events:
-        author = event.author
-        results.append({
-            "id": event.id,
-            "title": event.title,
-            "summary": event.summary,
-            "start_date": event.start_date.isoformat() if event.start_date else None,
-            "cover_image_url": event.cover_image_url,
-            "author_id": event.author_id,
-            "author_username": author.username if author else None,
-            "author_display_name": author.display_name or author.full_name if author else None
-        })
+    )
+    events, next_cursor = paginate_events(query, cursor=cursor, skip=skip, limit=limit)
 
-    return results
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(EVENT_SUMMARIES, [event_summary(event) for event in events], headers)
 
 
 # Combined search endpoint for tagging UI
 search_router = APIRouter(prefix="/search", tags=["tag-search"])
 
 
-@search_router.get("/taggable", response_model=List[SearchableTagTarget])
+@search_router.get("/taggable", response_model=List[SearchableTagTarget], dependencies=[Depends(query_budget(4))])
 def search_taggable(
     q: str,
     current_user: User = Depends(get_current_user),
@@ -417,70 +437,33 @@ def search_taggable(
     2. Tag profiles created by people the current user follows
     3. Other matching results
     """
-    if not q or len(q) < 1:
+    if not q or not q.strip():
         return []
 
-    search_term = f"%{q}%"
-    results = []
+    from ..services.tag_search import search_tag_targets
 
-    # Get IDs of users the current user follows
-    following_ids = [f.following_id for f in db.query(Follow.following_id).filter(
-        Follow.follower_id == current_user.id,
-        Follow.status == "accepted"
-    ).all()]
-
-    # Search users
-    users = db.query(User).filter(
-        or_(
-            User.username.ilike(search_term),
-            User.display_name.ilike(search_term),
-            User.full_name.ilike(search_term)
-        ),
-        User.id != current_user.id  # Don't include self
-    ).limit(10).all()
-
-    for user in users:
-        # Check if this user is followed
-        is_followed = user.id in following_ids
-
-        results.append(SearchableTagTarget(
-            type="user",
-            id=user.id,
-            name=user.display_name or user.full_name or user.username,
-            display_name=user.display_name or user.full_name,
-            photo_url=user.avatar_url,
-            username=user.username
-        ))
-
-    # Search tag profiles
-    profiles = db.query(TagProfile).join(
-        User, TagProfile.created_by_id == User.id
-    ).filter(
-        TagProfile.name.ilike(search_term),
-        TagProfile.is_merged == False
-    ).limit(10).all()
-
-    for profile in profiles:
-        creator = db.query(User).filter(User.id == profile.created_by_id).first()
-        results.append(SearchableTagTarget(
-            type="profile",
-            id=profile.id,
-            name=profile.name,
-            photo_url=profile.photo_url,
-            relationship_to_creator=profile.relationship_to_creator,
-            created_by_username=creator.username if creator else None
-        ))
-
-    # Sort: followed users/profiles first
-    def sort_key(item):
-        if item.type == "user":
-            return (0 if item.id in following_ids else 1, item.name.lower())
-        else:
-            # For profiles, check if creator is followed
-            creator = db.query(User).filter(User.username == item.created_by_username).first()
-            is_creator_followed = creator and creator.id in following_ids
-            return (0 if is_creator_followed else 1, item.name.lower())
+    # One statement: users and profiles, followed-first, creator names joined in
+    targets = search_tag_targets(db, current_user.id, q, per_kind_limit=10, limit=20)
 
-    results.sort(key=sort_key)
+    results = []
+    for target in targets:
+        if target.type == "user":
+            results.append(SearchableTagTarget(
+                type="user",
+                id=target.id,
+                name=target.name,
+                display_name=target.display_name,
+                photo_url=target.photo_url,
+                username=target.username
+            ))
+        else:
+            results.append(SearchableTagTarget(
+                type="profile",
+                id=target.id,
+                name=target.name,
+                photo_url=target.photo_url,
+                relationship_to_creator=target.relationship_to_creator,
+                created_by_username=target.created_by_username
+            ))
 
-    return results[:20]  # Limit total results
+    return results
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import re
 from ..core.database import get_db
 from ..core.deps import get_current_user, get_current_user_optional, require_not_demo
+from ..core.query_stats import query_budget
 from ..models.user import User
 from ..models.event import Event
 from ..models.content_block import ContentBlock
@@ -14,6 +15,12 @@ from ..models.follow import Follow
 from ..schemas.event import EventCreate, EventUpdate, EventResponse, ContentBlockCreate, ContentBlockResponse
 from ..utils.location_validator import validate_location_count, extract_location_markers
 from ..utils.slug import generate_unique_slug
+from ..utils.feed_cache import invalidate_feed_cache
+from ..utils.event_search import index_event
+from ..services.timeline import (
+    FOLLOWING_FEED, TIMELINE_FIELDS, fan_out_event, remove_event_from_timelines, get_timeline_page
+)
+from ..services.event_audience import AUDIENCE_FIELDS, rebuild_event_audience
 from ..services.email_service import send_new_event_notification_email
 
 
@@ -175,30 +182,67 @@ def build_event_dict(event):
         "share_expires_at": event.share_expires_at,
         "created_at": event.created_at,
         "updated_at": event.updated_at,
-        "like_count": len(event.likes) if hasattr(event, 'likes') and event.likes else 0,
-        "comment_count": len(event.comments) if hasattr(event, 'comments') and event.comments else 0,
+        "like_count": event.like_count or 0,
+        "comment_count": event.comment_count or 0,
         "content_blocks": [],  # Empty - content is in description field
         "locations": locations,  # Properly serialized locations
         "event_images": images  # Include event_images with captions
     }
 
-@router.get("", response_model=List[EventResponse])
+@router.get("", response_model=List[EventResponse], dependencies=[Depends(query_budget(8))])
 def get_events(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
     order_by: str = "event_date",  # "event_date" (start_date) or "upload_date" (created_at)
+    cursor: Optional[str] = None,  # Opaque keyset cursor from X-Next-Cursor (replaces skip)
+    feed: str = "all",  # "all" (everyone visible) or "following" (precomputed timeline)
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     try:
         from sqlalchemy.orm import selectinload
         from ..utils.privacy import filter_events_for_feed
+        from ..utils.pagination import paginate_events, NEXT_CURSOR_HEADER
+        from ..utils.event_projection import event_card_options
+        from ..utils.serialization import EVENT_CARDS, event_card, json_response
+        from ..utils.feed_cache import (
+            feed_cache_key, feed_cache_generation, get_cached_feed, store_feed, feed_response
+        )
+
+        # Following feed: read the viewer's precomputed timeline (services/timeline.py)
+        if feed == FOLLOWING_FEED:
+            if not current_user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Sign in to see events from people you follow"
+                )
+            events, next_cursor = get_timeline_page(
+                db,
+                current_user,
+                order_by=order_by,
+                cursor=cursor,
+                limit=limit,
+                category=category,
+                event_options=(event_card_options(),)
+            )
+            headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+            return json_response(EVENT_CARDS, [event_card(event) for event in events], headers)
+
+        # Anonymous and demo viewers share one feed per query - serve it from cache
+        cache_key = feed_cache_key(current_user, category, order_by, skip, limit, cursor)
+        if cache_key:
+            cached = get_cached_feed(cache_key)
+            if cached:
+                return feed_response(cached, request)
+            generation = feed_cache_generation()
 
-        print(f"[EVENTS] Fetching events with skip={skip}, limit={limit}, category={category}, order_by={order_by}, user={current_user.username if current_user else 'anonymous'}")
+        print(f"[EVENTS] Fetching events with skip={skip}, limit={limit}, cursor={cursor}, category={category}, order_by={order_by}, user={current_user.username if current_user else 'anonymous'}")
 
-        # Start with base query
+        # Start with base query (card columns only - description is never sent in the feed)
         query = db.query(Event).options(
+            event_card_options(),
             selectinload(Event.author)
         ).filter(
             Event.is_published == True,
@@ -225,70 +269,28 @@ def get_events(
             query = query.filter(Event.category == category)
 
         # Apply pagination and ordering
-        if is_demo:
-            # Pin showcase events to top for demo users
-            from sqlalchemy import case as sql_case
-            pin_order = sql_case(
-                (Event.is_demo_showcase == True, 0),
-                else_=1
-            )
-            date_col = Event.created_at if order_by == "upload_date" else Event.start_date
-            events = query.order_by(pin_order, date_col.desc()).offset(skip).limit(limit).all()
-        elif order_by == "upload_date":
-            events = query.order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
-        else:
-            events = query.order_by(Event.start_date.desc()).offset(skip).limit(limit).all()
-
+        # Demo users get showcase events pinned to the top
+        events, next_cursor = paginate_events(
+            query,
+            order_by=order_by,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            pinned=bool(is_demo)
+        )
         print(f"[EVENTS] Found {len(events)} events")
 
-        response = []
-        for i, event in enumerate(events):
-            try:
-                print(f"[EVENTS] Processing event {i+1}: id={event.id}, title={event.title}")
-                # Explicitly map fields - don't use **event.__dict__ as it includes SQLAlchemy internals
-                # NOTE: Don't include description in list view - it can be huge (rich text HTML + images)
-                # Description is only loaded in detail view to keep payload small
-                event_dict = {
-                    "id": event.id,
-                    "slug": event.slug,
-                    "title": event.title,
-                    "summary": event.summary,
-                    "description": "",  # Empty in list view - loaded in detail view only
-                    "start_date": event.start_date,
-                    "end_date": event.end_date,
-                    "location_name": event.location_name,
-                    "latitude": event.latitude,
-                    "longitude": event.longitude,
-                    "cover_image_url": event.cover_image_url,
-                    "has_multiple_locations": event.has_multiple_locations,
-                    "author_id": event.author_id,
-                    "author_username": event.author.username,
-                    "author_full_name": event.author.full_name,
-                    "view_count": event.view_count,
-                    "is_published": event.is_published,
-                    "privacy_level": event.privacy_level or "public",
-                    "category": event.category,
-                    "custom_group_id": event.custom_group_id,
-                    "share_enabled": event.share_enabled or False,
-                    "share_expires_at": event.share_expires_at,
-                    "created_at": event.created_at,
-                    "updated_at": event.updated_at,
-                    "like_count": 0,  # TODO: Add later
-                    "comment_count": 0,  # TODO: Add later
-                    "content_blocks": [],  # Empty - content is in description field
-                    "locations": []  # Empty in list view - loaded in detail view
-                }
-                response.append(EventResponse.model_validate(event_dict))
-                print(f"[EVENTS] Successfully processed event {event.id}")
-            except Exception as e:
-                print(f"[EVENTS] ERROR processing event {event.id}: {e}")
-                import traceback
-                traceback.print_exc()
-                # Skip this event and continue
-                continue
-
-        print(f"[EVENTS] Returning {len(response)} events")
-        return response
+        # Rows go straight to JSON bytes (see utils/serialization.py);
+        # description is never loaded here - only the detail view sends it
+        cards = [event_card(event) for event in events]
+        if cache_key:
+            body = EVENT_CARDS.dump_json(cards)
+            return feed_response(store_feed(cache_key, body, next_cursor, generation), request)
+
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return json_response(EVENT_CARDS, cards, headers)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[EVENTS] FATAL ERROR: {e}")
         import traceback
@@ -354,6 +356,14 @@ def create_event(
     db.add(event)
     db.commit()
     db.refresh(event)
+    invalidate_feed_cache()
+
+    # Keep the full-text search index and follower timelines in step
+    index_event(db, event)
+    rebuild_event_audience(db, [event.id])
+    if event.is_published:
+        fan_out_event(db, event)
+    db.commit()
 
     # Extract and save location markers from HTML content
     if event.description:
@@ -483,8 +493,8 @@ def create_event(
             "share_expires_at": event.share_expires_at,
             "created_at": event.created_at,
             "updated_at": event.updated_at,
-            "like_count": 0,
-            "comment_count": 0,
+            "like_count": event.like_count or 0,
+            "comment_count": event.comment_count or 0,
             "content_blocks": [],
             "locations": event.locations if event.locations else [],
             "event_images": []
@@ -564,6 +574,36 @@ def get_last_event_location(
         }
     return None
 
+@router.get("/search", dependencies=[Depends(query_budget(10))])
+def search_events_endpoint(
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,  # Opaque keyset cursor from X-Next-Cursor
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_optional)
+):
+    """
+    Full-text search over published events (title, summary and description text).
+
+    Results are ranked by relevance, filtered with the same privacy rules as
+    event lists, and each includes a `snippet` with matches wrapped in <mark>.
+    """
+    from ..utils.event_search import search_events
+    from ..utils.pagination import NEXT_CURSOR_HEADER
+    from ..utils.serialization import EVENT_SEARCH_RESULTS, event_card, json_response
+
+    results, next_cursor = search_events(db, q, current_user, cursor=cursor, limit=limit)
+
+    rows = []
+    for event, rank, snippet in results:
+        row = event_card(event)
+        row["rank"] = rank
+        row["snippet"] = snippet
+        rows.append(row)
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(EVENT_SEARCH_RESULTS, rows, headers)
+
 @router.get("/{event_identifier}", response_model=EventResponse)
 def get_event(
     event_identifier: str,
@@ -630,16 +670,12 @@ def get_event(
             }
         )
 
-    event.view_count += 1
-    db.commit()
-
-    # Re-query with relationships loaded (refresh doesn't preserve joinedloads)
-    event = db.query(Event).options(
-        joinedload(Event.locations),
-        joinedload(Event.images)
-    ).filter(Event.id == event.id).first()
+    # Count the view (buffered; written in batches by utils/write_behind.py)
+    from ..utils.write_behind import record_event_view, pending_views
+    record_event_view(event.id)
 
     event_dict = build_event_dict(event)
+    event_dict["view_count"] = (event.view_count or 0) + pending_views(event.id)[0]
     return EventResponse.model_validate(event_dict)
 
 @router.put("/{event_identifier}", response_model=EventResponse)
@@ -702,6 +738,20 @@ def update_event(
 
     db.commit()
     db.refresh(event)
+    invalidate_feed_cache()
+
+    # Re-index only if searchable text changed
+    if {'title', 'summary', 'description'} & update_dict.keys():
+        index_event(db, event)
+        db.commit()
+
+    # Rebuild the audience / re-fan-out only if who can see it, or where it sorts, changed
+    if AUDIENCE_FIELDS & update_dict.keys():
+        rebuild_event_audience(db, [event.id])
+    if TIMELINE_FIELDS & update_dict.keys():
+        fan_out_event(db, event)
+    if (AUDIENCE_FIELDS | TIMELINE_FIELDS) & update_dict.keys():
+        db.commit()
 
     # Re-extract and save location markers from HTML content
     if event.description:
@@ -779,7 +829,9 @@ def delete_event(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     event.is_deleted = True
+    remove_event_from_timelines(db, event.id)
     db.commit()
+    invalidate_feed_cache()
 
     return {"message": "Event moved to trash"}
 
@@ -813,7 +865,9 @@ def restore_event(
             )
 
     event.is_deleted = False
+    fan_out_event(db, event)
     db.commit()
+    invalidate_feed_cache()
 
     return {"message": "Event restored"}
 
@@ -854,7 +908,9 @@ def publish_event(
             )
 
     event.is_published = True
+    fan_out_event(db, event)
     db.commit()
+    invalidate_feed_cache()
 
     return {"message": "Event published successfully"}
 
@@ -878,7 +934,9 @@ def unpublish_event(
         return {"message": "Event is already a draft"}
 
     event.is_published = False
+    remove_event_from_timelines(db, event.id)
     db.commit()
+    invalidate_feed_cache()
 
     return {"message": "Event moved to drafts"}
 
@@ -924,6 +982,7 @@ def permanently_delete_event(
         print(f"Deleting event {event_id} from database...")
         db.delete(event)
         db.commit()
+        invalidate_feed_cache()
         print(f"✓ Event {event_id} permanently deleted from database")
     except Exception as e:
         print(f"✗ Database delete failed for event {event_id}: {str(e)}")
@@ -946,6 +1005,7 @@ def add_like(
     db: Session = Depends(get_db)
 ):
     from ..models.like import Like
+    from ..utils.event_counters import adjust_like_count
 
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -966,6 +1026,7 @@ def add_like(
     )
 
     db.add(like)
+    adjust_like_count(db, event_id, 1)
     db.commit()
 
     return {"message": "Liked successfully"}
@@ -9,6 +9,7 @@ from ..core.database import get_db
 from ..core.deps import get_current_user
 from ..models.user import User
 from ..models.invited_viewer import InvitedViewer
+from ..utils.batch_loader import BatchLoader, get_batch_loader
 from ..services.email_service import send_viewer_invitation_email
 from ..core.config import settings
 
@@ -194,7 +195,8 @@ def create_invitation(
 def list_invitations(
     status: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """
     List all invitations sent by the current user.
@@ -209,7 +211,8 @@ def list_invitations(
 
     invitations = query.order_by(InvitedViewer.created_at.desc()).all()
 
-    # Build response with resulting user info
+    # Build response with resulting user info (all signed-up users in one query)
+    loader.prime(User, (inv.resulting_user_id for inv in invitations))
     MAX_RESENDS = 2
     invitation_responses = []
     for inv in invitations:
@@ -230,7 +233,7 @@ def list_invitations(
 
         # If they signed up, get their user info
         if inv.resulting_user_id:
-            resulting_user = db.query(User).filter(User.id == inv.resulting_user_id).first()
+            resulting_user = loader.get(User, inv.resulting_user_id)
             if resulting_user:
                 response.resulting_user = SignedUpUserInfo(
                     id=resulting_user.id,
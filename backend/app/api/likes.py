@@ -8,6 +8,7 @@ from ..core.deps import get_current_user
 from ..models.user import User
 from ..models.event import Event
 from ..models.like import Like
+from ..utils.event_counters import adjust_like_count
 
 router = APIRouter(prefix="/events", tags=["likes"])
 
@@ -56,6 +57,7 @@ def like_event(
     )
 
     db.add(new_like)
+    adjust_like_count(db, event_id, 1)
     db.commit()
 
     return {"message": "Event liked", "liked": True}
@@ -76,6 +78,7 @@ def unlike_event(
         return {"message": "Not liked", "liked": False}
 
     db.delete(like)
+    adjust_like_count(db, event_id, -1)
     db.commit()
 
     return {"message": "Event unliked", "liked": False}
@@ -8,6 +8,7 @@ from ..core.deps import get_current_user, require_not_demo
 from ..models.user import User
 from ..models.user_relationship import UserRelationship
 from ..models.follow import Follow
+from ..utils.batch_loader import BatchLoader, get_batch_loader
 from ..schemas.user_relationship import (
     RelationshipPropose,
     RelationshipResponse,
@@ -155,7 +156,8 @@ def propose_relationship(
 @router.get("/pending", response_model=List[RelationshipRequestResponse])
 def get_pending_requests(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get incoming relationship requests (pending)."""
     # Find relationships where current user is NOT the proposer and status is pending
@@ -168,11 +170,13 @@ def get_pending_requests(
         UserRelationship.status == "pending"
     ).order_by(UserRelationship.created_at.desc()).all()
 
+    loader.prime(User, (rel.proposed_by_id for rel in relationships))
+
     results = []
     for rel in relationships:
         # Get the proposer (the other user)
         proposer_id = rel.proposed_by_id
-        proposer = db.query(User).filter(User.id == proposer_id).first()
+        proposer = loader.get(User, proposer_id)
 
         if not proposer:
             continue
@@ -227,7 +231,8 @@ def get_pending_count(
 @router.get("/sent", response_model=List[RelationshipSentResponse])
 def get_sent_requests(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get outgoing relationship requests (sent by me)."""
     relationships = db.query(UserRelationship).filter(
@@ -235,11 +240,16 @@ def get_sent_requests(
         UserRelationship.status == "pending"
     ).order_by(UserRelationship.created_at.desc()).all()
 
+    loader.prime(User, (
+        rel.user_a_id if rel.user_b_id == current_user.id else rel.user_b_id
+        for rel in relationships
+    ))
+
     results = []
     for rel in relationships:
         # Get the recipient (the other user)
         recipient_id = rel.user_a_id if rel.user_b_id == current_user.id else rel.user_b_id
-        recipient = db.query(User).filter(User.id == recipient_id).first()
+        recipient = loader.get(User, recipient_id)
 
         if not recipient:
             continue
@@ -270,7 +280,8 @@ def get_sent_requests(
 @router.get("", response_model=List[RelationshipResponse])
 def get_my_relationships(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all accepted relationships for the current user."""
     relationships = db.query(UserRelationship).filter(
@@ -281,11 +292,16 @@ def get_my_relationships(
         UserRelationship.status == "accepted"
     ).order_by(UserRelationship.accepted_at.desc()).all()
 
+    loader.prime(User, (
+        rel.user_a_id if rel.user_b_id == current_user.id else rel.user_b_id
+        for rel in relationships
+    ))
+
     results = []
     for rel in relationships:
         # Get the other user
         other_user_id = rel.user_a_id if rel.user_b_id == current_user.id else rel.user_b_id
-        other_user = db.query(User).filter(User.id == other_user_id).first()
+        other_user = loader.get(User, other_user_id)
 
         if not other_user:
             continue
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only
 from datetime import datetime, timedelta
 import secrets
 from ..core.database import get_db
@@ -8,6 +8,7 @@ from ..models.user import User
 from ..models.event import Event
 from ..schemas.event import ShareLinkCreate, ShareLinkResponse
 from ..utils.privacy import can_view_event
+from ..utils.serialization import SHARE_LINK_LIST, json_response
 
 router = APIRouter()
 
@@ -173,7 +174,17 @@ def get_all_share_links(
     Get all active share links for current user's events
     """
     # Get all events authored by current user that have active shares
-    events = db.query(Event).filter(
+    # (only the share columns - descriptions are never needed here)
+    events = db.query(Event).options(
+        load_only(
+            Event.id,
+            Event.title,
+            Event.share_token,
+            Event.share_expires_at,
+            Event.share_view_count,
+            Event.share_created_at
+        )
+    ).filter(
         Event.author_id == current_user.id,
         Event.share_enabled == True,
         Event.share_token.isnot(None),
@@ -184,21 +195,18 @@ def get_all_share_links(
     current_time = datetime.utcnow()
 
     for event in events:
-        # Check if expired
-        is_expired = event.share_expires_at and event.share_expires_at < current_time
-
         share_links.append({
             "event_id": event.id,
             "event_title": event.title,
             "share_token": event.share_token,
             "share_url": f"/share/{event.share_token}",
-            "expires_at": event.share_expires_at.isoformat() if event.share_expires_at else None,
+            "expires_at": event.share_expires_at,
             "view_count": event.share_view_count or 0,
-            "is_expired": is_expired,
-            "shared_on": event.share_created_at.isoformat() if event.share_created_at else None
+            "is_expired": bool(event.share_expires_at and event.share_expires_at < current_time),
+            "shared_on": event.share_created_at
         })
 
-    return {"share_links": share_links}
+    return json_response(SHARE_LINK_LIST, {"share_links": share_links})
 
 @router.get("/share/{token}")
 def view_shared_event(
@@ -232,14 +240,14 @@ def view_shared_event(
         db.commit()
         raise HTTPException(status_code=410, detail="Share link has expired")
 
-    # Increment view count
-    event.share_view_count = (event.share_view_count or 0) + 1
-    event.view_count = (event.view_count or 0) + 1
-    db.commit()
+    # Count the view (buffered; written in batches by utils/write_behind.py)
+    from ..utils.write_behind import record_event_view, pending_views
+    record_event_view(event.id, shared=True)
 
     # Build response with event details
     from ..api.events import build_event_dict
     event_data = build_event_dict(event)
+    event_data["view_count"] = (event.view_count or 0) + pending_views(event.id)[0]
 
     # Add share context
     share_context = {
@@ -9,6 +9,7 @@ from ..core.database import get_db
 from ..core.config import settings
 from ..core.deps import get_current_user
 from ..models.user import User
+from ..utils.privacy import refresh_content_visible
 from ..services.email_service import (
     send_subscription_confirmed_email,
     send_billing_history_email,
@@ -291,6 +292,7 @@ async def handle_checkout_completed(session, db: Session):
 
     # For subscriptions, the subscription.created/updated events will handle the rest
 
+    refresh_content_visible(user)
     db.commit()
     print(f"Checkout completed for user {user.id} ({user.email})")
 
@@ -356,6 +358,7 @@ async def handle_subscription_created(subscription, db: Session):
         except stripe.error.StripeError as e:
             print(f"Failed to extend subscription billing cycle: {e}")
 
+    refresh_content_visible(user)
     db.commit()
     print(f"Subscription created for user {user.id}: status={status}, free_days={free_days}")
 
@@ -397,6 +400,7 @@ async def handle_subscription_updated(subscription, db: Session):
         if current_period_end:
             user.subscription_ends_at = datetime.fromtimestamp(current_period_end)
 
+    refresh_content_visible(user)
     db.commit()
     print(f"Subscription updated for user {user.id}: status={status}, cancel_at_period_end={cancel_at_period_end}")
 
@@ -415,6 +419,7 @@ async def handle_subscription_deleted(subscription, db: Session):
     user.subscription_tier = 'free'
     user.stripe_subscription_id = None
 
+    refresh_content_visible(user)
     db.commit()
     print(f"Subscription deleted for user {user.id}")
     # Note: We don't notify followers - too harsh. They'll see a message on the profile if they visit.
@@ -434,6 +439,7 @@ async def handle_payment_succeeded(invoice, db: Session):
     user.subscription_status = 'active'
     user.subscription_tier = 'premium'
 
+    refresh_content_visible(user)
     db.commit()
     print(f"Payment succeeded for user {user.id}")
 
@@ -5,13 +5,14 @@ from typing import List, Optional
 from datetime import datetime
 from ..core.database import get_db
 from ..core.deps import get_current_user, get_current_user_optional, require_not_demo
+from ..core.query_stats import query_budget
 from ..models.user import User
 from ..models.tag_profile import TagProfile
 from ..models.tag_profile_claim import TagProfileClaim
 from ..models.tag_profile_relationship import TagProfileRelationship
 from ..models.tag_profile_relationship_request import TagProfileRelationshipRequest
-from ..models.follow import Follow
 from ..models.event_tag import EventTag
+from ..utils.batch_loader import BatchLoader, get_batch_loader
 from ..schemas.tag_profile import (
     TagProfileCreate,
     TagProfileUpdate,
@@ -36,9 +37,11 @@ def get_tag_profile_relationships(db: Session, tag_profile_id: int) -> List[TagP
         TagProfileRelationship.tag_profile_id == tag_profile_id
     ).all()
 
+    loader = BatchLoader(db).prime(User, (rel.user_id for rel in relationships))
+
     result = []
     for rel in relationships:
-        user = db.query(User).filter(User.id == rel.user_id).first()
+        user = loader.get(User, rel.user_id)
         if user:
             result.append(TagProfileRelationshipResponse(
                 id=rel.id,
@@ -96,7 +99,7 @@ def create_tag_profile(
     )
 
 
-@router.get("/search", response_model=List[TagProfileSearchResult])
+@router.get("/search", response_model=List[TagProfileSearchResult], dependencies=[Depends(query_budget(4))])
 def search_tag_profiles(
     q: str,
     current_user: User = Depends(get_current_user),
@@ -107,54 +110,30 @@ def search_tag_profiles(
     Returns profiles with context (who created them, relationship) for deduplication.
     Prioritizes profiles created by people the current user follows.
     """
-    if not q or len(q) < 1:
+    if not q or not q.strip():
         return []
 
-    search_term = f"%{q}%"
-
-    # Get IDs of users the current user follows
-    following_ids = db.query(Follow.following_id).filter(
-        Follow.follower_id == current_user.id,
-        Follow.status == "accepted"
-    ).subquery()
+    from ..services.tag_search import search_tag_targets
 
-    # Query tag profiles matching the search term
-    profiles = db.query(
-        TagProfile,
-        User.username.label("creator_username"),
-        User.display_name.label("creator_display_name"),
-        User.full_name.label("creator_full_name"),
-        # Subquery to check if current user follows the creator
-        following_ids.c.following_id.isnot(None).label("is_following_creator")
-    ).join(
-        User, TagProfile.created_by_id == User.id
-    ).outerjoin(
-        following_ids, TagProfile.created_by_id == following_ids.c.following_id
-    ).filter(
-        TagProfile.name.ilike(search_term),
-        TagProfile.is_merged == False  # Don't show merged profiles
-    ).order_by(
-        # Prioritize profiles from followed users
-        following_ids.c.following_id.isnot(None).desc(),
-        TagProfile.name
-    ).limit(20).all()
+    # Shared tagging search, profiles only (followed creators first)
+    targets = search_tag_targets(
+        db, current_user.id, q,
+        include_users=False,
+        per_kind_limit=20,
+        limit=20
+    )
 
     results = []
-    for row in profiles:
-        profile = row[0]
-        creator_username = row.creator_username
-        creator_display_name = row.creator_display_name or row.creator_full_name
-        is_following = bool(row.is_following_creator)
-
+    for target in targets:
         results.append(TagProfileSearchResult(
-            id=profile.id,
-            name=profile.name,
-            photo_url=profile.photo_url,
-            relationship_to_creator=profile.relationship_to_creator,
-            created_by_id=profile.created_by_id,
-            created_by_username=creator_username,
-            created_by_display_name=creator_display_name,
-            is_following_creator=is_following
+            id=target.id,
+            name=target.name,
+            photo_url=target.photo_url,
+            relationship_to_creator=target.relationship_to_creator,
+            created_by_id=target.created_by_id,
+            created_by_username=target.created_by_username,
+            created_by_display_name=target.created_by_display_name,
+            is_following_creator=target.is_followed
         ))
 
     return results
@@ -227,12 +206,17 @@ def get_tag_profile_events(
     profile_id: int,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     """Get all events where this tag profile is tagged."""
     from ..models.event import Event
     from ..utils.privacy import filter_events_by_privacy
+    from ..utils.pagination import paginate_events, NEXT_CURSOR_HEADER
+    from ..utils.event_projection import event_card_options
+    from ..utils.serialization import EVENT_SUMMARIES, event_summary, json_response
+    from sqlalchemy.orm import selectinload
 
     profile = db.query(TagProfile).filter(TagProfile.id == profile_id).first()
     if not profile:
@@ -247,35 +231,23 @@ def get_tag_profile_events(
         EventTag.status == "accepted"
     ).subquery()
 
-    # Query events and apply privacy filtering
-    query = db.query(Event).filter(
+    # Query events and apply privacy filtering in SQL, before the page limit
+    query = db.query(Event).options(
+        event_card_options(),
+        selectinload(Event.author)
+    ).filter(
         Event.id.in_(tagged_event_ids),
         Event.is_published == True,
         Event.is_deleted == False
     )
 
-    # Apply privacy filter if we have a viewer
-    if current_user:
-        query = filter_events_by_privacy(query, current_user, db)
+    # Anonymous viewers are filtered too (public events from active authors only)
+    query = filter_events_by_privacy(query, current_user, db)
 
-    events = query.order_by(Event.start_date.desc()).offset(skip).limit(limit).all()
-
-    # Build response
-    result = []
-    for event in events:
-        author = event.author
-        result.append({
-            "id": event.id,
-            "title": event.title,
-            "summary": event.summary,
-            "start_date": event.start_date.isoformat() if event.start_date else None,
-            "cover_image_url": event.cover_image_url,
-            "author_id": event.author_id,
-            "author_username": author.username if author else None,
-            "author_display_name": author.display_name or author.full_name if author else None
-        })
+    events, next_cursor = paginate_events(query, cursor=cursor, skip=skip, limit=limit)
 
-    return result
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(EVENT_SUMMARIES, [event_summary(event) for event in events], headers)
 
 
 @router.put("/{profile_id}", response_model=TagProfileResponse)
@@ -592,7 +564,8 @@ def create_claim_request(
 @claims_router.get("/tag-profile-claims", response_model=List[TagProfileClaimResponse])
 def get_claims_to_me(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all pending claims on tag profiles I created."""
     claims = db.query(TagProfileClaim).join(
@@ -602,10 +575,13 @@ def get_claims_to_me(
         TagProfileClaim.status == "pending"
     ).order_by(TagProfileClaim.created_at.desc()).all()
 
+    loader.prime(TagProfile, (claim.tag_profile_id for claim in claims))
+    loader.prime(User, (claim.claimant_id for claim in claims))
+
     results = []
     for claim in claims:
-        profile = claim.tag_profile
-        claimant = claim.claimant
+        profile = loader.get(TagProfile, claim.tag_profile_id)
+        claimant = loader.get(User, claim.claimant_id)
 
         results.append(TagProfileClaimResponse(
             id=claim.id,
@@ -644,17 +620,21 @@ def get_claims_count(
 @claims_router.get("/tag-profile-claims/sent", response_model=List[TagProfileClaimSentResponse])
 def get_claims_by_me(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all claims I have sent."""
     claims = db.query(TagProfileClaim).filter(
         TagProfileClaim.claimant_id == current_user.id
     ).order_by(TagProfileClaim.created_at.desc()).all()
 
+    loader.prime(TagProfile, (claim.tag_profile_id for claim in claims))
+    loader.prime(User, (profile.created_by_id for profile in loader.get_many(TagProfile)))
+
     results = []
     for claim in claims:
-        profile = claim.tag_profile
-        creator = db.query(User).filter(User.id == profile.created_by_id).first()
+        profile = loader.get(TagProfile, claim.tag_profile_id)
+        creator = loader.get(User, profile.created_by_id)
 
         results.append(TagProfileClaimSentResponse(
             id=claim.id,
@@ -745,6 +725,9 @@ def approve_claim(
         other_claim.status = "rejected"
         other_claim.resolved_at = datetime.utcnow()
 
+    # Transferred tags are now accepted user tags; their events' audiences grow
+    from ..services.event_audience import rebuild_event_audience
+    rebuild_event_audience(db, {tag.event_id for tag in event_tags})
     db.commit()
 
     return {"message": "Claim approved and profile merged"}
@@ -874,7 +857,8 @@ def request_relationship(
 @claims_router.get("/tag-profile-relationship-requests", response_model=List[TagProfileRelationshipRequestResponse])
 def get_relationship_requests_to_me(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """
     Get all pending relationship requests that need my approval:
@@ -902,10 +886,13 @@ def get_relationship_requests_to_me(
     all_requests = requests_on_my_profiles + requests_for_me
     all_requests.sort(key=lambda r: r.created_at, reverse=True)
 
+    loader.prime(TagProfile, (req.tag_profile_id for req in all_requests))
+    loader.prime(User, (req.proposer_id for req in all_requests))
+
     results = []
     for req in all_requests:
-        profile = req.tag_profile
-        proposer = req.proposer
+        profile = loader.get(TagProfile, req.tag_profile_id)
+        proposer = loader.get(User, req.proposer_id)
 
         results.append(TagProfileRelationshipRequestResponse(
             id=req.id,
@@ -955,17 +942,21 @@ def get_relationship_requests_count(
 @claims_router.get("/tag-profile-relationship-requests/sent", response_model=List[TagProfileRelationshipRequestSentResponse])
 def get_relationship_requests_by_me(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: BatchLoader = Depends(get_batch_loader)
 ):
     """Get all relationship requests I have sent."""
     requests = db.query(TagProfileRelationshipRequest).filter(
         TagProfileRelationshipRequest.proposer_id == current_user.id
     ).order_by(TagProfileRelationshipRequest.created_at.desc()).all()
 
+    loader.prime(TagProfile, (req.tag_profile_id for req in requests))
+    loader.prime(User, (profile.created_by_id for profile in loader.get_many(TagProfile)))
+
     results = []
     for req in requests:
-        profile = req.tag_profile
-        creator = db.query(User).filter(User.id == profile.created_by_id).first()
+        profile = loader.get(TagProfile, req.tag_profile_id)
+        creator = loader.get(User, profile.created_by_id)
 
         results.append(TagProfileRelationshipRequestSentResponse(
             id=req.id,
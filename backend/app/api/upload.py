@@ -1,21 +1,14 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Form
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
+import asyncio
+import json
 import os
 import uuid
 from pathlib import Path
-from PIL import Image, ImageOps
-from PIL.ExifTags import TAGS, GPSTAGS
-import io
 from datetime import datetime
-
-# Register HEIC/HEIF support for Pillow (iPhone photos)
-try:
-    from pillow_heif import register_heif_opener
-    register_heif_opener()
-except ImportError:
-    pass  # pillow-heif not installed, HEIC files won't be supported
 from ..core.config import settings
 from ..core.database import get_db
 from ..core.deps import get_current_user, require_not_demo
@@ -23,9 +16,15 @@ from ..models.event_image import EventImage
 from ..models.event import Event
 from ..models.user import User
 from ..schemas.event_image import EventImageCreate, EventImageResponse, EventImageUpdate
+from ..utils.cpu_pool import run_cpu_bound, CPUPoolSaturated
+from ..utils.image_processing import IMAGE_VARIANTS, render_image_variants
+from ..utils.storage_uploader import put_concurrently
+from ..utils.upload_stream import upload_size, spool_size, detach_spool
 from ..utils.r2_client import (
     r2_configured,
     r2_put,
+    r2_put_stream,
+    r2_get,
     r2_delete,
     r2_presign_put,
 )
@@ -50,20 +49,29 @@ class EventImageRecordCreate(BaseModel):
     longitude: Optional[float] = None
     timestamp: Optional[str] = None
 
+# Cache the client across requests (and batch items) within a process
+_supabase_client = None
+
+
 def get_supabase_client() -> Client:
     """Get or create Supabase client (lazy initialization)"""
+    global _supabase_client
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
         raise HTTPException(
             status_code=500,
             detail="Supabase storage not configured. Please set SUPABASE_URL and SUPABASE_KEY."
         )
 
+    if _supabase_client is not None:
+        return _supabase_client
+
     try:
         # Create client with minimal options to avoid proxy argument error
-        return create_client(
+        _supabase_client = create_client(
             supabase_url=settings.SUPABASE_URL,
             supabase_key=settings.SUPABASE_KEY
         )
+        return _supabase_client
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -72,10 +80,23 @@ def get_supabase_client() -> Client:
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+SLOW_RENDER_MS = 1500  # Log per-stage timings of renders slower than this
+
+# POST /upload/batch
+MAX_BATCH_FILES = 50
+MAX_BATCH_BYTES = 200 * 1024 * 1024  # Multipart files per request, all together
+BATCH_CONCURRENCY = 4  # Items of one batch processed at a time
+BATCH_SATURATION_RETRIES = 3  # Waits for a full CPU pool before failing an item
+INCOMING_PREFIX = "incoming"  # R2 staging area for presigned originals: incoming/<user_id>/
 
-# Image sizes
-THUMBNAIL_SIZE = (300, 300)
-MEDIUM_SIZE = (1200, 1200)
+# Largest file accepted per route; main.py enforces it while the body streams in
+UPLOAD_BODY_LIMITS = {
+    "/upload": MAX_FILE_SIZE,
+    "/upload/event-image": MAX_FILE_SIZE,
+    "/upload/video": settings.MAX_VIDEO_SIZE,
+    "/upload/event-video": settings.MAX_VIDEO_SIZE,
+    "/upload/batch": MAX_BATCH_BYTES,
+}
 
 
 def storage_put(storage_path: str, data: bytes, content_type: str, *, bucket: str) -> str:
@@ -89,133 +110,80 @@ def storage_put(storage_path: str, data: bytes, content_type: str, *, bucket: st
         return r2_put(storage_path, data, content_type)
 
     supabase_client = get_supabase_client()
+    # upsert: a retry after a timed-out upload that did land must not fail
+    # with 409 Duplicate (keys are unique per upload, so nothing is clobbered)
     supabase_client.storage.from_(bucket).upload(
         path=storage_path,
         file=data,
-        file_options={"content-type": content_type},
+        file_options={"content-type": content_type, "upsert": "true"},
     )
     return supabase_client.storage.from_(bucket).get_public_url(storage_path)
 
 
-def get_decimal_from_dms(dms, ref):
-    """
-    Convert GPS DMS (degrees, minutes, seconds) to decimal degrees
-    """
-    degrees = dms[0]
-    minutes = dms[1] / 60.0
-    seconds = dms[2] / 3600.0
-
-    decimal = degrees + minutes + seconds
-
-    if ref in ['S', 'W']:
-        decimal = -decimal
-
-    return decimal
-
+def storage_put_stream(storage_path: str, fileobj, content_type: str, *, bucket: str) -> str:
+    """Like storage_put(), but reads the body from a seekable file object.
 
-def extract_gps_data(exif_data: Dict) -> Optional[Dict[str, float]]:
+    R2 streams it (multipart for large files). Supabase Storage's client only
+    accepts bytes or a path, so that fallback still reads the file whole.
     """
-    Extract GPS coordinates from EXIF data
-    """
-    gps_info = {}
-
-    for tag, value in exif_data.items():
-        decoded = TAGS.get(tag, tag)
-        if decoded == "GPSInfo":
-            for gps_tag in value:
-                gps_decoded = GPSTAGS.get(gps_tag, gps_tag)
-                gps_info[gps_decoded] = value[gps_tag]
+    fileobj.seek(0)  # A retry starts from the beginning
+    if r2_configured():
+        return r2_put_stream(storage_path, fileobj, content_type)
+    return storage_put(storage_path, fileobj.read(), content_type, bucket=bucket)
 
-    if not gps_info:
-        return None
 
-    try:
-        # Extract latitude and longitude
-        lat = get_decimal_from_dms(
-            gps_info['GPSLatitude'],
-            gps_info['GPSLatitudeRef']
-        )
-        lon = get_decimal_from_dms(
-            gps_info['GPSLongitude'],
-            gps_info['GPSLongitudeRef']
+def validate_image_upload(filename: str, size: int) -> None:
+    """Raise 400 unless filename has an allowed image extension and size fits."""
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"'{file_ext}' is not a supported image format. Allowed formats: JPG, PNG, GIF, WebP, HEIC"
         )
 
-        return {
-            'latitude': lat,
-            'longitude': lon
-        }
-    except (KeyError, TypeError, IndexError):
-        return None
-
-
-def extract_exif_metadata(image: Image.Image) -> Dict[str, Any]:
-    """
-    Extract useful EXIF metadata from image
-    """
-    metadata = {
-        'has_exif': False,
-        'gps': None,
-        'date_taken': None,
-        'camera': None,
-        'dimensions': {
-            'width': image.width,
-            'height': image.height
-        }
-    }
-
-    try:
-        exif_data = image._getexif()
-        if not exif_data:
-            return metadata
-
-        metadata['has_exif'] = True
-
-        # Extract GPS data
-        metadata['gps'] = extract_gps_data(exif_data)
-
-        # Extract other useful metadata
-        for tag, value in exif_data.items():
-            decoded = TAGS.get(tag, tag)
-
-            if decoded == "DateTime" or decoded == "DateTimeOriginal":
-                try:
-                    metadata['date_taken'] = str(value)
-                except:
-                    pass
-
-            elif decoded == "Model":
-                metadata['camera'] = str(value)
-
-    except Exception as e:
-        # If EXIF extraction fails, just return basic metadata
-        pass
-
-    return metadata
+    if size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Image is too large ({size / (1024 * 1024):.1f}MB). Maximum size is 10MB."
+        )
 
 
-def resize_image(image: Image.Image, max_size: tuple, quality: int = 85) -> bytes:
+async def process_image_upload(contents: bytes) -> Dict[str, Any]:
     """
-    Resize image while maintaining aspect ratio
+    Render every size of an image and store them. Returns the /upload
+    response body. Raises CPUPoolSaturated when the CPU pool is full.
     """
-    # Create a copy to avoid modifying the original
-    img = image.copy()
-
-    # Convert RGBA to RGB if needed (for JPEG)
-    if img.mode in ('RGBA', 'LA', 'P'):
-        background = Image.new('RGB', img.size, (255, 255, 255))
-        if img.mode == 'P':
-            img = img.convert('RGBA')
-        background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-        img = background
+    # Generate unique filename (use .jpg for all outputs)
+    unique_id = str(uuid.uuid4())
+    base_filename = f"{unique_id}.jpg"
 
-    # Resize maintaining aspect ratio
-    img.thumbnail(max_size, Image.Resampling.LANCZOS)
+    # Decode, read EXIF, orient and resize off the event loop
+    rendered = await run_cpu_bound(render_image_variants, contents)
+    metadata = rendered.metadata
+    total_ms = sum(rendered.timings.values()) * 1000
+    if total_ms > SLOW_RENDER_MS:
+        stages = ", ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in rendered.timings.items())
+        print(f"Slow image render {base_filename} ({len(contents) / (1024 * 1024):.1f}MB, {total_ms:.0f}ms): {stages}")
+
+    # Upload all sizes at once to R2 (zero egress) when configured, else Supabase Storage
+    size_names = list(rendered.variants)
+    uploaded = await put_concurrently(storage_put, [
+        (f"{IMAGE_VARIANTS[size_name][2]}/{base_filename}", rendered.variants[size_name], "image/jpeg")
+        for size_name in size_names
+    ], bucket=settings.SUPABASE_BUCKET)
+    urls = dict(zip(size_names, uploaded))
 
-    # Save to bytes
-    output = io.BytesIO()
-    img.save(output, format='JPEG', quality=quality, optimize=True)
-    output.seek(0)
-    return output.getvalue()
+    # Return URLs for all sizes plus metadata
+    return {
+        "filename": base_filename,
+        "url": urls["medium"],  # Default to medium
+        "urls": {
+            "thumbnail": urls["thumbnail"],
+            "medium": urls["medium"],
+            "full": urls["full"]
+        },
+        "metadata": metadata
+    }
 
 
 @router.post("/upload")
@@ -224,74 +192,131 @@ async def upload_file(file: UploadFile = File(...)):
     Upload an image file to R2 (or Supabase Storage fallback) and return URLs
     for different sizes.
     """
-    # Validate file extension
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"'{file_ext}' is not a supported image format. Allowed formats: JPG, PNG, GIF, WebP, HEIC"
-        )
+    # Validate extension and size (measured on the spooled upload, nothing read yet)
+    validate_image_upload(file.filename, upload_size(file))
 
-    # Read file content
+    # The decoder needs the encoded bytes in memory (capped at MAX_FILE_SIZE)
     contents = await file.read()
 
-    # Validate file size
-    file_size_mb = len(contents) / (1024 * 1024)
-    if len(contents) > MAX_FILE_SIZE:
+    try:
+        return await process_image_upload(contents)
+    except CPUPoolSaturated:
         raise HTTPException(
-            status_code=400,
-            detail=f"Image is too large ({file_size_mb:.1f}MB). Maximum size is 10MB."
+            status_code=429,
+            detail="Too many images are being processed right now. Please try again in a moment.",
+            headers={"Retry-After": "5"}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error uploading image to storage: {str(e)}"
         )
 
-    # Generate unique filename (use .jpg for all outputs)
-    unique_id = str(uuid.uuid4())
-    base_filename = f"{unique_id}.jpg"
 
-    try:
-        # Open image with Pillow
-        image = Image.open(io.BytesIO(contents))
+async def _render_batch_item(contents: bytes) -> Dict[str, Any]:
+    """process_image_upload(), waiting out a full CPU pool a few times first."""
+    for attempt in range(BATCH_SATURATION_RETRIES):
+        try:
+            return await process_image_upload(contents)
+        except CPUPoolSaturated:
+            await asyncio.sleep(attempt + 1)
+    return await process_image_upload(contents)
 
-        # Extract EXIF metadata before any processing
-        metadata = extract_exif_metadata(image)
 
-        # Apply EXIF orientation - this fixes upside-down/rotated photos from phones
-        # Must be done AFTER extracting metadata but BEFORE resizing
+async def _batch_item_result(index: int, name: str, load, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """One NDJSON line: the /upload body plus index/name, or the error."""
+    async with semaphore:
         try:
-            image = ImageOps.exif_transpose(image)
-        except Exception:
-            pass  # If EXIF transpose fails, continue with original image
-
-        # Process and upload all image sizes to Supabase
-        sizes = {
-            "full": (resize_image(image, (4000, 4000), quality=90), f"full/{base_filename}"),
-            "medium": (resize_image(image, MEDIUM_SIZE, quality=85), f"medium/{base_filename}"),
-            "thumbnail": (resize_image(image, THUMBNAIL_SIZE, quality=80), f"thumbnails/{base_filename}")
-        }
-
-        urls = {}
-        for size_name, (image_bytes, storage_path) in sizes.items():
-            # Upload to R2 (zero egress) when configured, else Supabase Storage
-            urls[size_name] = storage_put(
-                storage_path, image_bytes, "image/jpeg", bucket=settings.SUPABASE_BUCKET
-            )
+            result = await _render_batch_item(await load())
+            return {"index": index, "name": name, "ok": True, **result}
+        except CPUPoolSaturated:
+            return {"index": index, "name": name, "ok": False, "status": 429,
+                    "error": "Too many images are being processed right now. Please try again in a moment."}
+        except HTTPException as e:
+            return {"index": index, "name": name, "ok": False, "status": e.status_code, "error": e.detail}
+        except Exception as e:
+            return {"index": index, "name": name, "ok": False, "status": 500,
+                    "error": f"Error uploading image to storage: {str(e)}"}
+
+
+@router.post("/upload/batch")
+async def upload_batch(
+    files: List[UploadFile] = File(default=[]),
+    keys: List[str] = Form(default=[]),
+    current_user: User = Depends(require_not_demo)
+):
+    """
+    Upload many images in one request, MAX_BATCH_FILES at most.
+
+    Send multipart `files`, and/or `keys` of originals the browser already
+    PUT to R2 via POST /upload/r2-presign (for batches past the Vercel body
+    limit). BATCH_CONCURRENCY items are processed at a time. The response is
+    NDJSON, one line per item as it finishes (in completion order):
+        {"index", "name", "ok": true, ...same body as POST /upload}
+        {"index", "name", "ok": false, "status", "error"}
+    then a final {"done": true, "uploaded": n, "failed": m}.
+    """
+    if not files and not keys:
+        raise HTTPException(status_code=400, detail="No files or keys provided")
+    if len(files) + len(keys) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {MAX_BATCH_FILES} per batch)")
+    if keys and not r2_configured():
+        raise HTTPException(status_code=503, detail="R2 storage is not configured")
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error uploading image to storage: {str(e)}"
-        )
+    incoming_prefix = f"{INCOMING_PREFIX}/{current_user.id}/"
+    if any(not key.startswith(incoming_prefix) for key in keys):
+        raise HTTPException(status_code=403, detail="Keys must come from your own presigned uploads")
 
-    # Return URLs for all sizes plus metadata
-    return {
-        "filename": base_filename,
-        "url": urls["medium"],  # Default to medium
-        "urls": {
-            "thumbnail": urls["thumbnail"],
-            "medium": urls["medium"],
-            "full": urls["full"]
-        },
-        "metadata": metadata
-    }
+    def load_file(filename, spool):
+        async def load():
+            size = spool_size(spool)
+            validate_image_upload(filename, size)
+            return await asyncio.to_thread(spool.read)
+        return load
+
+    def load_key(key):
+        async def load():
+            size, body = await asyncio.to_thread(r2_get, key)
+            try:
+                validate_image_upload(key, size)
+                return await asyncio.to_thread(body.read)
+            finally:
+                body.close()
+        return load
+
+    # The spools must outlive this function: the body streams after it returns
+    spools = [detach_spool(file) for file in files]
+    items = [(file.filename, load_file(file.filename, spool)) for file, spool in zip(files, spools)]
+    items += [(key, load_key(key)) for key in keys]
+
+    async def stream_results():
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(_batch_item_result(index, name, load, semaphore))
+            for index, (name, load) in enumerate(items)
+        ]
+        uploaded = 0
+        processed_keys = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                uploaded += result["ok"]
+                if result["ok"] and result["index"] >= len(files):
+                    processed_keys.append(result["name"])
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({"done": True, "uploaded": uploaded, "failed": len(items) - uploaded}) + "\n"
+        finally:
+            # Client went away: stop pending items
+            for task in tasks:
+                task.cancel()
+            for spool in spools:
+                spool.close()
+            if processed_keys:
+                # Staging copies are done with; failed ones stay for a retry
+                # (an R2 lifecycle rule on incoming/ expires leftovers)
+                await asyncio.to_thread(r2_delete, processed_keys)
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 
 @router.post("/upload/event-image", response_model=EventImageResponse)
@@ -332,11 +357,7 @@ async def upload_event_image(
         )
 
     # Get file size before processing
-    file_contents = await file.read()
-    file_size = len(file_contents)
-
-    # Reset file pointer for upload
-    await file.seek(0)
+    file_size = upload_size(file)
 
     # Upload the image (reuse existing upload logic)
     upload_result = await upload_file(file)
@@ -625,11 +646,19 @@ async def create_r2_presign(
     Return a presigned PUT URL so the browser can upload a (client-compressed)
     video directly to R2, bypassing the Vercel ~4.5MB request-body limit.
     The caller then records the returned public_url via /upload/event-image-metadata.
+
+    Image filenames get a staging key under incoming/<user id>/ instead; pass
+    it to POST /upload/batch, which renders and stores the sizes.
     """
     if not r2_configured():
         raise HTTPException(status_code=503, detail="R2 storage is not configured")
 
     file_ext = os.path.splitext(body.filename)[1].lower()
+    if file_ext in ALLOWED_EXTENSIONS:
+        content_type = body.content_type or ("image/jpeg" if file_ext == ".jpg" else f"image/{file_ext[1:]}")
+        key = f"{INCOMING_PREFIX}/{current_user.id}/{uuid.uuid4()}{file_ext}"
+        return r2_presign_put(key, content_type)
+
     if file_ext not in settings.ALLOWED_VIDEO_FORMATS:
         raise HTTPException(
             status_code=400,
@@ -658,12 +687,10 @@ async def upload_video(file: UploadFile = File(...)):
             detail=f"'{file_ext}' is not a supported video format. Allowed formats: MP4, MOV, AVI, WebM"
         )
 
-    # Read file content
-    contents = await file.read()
-
-    # Validate file size
-    file_size_mb = len(contents) / (1024 * 1024)
-    if len(contents) > settings.MAX_VIDEO_SIZE:
+    # Validate file size (measured on the spooled upload, never read into memory)
+    file_size = upload_size(file)
+    file_size_mb = file_size / (1024 * 1024)
+    if file_size > settings.MAX_VIDEO_SIZE:
         raise HTTPException(
             status_code=400,
             detail=f"Video is too large ({file_size_mb:.1f}MB). Maximum size is {settings.MAX_VIDEO_SIZE // (1024*1024)}MB."
@@ -675,12 +702,12 @@ async def upload_video(file: UploadFile = File(...)):
     video_key = f"videos/{unique_id}{file_ext}" if r2_configured() else f"{unique_id}{file_ext}"
 
     try:
-        video_url = storage_put(
+        # Stream from the spool to storage, with retries
+        [video_url] = await put_concurrently(storage_put_stream, [(
             video_key,
-            contents,
+            file.file,
             f"video/{file_ext[1:]}",  # e.g., video/mp4
-            bucket=settings.SUPABASE_VIDEO_BUCKET,
-        )
+        )], bucket=settings.SUPABASE_VIDEO_BUCKET)
 
     except Exception as e:
         raise HTTPException(
@@ -692,7 +719,7 @@ async def upload_video(file: UploadFile = File(...)):
     return {
         "filename": video_key,
         "url": video_url,
-        "file_size": len(contents),
+        "file_size": file_size,
         "format": file_ext[1:]  # Remove leading dot
     }
 
@@ -736,11 +763,7 @@ async def upload_event_video(
         )
 
     # Get file size before processing
-    file_contents = await file.read()
-    file_size = len(file_contents)
-
-    # Reset file pointer for upload
-    await file.seek(0)
+    file_size = upload_size(file)
 
     # Upload the video (reuse existing upload logic)
     upload_result = await upload_video(file)
@@ -3,11 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from ..core.database import get_db
-from ..core.deps import get_current_user, require_not_demo
+from ..core.deps import get_current_user, get_current_user_optional, require_not_demo
 from ..models.user import User
 from ..models.follow import Follow
 from ..models.user_mute import UserMute
 from ..services.email_service import send_follow_request_email, send_new_follower_email
+from ..utils.social_graph import invalidate_graph_snapshot
+from ..services.timeline import refresh_timeline_pair
+from ..services.event_audience import refresh_audience_pair
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -78,6 +81,8 @@ def get_current_user_profile(
             state_corrected = True
 
     if state_corrected:
+        from ..utils.privacy import refresh_content_visible
+        refresh_content_visible(current_user)
         db.commit()
         db.refresh(current_user)
 
@@ -111,16 +116,24 @@ def get_current_user_profile(
 @router.get("/search/users")
 def search_users(
     q: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """Search for users by username or full name"""
-    if not q or len(q) < 2:
+    """Search for users by username, display name or full name (typo tolerant)"""
+    from ..utils.name_search import name_match, proximity_boost
+    from ..utils.social_graph import get_graph_snapshot
+
+    if not q or len(q.strip()) < 2:
         return []
 
-    # Search by username or full_name (case-insensitive)
-    search_term = f"%{q}%"
-    users = db.query(User).filter(
-        (User.username.ilike(search_term)) | (User.full_name.ilike(search_term))
+    # Trigram-indexed match, ranked by similarity and whether the viewer follows them
+    match, score = name_match(db, [User.username, User.display_name, User.full_name], q)
+    if current_user:
+        score = score + proximity_boost(User.id, get_graph_snapshot(current_user.id, db).following_ids)
+
+    users = db.query(User).filter(match).order_by(
+        score.desc(),
+        User.username
     ).limit(20).all()
 
     results = []
@@ -226,6 +239,7 @@ def follow_user(
 
     db.add(follow)
     db.commit()
+    invalidate_graph_snapshot(current_user.id)
 
     # Send email notification to user being followed
     if user_to_follow.email:
@@ -268,7 +282,10 @@ def unfollow_user(
         return {"message": "Not following this user"}
 
     db.delete(follow)
+    refresh_timeline_pair(db, current_user.id, user_to_unfollow.id)
+    refresh_audience_pair(db, current_user.id, user_to_unfollow.id)
     db.commit()
+    invalidate_graph_snapshot(current_user.id)
 
     return {"message": f"Unfollowed {username}"}
 
@@ -364,7 +381,10 @@ def toggle_close_family(
         raise HTTPException(status_code=404, detail="Follower relationship not found")
 
     follow.is_close_family = close_family
+    refresh_timeline_pair(db, user_id, current_user.id)
+    refresh_audience_pair(db, user_id, current_user.id)
     db.commit()
+    invalidate_graph_snapshot(user_id)
 
     return {"message": "Close family status updated", "is_close_family": close_family}
 
@@ -561,7 +581,10 @@ def accept_follow_request(
         raise HTTPException(status_code=404, detail="Follow request not found")
 
     follow.status = "accepted"
+    refresh_timeline_pair(db, follow.follower_id, current_user.id)
+    refresh_audience_pair(db, follow.follower_id, current_user.id)
     db.commit()
+    invalidate_graph_snapshot(follow.follower_id)
 
     # Send email notification to the follower that their request was accepted
     follower = db.query(User).filter(User.id == follow.follower_id).first()
@@ -601,6 +624,7 @@ def reject_follow_request(
     # Option 1: Mark as rejected
     follow.status = "rejected"
     db.commit()
+    invalidate_graph_snapshot(follow.follower_id)
 
     # Option 2: Delete the request (uncomment if preferred)
     # db.delete(follow)
@@ -849,12 +873,17 @@ def get_my_inviters(
 def get_user_events(
     username: str,
     db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    """Get a user's published events by username"""
+    """Get a user's published events by username (only those the viewer can see)"""
     from ..models.event import Event
-    from ..schemas.event import EventResponse
+    from ..utils.pagination import paginate_events, NEXT_CURSOR_HEADER
+    from ..utils.privacy import filter_events_by_privacy
+    from ..utils.event_projection import event_card_options
+    from ..utils.serialization import EVENT_CARDS, event_card, json_response
     from sqlalchemy.orm import selectinload
 
     # Get the user
@@ -863,44 +892,23 @@ def get_user_events(
         raise HTTPException(status_code=404, detail="User not found")
 
     # Get their published events, ordered by start_date (most recent first)
-    events = db.query(Event).options(
+    # Card columns only - description is loaded in the detail view
+    query = db.query(Event).options(
+        event_card_options(),
         selectinload(Event.author)
     ).filter(
         Event.author_id == user.id,
         Event.is_published == True,
         Event.is_deleted == False
-    ).order_by(Event.start_date.desc()).offset(skip).limit(limit).all()
-
-    # Build response
-    response = []
-    for event in events:
-        event_dict = {
-            "id": event.id,
-            "title": event.title,
-            "summary": event.summary,
-            "description": event.description,
-            "start_date": event.start_date,
-            "end_date": event.end_date,
-            "location_name": event.location_name,
-            "latitude": event.latitude,
-            "longitude": event.longitude,
-            "cover_image_url": event.cover_image_url,
-            "has_multiple_locations": event.has_multiple_locations,
-            "author_id": event.author_id,
-            "author_username": event.author.username,
-            "author_full_name": event.author.full_name,
-            "view_count": event.view_count,
-            "is_published": event.is_published,
-            "created_at": event.created_at,
-            "updated_at": event.updated_at,
-            "like_count": 0,
-            "comment_count": 0,
-            "content_blocks": [],
-            "locations": []
-        }
-        response.append(EventResponse.model_validate(event_dict))
-
-    return response
+    )
+
+    # Privacy is filtered in SQL so every page is full and the cursor is exact
+    query = filter_events_by_privacy(query, current_user, db)
+
+    events, next_cursor = paginate_events(query, cursor=cursor, skip=skip, limit=limit)
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(EVENT_CARDS, [event_card(event) for event in events], headers)
 
 
 # ============== MUTE ENDPOINTS ==============
@@ -961,7 +969,9 @@ def mute_user(
             muted_user_id=user_to_mute.id
         )
         db.add(mute)
+        refresh_timeline_pair(db, current_user.id, user_to_mute.id)
         db.commit()
+        invalidate_graph_snapshot(current_user.id)
     except Exception as e:
         db.rollback()
         print(f"[MUTE ERROR] Failed to mute user {user_id} for user {current_user.id}: {e}")
@@ -986,6 +996,8 @@ def unmute_user(
         return {"message": "User not muted", "muted": False}
 
     db.delete(mute)
+    refresh_timeline_pair(db, current_user.id, user_id)
     db.commit()
+    invalidate_graph_snapshot(current_user.id)
 
     return {"message": "User unmuted", "muted": False}
@@ -0,0 +1,184 @@
+"""
+Verified-token and principal cache for get_current_user.
+
+Every authenticated request used to verify its JWT up to three times
+(Supabase with audience, Supabase without, then the legacy secret) and then
+look the user up again. Clients resend the same token for its whole
+lifetime, so verification results are cached per process under a hash of
+the token:
+
+- VerifiedToken: the claims, which secret signed them ("supabase" or
+  "legacy") and, once resolved, the compact Principal of the user it maps to.
+- A hit costs no signature check; get_current_user then needs only a
+  primary-key load of the user row (usually already in the session).
+
+Entries live for AUTH_CACHE_TTL_SECONDS or until the token expires,
+whichever is sooner, and the cache is bounded (LRU). Any ORM update of a
+User row - profile edits, Stripe subscription changes, the admin superuser
+toggle - invalidates that user's cached principals (see
+install_principal_invalidation), so the next request re-resolves it. Bulk
+query.update() calls bypass mapper events and must call
+invalidate_principal(user_id) themselves.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from jose import jwt, JWTError
+from sqlalchemy import event
+from .config import settings
+
+AUTH_CACHE_TTL_SECONDS = 300
+AUTH_CACHE_MAX_ENTRIES = 4096
+
+
+class Principal(NamedTuple):
+    """The few user fields auth decisions need, without a DB row."""
+    user_id: int
+    username: str
+    is_active: bool
+    is_superuser: bool
+    is_demo_account: bool
+    subscription_status: Optional[str]
+
+
+class VerifiedToken:
+    """A token whose signature has been checked, plus the user it resolved to."""
+
+    __slots__ = ("claims", "kind", "expires_at", "principal")
+
+    def __init__(self, claims: dict, kind: str, expires_at: float):
+        self.claims = claims
+        self.kind = kind  # "supabase" or "legacy"
+        self.expires_at = expires_at
+        self.principal: Optional[Principal] = None
+
+    @property
+    def subject(self) -> Optional[str]:
+        return self.claims.get("sub")
+
+
+class TokenVerificationError(Exception):
+    """The token failed signature/expiry checks; str() is the reason."""
+
+    def __init__(self, message: str, kind: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+_lock = threading.Lock()
+_tokens: "OrderedDict[str, VerifiedToken]" = OrderedDict()
+
+
+def _token_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def _looks_like_supabase(token: str) -> bool:
+    """Supabase tokens carry a UUID sub, ours an integer user ID (unverified peek)."""
+    if not settings.SUPABASE_JWT_SECRET:
+        return False
+    try:
+        sub = jwt.get_unverified_claims(token).get("sub")
+        uuid.UUID(str(sub))
+        return True
+    except (JWTError, ValueError, AttributeError, TypeError):
+        return False
+
+
+def _decode(token: str) -> VerifiedToken:
+    """Verify once, with the secret that issued the token."""
+    if _looks_like_supabase(token):
+        try:
+            # Supabase sets aud="authenticated"; the old code accepted tokens
+            # either way, so the audience is not enforced here either
+            claims = jwt.decode(
+                token,
+                settings.SUPABASE_JWT_SECRET,
+                algorithms=["HS256"],
+                options={"verify_aud": False}
+            )
+        except JWTError as e:
+            raise TokenVerificationError(str(e), "supabase")
+        kind = "supabase"
+    else:
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError as e:
+            raise TokenVerificationError(str(e), "legacy")
+        kind = "legacy"
+
+    expires_at = time.time() + AUTH_CACHE_TTL_SECONDS
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    return VerifiedToken(claims, kind, expires_at)
+
+
+def verify_token(token: str) -> VerifiedToken:
+    """Return the cached verification for token, verifying it on a miss.
+
+    Raises TokenVerificationError for invalid or expired tokens (never cached).
+    """
+    key = _token_key(token)
+    now = time.time()
+    with _lock:
+        entry = _tokens.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                _tokens.move_to_end(key)
+                return entry
+            del _tokens[key]
+
+    entry = _decode(token)
+    with _lock:
+        _tokens[key] = entry
+        _tokens.move_to_end(key)
+        while len(_tokens) > AUTH_CACHE_MAX_ENTRIES:
+            _tokens.popitem(last=False)
+    return entry
+
+
+def remember_principal(entry: VerifiedToken, user) -> Principal:
+    """Attach the resolved user to a cached token."""
+    principal = Principal(
+        user_id=user.id,
+        username=user.username,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser),
+        is_demo_account=bool(user.is_demo_account),
+        subscription_status=user.subscription_status,
+    )
+    with _lock:
+        entry.principal = principal
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Forget cached principals for a user (call after committing changes to them).
+    Clears them on the cached tokens directly, so nothing per user outlives
+    the tokens themselves; the scan is bounded by AUTH_CACHE_MAX_ENTRIES.
+    """
+    with _lock:
+        for entry in _tokens.values():
+            if entry.principal is not None and entry.principal.user_id == user_id:
+                entry.principal = None
+
+
+def clear_auth_cache() -> None:
+    with _lock:
+        _tokens.clear()
+
+
+def _on_user_update(mapper, connection, target) -> None:
+    invalidate_principal(target.id)
+
+
+def install_principal_invalidation(user_model) -> None:
+    """Invalidate cached principals whenever a User row is updated or deleted (idempotent)."""
+    for name in ("after_update", "after_delete"):
+        if not event.contains(user_model, name, _on_user_update):
+            event.listen(user_model, name, _on_user_update)
@@ -8,6 +8,13 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "sqlite:///./ofs.db"
 
+    # Connection pool (see core/database.py): auto | null | queue | transaction
+    DB_POOL_MODE: str = "auto"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 300  # Seconds before a pooled connection is replaced
+
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
@@ -55,6 +62,30 @@ class Settings(BaseSettings):
     RESEND_API_KEY: str = ""
     RESEND_FROM_EMAIL: str = "notifications@ourfamilysocials.com"
 
+    # SQL instrumentation (see core/query_stats.py)
+    QUERY_BUDGET_STRICT: bool = False  # Raise instead of warn when an endpoint exceeds its query budget
+    QUERY_REPEAT_WARN_THRESHOLD: int = 5  # Log statements repeated this often in one request (N+1)
+
+    # Event visibility: "audience" probes the materialized event_audience table
+    # (services/event_audience.py), "rules" re-derives it from follows/groups/tags,
+    # "exists" is "rules" with list filtering written as EXISTS branches
+    EVENT_PRIVACY_BACKEND: str = "audience"
+
+    # Write-behind counters (see utils/write_behind.py)
+    WRITE_BEHIND_FLUSH_SECONDS: float = 5.0  # Max age of buffered view counts / last-seen times
+
+    # CPU-bound request work (see utils/cpu_pool.py): auto | process | thread
+    CPU_POOL_MODE: str = "auto"
+    CPU_POOL_WORKERS: int = 0  # 0 = min(4, CPU count)
+    CPU_POOL_QUEUE_DEPTH: int = 8  # Jobs allowed to wait before requests get 429
+
+    # Object storage uploads (see utils/storage_uploader.py)
+    STORAGE_UPLOAD_CONCURRENCY: int = 8  # Parallel puts per process, shared by all requests
+    STORAGE_UPLOAD_RETRIES: int = 3  # Retries of a transient failure
+    STORAGE_UPLOAD_BACKOFF_SECONDS: float = 0.25  # First retry delay, doubled each time
+    STORAGE_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024  # R2 multipart part size (min 5MB)
+    STORAGE_MULTIPART_CONCURRENCY: int = 4  # Parts in flight per streamed upload
+
     # AI Creator (for AI-assisted event creation)
     ANTHROPIC_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
@@ -1,9 +1,12 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 import logging
+import os
 import sys
+import threading
+import time
 
 from .config import settings
 
@@ -15,24 +18,83 @@ logging.basicConfig(
 )
 db_logger = logging.getLogger("ofs.db")
 
-# For serverless (Vercel), use NullPool - no persistent connections
-# This avoids connection pool exhaustion when multiple instances spin up
-# Each request gets a fresh connection and releases it immediately
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            _record_pool_timeout()
+            raise
+        finally:
+            _record_pool_wait(time.perf_counter() - started)
+
+
+def resolve_pool_mode() -> str:
+    """
+    Pool strategy from DB_POOL_MODE:
+    - "null": NullPool, a fresh connection per session. Best for serverless
+      (Vercel), where instances come and go and a persistent pool per
+      instance would exhaust Postgres connections.
+    - "queue": QueuePool with pre-ping and recycle, for long-running
+      uvicorn/gunicorn workers that should reuse warm connections.
+    - "transaction": QueuePool safe for a transaction-mode pooler
+      (PgBouncer, Supabase port 6543): no startup "options" parameter,
+      statement_timeout is set per transaction instead.
+    - "auto" (default): "null" on Vercel, "queue" elsewhere.
+    """
+    mode = settings.DB_POOL_MODE.lower()
+    if mode == "auto":
+        mode = "null" if os.environ.get("VERCEL") else "queue"
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)} or auto, got {settings.DB_POOL_MODE!r}")
+    return mode
+
+
+POOL_MODES = ("null", "queue", "transaction")
+STATEMENT_TIMEOUT_MS = 30000  # 30 second query timeout
+
 if "postgresql" in settings.DATABASE_URL or "postgres" in settings.DATABASE_URL:
-    engine = create_engine(
-        settings.DATABASE_URL,
-        poolclass=NullPool,  # No connection pooling - best for serverless
-        connect_args={
-            "connect_timeout": 10,  # 10 second timeout for initial connection
-            "options": "-c statement_timeout=30000"  # 30 second query timeout
-        }
-    )
+    pool_mode = resolve_pool_mode()
+    connect_args = {"connect_timeout": 10}  # 10 second timeout for initial connection
+    if pool_mode != "transaction":
+        # Transaction poolers reject startup options; see the "begin" hook below
+        connect_args["options"] = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+
+    if pool_mode == "null":
+        # No connection pooling - each session gets a fresh connection
+        engine = create_engine(
+            settings.DATABASE_URL,
+            poolclass=NullPool,
+            connect_args=connect_args
+        )
+    else:
+        engine = create_engine(
+            settings.DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=True,  # Drop connections the server or pooler closed while idle
+            connect_args=connect_args
+        )
+
+    if pool_mode == "transaction":
+        @event.listens_for(engine, "begin")
+        def set_statement_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {STATEMENT_TIMEOUT_MS}")
 elif "sqlite" in settings.DATABASE_URL:
+    pool_mode = "sqlite"
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
 else:
+    pool_mode = "default"
     engine = create_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -40,6 +102,8 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
+    # Sessions connect lazily: a request that never runs a query never checks
+    # out a connection, and close() returns it to the pool as soon as we're done
     db = SessionLocal()
     try:
         yield db
@@ -47,12 +111,83 @@ def get_db():
         db.close()
 
 
+# Pool metrics (exposed by GET /admin/db/pool)
+_pool_stats_lock = threading.Lock()
+_pool_stats = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "invalidations": 0,
+    "timeouts": 0,
+    "wait_count": 0,
+    "wait_total_ms": 0.0,
+    "wait_max_ms": 0.0,
+}
+
+
+def _record_pool_wait(elapsed: float) -> None:
+    ms = elapsed * 1000
+    with _pool_stats_lock:
+        _pool_stats["wait_count"] += 1
+        _pool_stats["wait_total_ms"] += ms
+        _pool_stats["wait_max_ms"] = max(_pool_stats["wait_max_ms"], ms)
+
+
+def _record_pool_timeout() -> None:
+    with _pool_stats_lock:
+        _pool_stats["timeouts"] += 1
+
+
+def _count(key: str) -> None:
+    with _pool_stats_lock:
+        _pool_stats[key] += 1
+
+
+def get_pool_status() -> dict:
+    """Current pool occupancy plus cumulative checkout/wait counters for this process."""
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+    stats["wait_avg_ms"] = round(stats["wait_total_ms"] / stats["wait_count"], 3) if stats["wait_count"] else 0.0
+
+    pool = engine.pool
+    status = {
+        "mode": pool_mode,
+        "pool_class": type(pool).__name__,
+        **stats
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+        })
+    return status
+
+
 # Database connection event logging for debugging
 @event.listens_for(engine, "connect")
 def on_connect(dbapi_conn, connection_record):
+    _count("connects")
     db_logger.info(f"DB connection established: {id(dbapi_conn)}")
 
 
+@event.listens_for(engine, "checkout")
+def on_checkout(dbapi_conn, connection_record, connection_proxy):
+    _count("checkouts")
+
+
+@event.listens_for(engine, "checkin")
+def on_checkin(dbapi_conn, connection_record):
+    _count("checkins")
+
+
+@event.listens_for(engine, "invalidate")
+def on_invalidate(dbapi_conn, connection_record, exception):
+    _count("invalidations")
+
+
 @event.listens_for(engine, "close")
 def on_close(dbapi_conn, connection_record):
     db_logger.info(f"DB connection closed: {id(dbapi_conn)}")
@@ -1,158 +1,132 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
 from typing import Optional
 from datetime import datetime, timedelta
+import uuid
 from .database import get_db
-from .security import decode_token
-from .config import settings
+from .auth_cache import verify_token, remember_principal, TokenVerificationError
 from ..models.user import User
 
 security = HTTPBearer()
 
+# Demo account IDs change only when an admin flags an account, so the
+# block_demo_writes middleware checks a per-process cached set instead of
+# opening its own session on every write request
+DEMO_USER_IDS_TTL_SECONDS = 300
+_demo_user_ids_cache = {"ids": frozenset(), "expires_at": 0.0}
+
+
+def get_demo_user_ids() -> frozenset:
+    """IDs of all demo accounts (cached; one query per process per TTL)."""
+    import time
+    from .database import SessionLocal
+
+    now = time.monotonic()
+    if _demo_user_ids_cache["expires_at"] > now:
+        return _demo_user_ids_cache["ids"]
+
+    db = SessionLocal()
+    try:
+        ids = frozenset(
+            row[0] for row in db.query(User.id).filter(User.is_demo_account == True).all()
+        )
+    finally:
+        db.close()
+
+    _demo_user_ids_cache["ids"] = ids
+    _demo_user_ids_cache["expires_at"] = now + DEMO_USER_IDS_TTL_SECONDS
+    return ids
+
 
 def _update_last_login(user: User, db: Session):
     """Update user's last_login if it's been more than 1 hour since last update.
-    This prevents excessive DB writes on every API call."""
-    now = datetime.utcnow()
-    if user.last_login is None or (now - user.last_login) > timedelta(hours=1):
-        try:
-            user.last_login = now
-            db.commit()
-        except Exception:
-            db.rollback()  # Don't let login tracking failures break auth
-security_optional = HTTPBearer(auto_error=False)
+    Buffered and written in batches by utils/write_behind.py, so auth never
+    commits on the request session."""
+    from ..utils.write_behind import record_last_seen, pending_last_seen
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Unified auth dependency that supports both Supabase and legacy JWT tokens
+    now = datetime.utcnow()
+    last = pending_last_seen(user.id) or user.last_login
+    if last is None or (now - last) > timedelta(hours=1):
+        record_last_seen(user.id, now)
 
-    Tries Supabase token first, falls back to legacy token
-    """
-    import uuid
-    import traceback
 
-    token = credentials.credentials
-    supabase_error = None
+security_optional = HTTPBearer(auto_error=False)
 
-    print(f"🔵 GET_CURRENT_USER: Starting authentication")
-    print(f"🔵 Token length: {len(token)}")
 
-    # Try Supabase JWT first
-    if settings.SUPABASE_JWT_SECRET:
-        try:
-            print("🔵 Trying Supabase JWT validation...")
-            # Try with audience check first
-            try:
-                payload = jwt.decode(
-                    token,
-                    settings.SUPABASE_JWT_SECRET,
-                    algorithms=["HS256"],
-                    audience="authenticated"
-                )
-                print("🟢 Token validated with audience check")
-            except JWTError as e:
-                print(f"🟡 Audience check failed: {e}, trying without audience...")
-                # Fall back to validation without audience check
-                payload = jwt.decode(
-                    token,
-                    settings.SUPABASE_JWT_SECRET,
-                    algorithms=["HS256"],
-                    options={"verify_aud": False}
-                )
-                print("🟢 Token validated without audience check")
-
-            # Supabase token validated - get user by auth_user_id
-            auth_user_id_str = payload.get("sub")
-            print(f"🔵 Auth user ID from token: {auth_user_id_str}")
-
-            if auth_user_id_str:
-                # Convert string UUID to uuid.UUID object for database query
-                try:
-                    auth_user_id = uuid.UUID(auth_user_id_str)
-                    print(f"🔵 Converted to UUID object: {auth_user_id}")
-                except (ValueError, AttributeError) as e:
-                    print(f"🔴 UUID conversion failed: {e}")
-                    # If conversion fails, fall back to legacy token
-                    raise JWTError("Invalid UUID format in sub claim")
-
-                print(f"🔵 Looking up user with auth_user_id: {auth_user_id}")
-                user = db.query(User).filter(User.auth_user_id == auth_user_id).first()
-
-                if user:
-                    print(f"🟢 User found! ID: {user.id}, Username: {user.username}, Email: {user.email}")
-                    if user.is_active:
-                        print(f"🟢 User is active, returning user")
-                        _update_last_login(user, db)
-                        return user
-                    else:
-                        print(f"🔴 User account is inactive")
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="Account is inactive"
-                        )
-                else:
-                    print(f"🔴 User NOT found with auth_user_id: {auth_user_id}")
-                    # Let's also check what users exist in the database
-                    all_users_with_auth = db.query(User).filter(User.auth_user_id != None).all()
-                    print(f"🔵 Total users with auth_user_id in database: {len(all_users_with_auth)}")
-                    for u in all_users_with_auth[:10]:  # Print first 10 users with auth_user_id
-                        print(f"  - User ID: {u.id}, Username: {u.username}, Email: {u.email}, auth_user_id: {u.auth_user_id}")
-
-                    # Supabase token valid but user not found in our DB
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="User profile not found. Please complete registration."
-                    )
-        except HTTPException:
-            # Re-raise HTTP exceptions (user not found, account inactive)
-            raise
-        except JWTError as e:
-            # Not a valid Supabase token, save error and try legacy
-            supabase_error = str(e)
-            pass
-
-    # Fallback to legacy token validation
-    payload = decode_token(token)
-    if payload is None:
-        # Both Supabase and legacy validation failed
-        if supabase_error:
+def _resolve_user(token: str, db: Session) -> User:
+    """One (cached) verification and at most one indexed user lookup."""
+    try:
+        verified = verify_token(token)
+    except TokenVerificationError as e:
+        if e.kind == "supabase":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Token validation failed. Supabase error: {supabase_error}"
+                detail=f"Token validation failed. Supabase error: {e}"
             )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
-    user_id_str: str = payload.get("sub")
-    if user_id_str is None:
+
+    if verified.principal is not None:
+        # Cache hit: primary-key load (free if already in the session)
+        user = db.get(User, verified.principal.user_id)
+    elif verified.kind == "supabase":
+        user = db.query(User).filter(User.auth_user_id == uuid.UUID(verified.subject)).first()
+        if user is None:
+            print(f"🔴 No user profile for Supabase auth_user_id {verified.subject}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User profile not found. Please complete registration."
+            )
+    else:
+        try:
+            user_id = int(verified.subject)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        user = db.get(User, user_id)
+
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
+            detail="User not found"
         )
-    try:
-        user_id = int(user_id_str)
-    except (ValueError, TypeError):
+    if verified.kind == "supabase" and not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive"
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    if verified.principal is None:
+        remember_principal(verified, user)
+    return user
+
+
+def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Unified auth dependency that supports both Supabase and legacy JWT tokens
+
+    Verification is cached per token (see core/auth_cache.py) and the resolved
+    user is kept on request.state, so a request that resolves auth more than
+    once (middleware, optional + required deps) pays for it once.
+    """
+    user = getattr(request.state, "current_user", None)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    _update_last_login(user, db)
+        user = _resolve_user(credentials.credentials, db)
+        request.state.current_user = user
+        _update_last_login(user, db)
     return user
 
 
 def get_current_user_optional(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_optional),
     db: Session = Depends(get_db)
 ) -> Optional[User]:
@@ -165,7 +139,7 @@ def get_current_user_optional(
 
     try:
         # Reuse the logic from get_current_user but return None on errors
-        return get_current_user(credentials, db)
+        return get_current_user(request, credentials, db)
     except HTTPException:
         return None
 
@@ -0,0 +1,114 @@
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy before/after_cursor_execute hooks record every statement run
+while a request is in flight: how many, how long they took in total, and a
+fingerprint of each (literals and IN lists collapsed), so the same query
+issued once per row - an N+1 - shows up as one fingerprint with a high
+count. The log_requests middleware reports the numbers in the
+X-DB-Queries / X-DB-Time headers and the request's END log line.
+
+Endpoints can declare a query budget:
+
+    @router.get("", dependencies=[Depends(query_budget(8))])
+
+Going over it logs a warning. With QUERY_BUDGET_STRICT=true (tests, local
+runs) it raises QueryBudgetExceeded instead, failing the request and so the
+test that made it.
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional, List, Tuple
+from sqlalchemy import event
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time"
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget."""
+
+
+class QueryStats:
+    """Statements run during one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # Seconds spent in the database
+        self.fingerprints: Counter = Counter()
+        self.budget: Optional[int] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Fingerprints run at least threshold times (likely N+1 patterns)."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal."""
+    normalized = _STRING.sub("?", statement)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return " ".join(normalized.split())
+
+
+def start_request_stats():
+    """Begin collecting for the current request; returns (stats, token for end_request_stats)."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request_stats(token) -> None:
+    _current.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def query_budget(max_queries: int):
+    """Dependency factory declaring the most queries an endpoint should need."""
+    def set_budget():
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return set_budget
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, not the pooled connection: a statement
+    # that raises never reaches after_cursor_execute, and its context is
+    # simply discarded
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    stats = _current.get()
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def install_query_hooks(engine) -> None:
+    """Attach the statement hooks to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
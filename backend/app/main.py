@@ -9,6 +9,13 @@ import uuid
 
 from .core.config import settings
 from .core.database import engine, Base
+from .core.auth_cache import install_principal_invalidation
+from .utils.upload_stream import UploadSizeLimitMiddleware
+from .models.user import User
+from .core.query_stats import (
+    install_query_hooks, start_request_stats, end_request_stats,
+    QueryBudgetExceeded, DB_QUERIES_HEADER, DB_TIME_HEADER
+)
 from .api import auth, events, users, comments, likes, upload, locations, geocoding, custom_groups, share_links, stripe_api, email_api, invitations, media_engagement, tag_profiles, event_tags, relationships, feedback, admin, ai_creator
 
 # Configure logging for Vercel (stdout capture)
@@ -19,6 +26,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ofs")
 
+# Per-request query count / DB time (reported by log_requests)
+install_query_hooks(engine)
+
+# Drop cached auth principals when a user row changes (see core/auth_cache.py)
+install_principal_invalidation(User)
+
 # Tables are managed by migrations, not created on startup
 # Base.metadata.create_all(bind=engine)  # Removed to avoid connection exhaustion in serverless
 
@@ -32,12 +45,20 @@ app = FastAPI(
 origins = [origin.strip() for origin in settings.CORS_ORIGINS.split(",")] if settings.CORS_ORIGINS else ["http://localhost:5173"]
 print(f"CORS Origins configured: {origins}")  # Debug logging
 
+# Reject oversized uploads before they are parsed/spooled. Added before CORS
+# so the 413 still carries CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={f"{settings.API_V1_STR}{path}": size for path, size in upload.UPLOAD_BODY_LIMITS.items()},
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor", "ETag", DB_QUERIES_HEADER, DB_TIME_HEADER],
 )
 
 # Demo account write-blocking middleware (safety net)
@@ -56,27 +77,22 @@ async def block_demo_writes(request: Request, call_next):
             if auth_header.startswith("Bearer "):
                 token = auth_header[7:]
                 try:
-                    from .core.security import decode_token
-                    payload = decode_token(token)
-                    if payload:
-                        user_id_str = payload.get("sub")
-                        if user_id_str:
-                            from .core.database import SessionLocal
-                            from .models.user import User as UserModel
-                            db = SessionLocal()
-                            try:
-                                user_id = int(user_id_str)
-                                user = db.query(UserModel).filter(UserModel.id == user_id).first()
-                                if user and getattr(user, 'is_demo_account', False):
-                                    from fastapi.responses import JSONResponse
-                                    return JSONResponse(
-                                        status_code=403,
-                                        content={"detail": "Demo accounts cannot perform this action. Sign up for your own account!"}
-                                    )
-                            except (ValueError, TypeError):
-                                pass  # Not a legacy token, let it through
-                            finally:
-                                db.close()
+                    from .core.auth_cache import verify_token
+                    from .core.deps import get_demo_user_ids
+                    # Same cached verification get_current_user will reuse
+                    verified = verify_token(token)
+                    if verified.principal is not None:
+                        is_demo = verified.principal.is_demo_account
+                    elif verified.kind == "legacy":
+                        is_demo = int(verified.subject) in get_demo_user_ids()
+                    else:
+                        is_demo = False  # Unresolved Supabase token: require_not_demo covers it
+                    if is_demo:
+                        from fastapi.responses import JSONResponse
+                        return JSONResponse(
+                            status_code=403,
+                            content={"detail": "Demo accounts cannot perform this action. Sign up for your own account!"}
+                        )
                 except Exception:
                     pass  # Auth parsing failed, let normal auth handle it
 
@@ -95,22 +111,73 @@ async def log_requests(request: Request, call_next):
     if path not in ["/", "/health", "/debug/env"]:
         logger.info(f"[{request_id}] START {request.method} {path}")
 
+    stats, stats_token = start_request_stats()
     try:
         response = await call_next(request)
         duration = time.time() - start_time
+        db_ms = stats.duration * 1000
 
         # Log request completion (skip health checks)
         if path not in ["/", "/health", "/debug/env"]:
-            logger.info(f"[{request_id}] END {response.status_code} in {duration:.3f}s")
-
-        # Add correlation ID to response headers for debugging
+            logger.info(f"[{request_id}] END {response.status_code} in {duration:.3f}s "
+                        f"(db: {stats.count} queries, {db_ms:.1f}ms)")
+            for statement, times in stats.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD):
+                logger.warning(f"[{request_id}] Repeated {times}x (possible N+1): {statement[:200]}")
+
+        if stats.over_budget:
+            message = f"{request.method} {path} ran {stats.count} queries (budget {stats.budget})"
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"[{request_id}] Query budget exceeded: {message}")
+
+        # Add correlation ID and DB usage to response headers for debugging
         response.headers["X-Request-ID"] = request_id
+        response.headers[DB_QUERIES_HEADER] = str(stats.count)
+        response.headers[DB_TIME_HEADER] = f"{db_ms:.1f}"
         return response
 
     except Exception as e:
         duration = time.time() - start_time
         logger.error(f"[{request_id}] FAILED after {duration:.3f}s: {type(e).__name__}: {e}")
         raise
+    finally:
+        end_request_stats(stats_token)
+
+
+# Flush buffered view counts / last-seen timestamps (see utils/write_behind.py)
+@app.on_event("startup")
+async def start_write_behind_flusher():
+    import asyncio
+    from .utils.write_behind import flush_write_behind
+
+    async def flush_periodically():
+        while True:
+            await asyncio.sleep(settings.WRITE_BEHIND_FLUSH_SECONDS)
+            await asyncio.to_thread(flush_write_behind)
+
+    app.state.write_behind_task = asyncio.create_task(flush_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_write_behind_flusher():
+    import asyncio
+    from .utils.write_behind import flush_write_behind
+
+    task = getattr(app.state, "write_behind_task", None)
+    if task:
+        task.cancel()
+    await asyncio.to_thread(flush_write_behind)
+
+
+@app.on_event("shutdown")
+async def stop_worker_pools():
+    import asyncio
+    from .utils.cpu_pool import shutdown_cpu_pool
+    from .utils.storage_uploader import shutdown_storage_uploader
+
+    await asyncio.to_thread(shutdown_cpu_pool)
+    await asyncio.to_thread(shutdown_storage_uploader)
+
 
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(events.router, prefix=settings.API_V1_STR)
@@ -23,4 +23,6 @@ from .custom_group import CustomGroup, CustomGroupMember
 from .tag_profile_relationship import TagProfileRelationship
 from .tag_profile_relationship_request import TagProfileRelationshipRequest
 from .feedback import Feedback
-from .app_setting import AppSetting
\ No newline at end of file
+from .app_setting import AppSetting
+from .timeline_entry import TimelineEntry
+from .event_audience import EventAudience
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -17,6 +17,11 @@ class Comment(Base):
     parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
     depth = Column(Integer, default=0)  # 0=top-level, 1=reply, 2=reply-to-reply (max)
 
+    __table_args__ = (
+        # An event's comment thread in posting order
+        Index("ix_comments_event_created_at", "event_id", "created_at"),
+    )
+
     # Relationships
     event = relationship("Event", back_populates="comments")
     author = relationship("User", back_populates="comments")
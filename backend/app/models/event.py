@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from ..core.database import Base
 
@@ -21,6 +22,8 @@ class Event(Base):
     has_multiple_locations = Column(Boolean, default=False)
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     view_count = Column(Integer, default=0)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)  # Denormalized, see utils/event_counters.py
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)  # Denormalized, see utils/event_counters.py
     is_published = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False)
 
@@ -40,7 +43,11 @@ class Event(Base):
     # Demo showcase
     is_demo_showcase = Column(Boolean, default=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Full-text search document (Postgres only; SQLite uses the events_fts table)
+    # Maintained by utils/event_search.py on create/update, never loaded with the row
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Keyset sort key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     author = relationship("User", back_populates="events")
@@ -49,4 +56,24 @@ class Event(Base):
     likes = relationship("Like", back_populates="event", cascade="all, delete-orphan")
     locations = relationship("EventLocation", back_populates="event", cascade="all, delete-orphan")
     images = relationship("EventImage", back_populates="event", cascade="all, delete-orphan")
-    custom_group = relationship("CustomGroup", back_populates="events")
\ No newline at end of file
+    custom_group = relationship("CustomGroup", back_populates="events")
+
+    __table_args__ = (
+        # Keyset pagination: (date, id) ordering for "event_date" and "upload_date" feeds
+        Index("ix_events_start_date_id", "start_date", "id"),
+        Index("ix_events_created_at_id", "created_at", "id"),
+        # Live events only: the feed's keyset walk skips drafts and trash for free
+        Index(
+            "ix_events_live_start_date_id", "start_date", "id",
+            postgresql_where=text("is_published = true AND is_deleted = false"),
+            sqlite_where=text("is_published = 1 AND is_deleted = 0")
+        ),
+        # Profile pages and drafts: an author's non-deleted events by date
+        Index(
+            "ix_events_author_published_start_date", "author_id", "is_published", "start_date",
+            postgresql_where=text("is_deleted = false"),
+            sqlite_where=text("is_deleted = 0")
+        ),
+        # Full-text search
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
\ No newline at end of file
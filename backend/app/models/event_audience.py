@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from ..core.database import Base
+
+
+class EventAudience(Base):
+    """
+    Materialized ACL for non-public events: one row per user allowed to see
+    a followers / close_family / custom_group event (directly or because
+    they follow someone tagged in it). Public and private events have no
+    rows. Maintained by services/event_audience.py.
+    """
+    __tablename__ = "event_audience"
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_event_audience_user_event", "user_id", "event_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -31,6 +31,11 @@ class EventImage(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # An event's gallery in display order
+        Index("ix_event_images_event_order", "event_id", "order_index"),
+    )
+
     event = relationship("Event", back_populates="images")
     media_likes = relationship("MediaLike", back_populates="event_image", cascade="all, delete-orphan")
     media_comments = relationship("MediaComment", back_populates="event_image", cascade="all, delete-orphan")
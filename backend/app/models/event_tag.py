@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -30,6 +30,10 @@ class EventTag(Base):
             "(tagged_user_id IS NULL AND tag_profile_id IS NOT NULL)",
             name="check_one_tagged"
         ),
+        # A user's tag requests / accepted tags
+        Index("ix_event_tags_tagged_user_status", "tagged_user_id", "status"),
+        # An event's accepted tags (tag-based visibility)
+        Index("ix_event_tags_event_status", "event_id", "status"),
     )
 
     # Relationships
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -19,6 +19,13 @@ class Follow(Base):
     invited_viewer_follow = Column(Boolean, default=False)  # True if auto-created from invitation
     invitation_id = Column(Integer, ForeignKey("invited_viewers.id", ondelete="SET NULL"), nullable=True)
 
+    __table_args__ = (
+        # "Does viewer follow author?" - privacy checks, feed filters, follow buttons
+        Index("ix_follows_follower_following_status", "follower_id", "following_id", "status"),
+        # "Who follows author?" - followers lists, fan-out, audience rebuilds
+        Index("ix_follows_following_status", "following_id", "status"),
+    )
+
     # Relationships
     follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
     following = relationship("User", foreign_keys=[following_id], back_populates="followers")
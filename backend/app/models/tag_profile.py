@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -33,3 +33,8 @@ class TagProfile(Base):
     created_by = relationship("User", foreign_keys=[created_by_id], backref="created_tag_profiles")
     merged_user = relationship("User", foreign_keys=[merged_user_id])
     event_tags = relationship("EventTag", back_populates="tag_profile", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Trigram index for fuzzy tag profile search (utils/name_search.py, Postgres pg_trgm)
+        Index("ix_tag_profiles_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
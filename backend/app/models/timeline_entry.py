@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from ..core.database import Base
+
+
+class TimelineEntry(Base):
+    """
+    One row per (viewer, event) on a viewer's precomputed "following" feed.
+    Written on publish (fan-out on write) and kept in step with follows,
+    mutes, groups and privacy changes by services/timeline.py. The event's
+    sort dates are copied in so a feed page is an index-only keyset scan.
+    """
+    __tablename__ = "timeline_entries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_timeline_user_start_date", "user_id", "start_date", "event_id"),
+        Index("ix_timeline_user_created_at", "user_id", "created_at", "event_id"),
+        Index("ix_timeline_author_user", "author_id", "user_id"),
+        Index("ix_timeline_event", "event_id"),
+    )
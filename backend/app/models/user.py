@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
@@ -33,6 +33,9 @@ class User(Base):
     stripe_customer_id = Column(String, unique=True, nullable=True)
     stripe_subscription_id = Column(String, unique=True, nullable=True)
     subscription_status = Column(String, default='trial')  # 'trial', 'active', 'canceled', 'expired'
+    # Materialized is_user_subscription_active(): whether this user's events are visible to others.
+    # Maintained by Stripe webhooks, subscription auto-correct and the expired-trial sweep.
+    content_visible = Column(Boolean, default=True, server_default="true", nullable=False, index=True)
 
     # User preferences
     theme_preference = Column(String(10), default='dark')  # 'dark' or 'light'
@@ -90,6 +93,13 @@ class User(Base):
     comment_reactions = relationship("CommentReaction", back_populates="user", cascade="all, delete-orphan")
     media_comment_reactions = relationship("MediaCommentReaction", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Trigram indexes for fuzzy people search (utils/name_search.py, Postgres pg_trgm)
+        Index("ix_users_username_trgm", "username", postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_display_name_trgm", "display_name", postgresql_using="gin", postgresql_ops={"display_name": "gin_trgm_ops"}),
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
+
     # Subscription helper methods
     def get_trial_status(self):
         """Returns 'active', 'expired', or 'never_started'"""
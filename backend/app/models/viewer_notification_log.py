@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -17,6 +17,11 @@ class ViewerNotificationLog(Base):
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     sent_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Rate-limit check: last notification to viewer about author
+        Index("ix_viewer_notification_logs_viewer_author_sent", "viewer_id", "event_author_id", "sent_at"),
+    )
+
     # Relationships
     viewer = relationship("User", foreign_keys=[viewer_id])
     author = relationship("User", foreign_keys=[event_author_id])
@@ -0,0 +1,157 @@
+"""
+Materialized audiences (ACLs) for non-public events.
+
+can_view_event() and filter_events_by_privacy() used to re-derive
+visibility of followers-only, close-family and custom-group events from
+follows, group memberships and accepted tags on every check. The
+event_audience table stores the result instead - one (event_id, user_id)
+row per user the rules admit - so a check is a single primary-key probe:
+
+    EXISTS (SELECT 1 FROM event_audience WHERE event_id = ? AND user_id = ?)
+
+The rows encode exactly the relationship rules of can_view_event():
+- followers: accepted followers of the author;
+- close_family: accepted followers the author marked close family;
+- custom_group: members of the event's group (no group: nobody);
+- custom_group (for non-members) and unrecognised levels: accepted
+  followers of a user with an accepted tag on the event.
+Author, public/private and subscription checks stay in code; they need no
+join. Rows are kept for drafts and deleted events too, since the rules
+ignore those flags.
+
+Maintenance is a DELETE plus an INSERT ... SELECT scoped to what changed.
+Callers commit.
+- rebuild_event_audience(): event created, privacy or group changed, tags changed
+- refresh_audience_pair(): a follow accepted/removed, close family toggled,
+  group membership changed
+scripts/check_event_audience.py compares the table with the rules.
+"""
+from typing import Iterable, Optional
+from sqlalchemy import select, union, insert, delete, and_, or_, exists, func
+from sqlalchemy.orm import Session, aliased
+from ..models.event import Event
+from ..models.follow import Follow
+from ..models.event_tag import EventTag
+from ..models.custom_group import CustomGroupMember
+from ..models.event_audience import EventAudience
+
+# Event fields whose change means the event's audience must be rebuilt
+AUDIENCE_FIELDS = frozenset({"privacy_level", "custom_group_id"})
+
+
+def _audience_select(event_clauses: list, viewer_id: Optional[int] = None):
+    """SELECT (event_id, user_id) of every audience row for events matching event_clauses."""
+    privacy = func.coalesce(Event.privacy_level, "")
+
+    followers = select(Event.id.label("event_id"), Follow.follower_id.label("user_id")).select_from(Event).join(
+        Follow,
+        and_(Follow.following_id == Event.author_id, Follow.status == "accepted")
+    ).where(
+        *event_clauses,
+        or_(
+            privacy == "followers",
+            and_(privacy == "close_family", Follow.is_close_family == True)
+        )
+    )
+    members = select(Event.id.label("event_id"), CustomGroupMember.user_id.label("user_id")).select_from(Event).join(
+        CustomGroupMember,
+        CustomGroupMember.group_id == Event.custom_group_id
+    ).where(
+        *event_clauses,
+        privacy == "custom_group"
+    )
+    tag_followers = select(Event.id.label("event_id"), Follow.follower_id.label("user_id")).select_from(Event).join(
+        EventTag,
+        and_(EventTag.event_id == Event.id, EventTag.status == "accepted")
+    ).join(
+        Follow,
+        and_(Follow.following_id == EventTag.tagged_user_id, Follow.status == "accepted")
+    ).where(
+        *event_clauses,
+        # followers/close_family decide without the tag rule; a custom_group
+        # event without a group is author-only, tags or not
+        privacy.notin_(("public", "private", "followers", "close_family")),
+        ~and_(privacy == "custom_group", Event.custom_group_id.is_(None))
+    )
+
+    if viewer_id is not None:
+        followers = followers.where(Follow.follower_id == viewer_id)
+        members = members.where(CustomGroupMember.user_id == viewer_id)
+        tag_followers = tag_followers.where(Follow.follower_id == viewer_id)
+
+    return union(followers, members, tag_followers)
+
+
+def _insert_audience(db: Session, event_clauses: list, viewer_id: Optional[int] = None) -> None:
+    db.execute(insert(EventAudience).from_select(
+        ["event_id", "user_id"],
+        _audience_select(event_clauses, viewer_id)
+    ))
+
+
+def rebuild_event_audience(db: Session, event_ids: Iterable[int]) -> None:
+    """Recompute the audience of the given events. Caller commits."""
+    event_ids = list(event_ids)
+    if not event_ids:
+        return
+    db.flush()
+    db.execute(delete(EventAudience).where(EventAudience.event_id.in_(event_ids)))
+    _insert_audience(db, [Event.id.in_(event_ids)])
+
+
+def refresh_audience_pair(db: Session, viewer_id: int, user_id: int) -> None:
+    """
+    Recompute viewer's rows for every event that viewer's relationship to
+    user_id can affect: events user_id authored, and events where user_id
+    has an accepted tag. Caller commits.
+    """
+    db.flush()
+    # Aliased so it does not correlate with the EventTag join in _audience_select
+    user_tag = aliased(EventTag)
+    affected = or_(
+        Event.author_id == user_id,
+        exists().where(and_(
+            user_tag.event_id == Event.id,
+            user_tag.tagged_user_id == user_id,
+            user_tag.status == "accepted"
+        ))
+    )
+    affected_ids = select(Event.id).where(affected)
+    db.execute(delete(EventAudience).where(
+        EventAudience.user_id == viewer_id,
+        EventAudience.event_id.in_(affected_ids)
+    ))
+    _insert_audience(db, [affected], viewer_id)
+
+
+def rebuild_all_audiences(db: Session) -> None:
+    """Recompute the whole table. Caller commits."""
+    db.execute(delete(EventAudience))
+    _insert_audience(db, [])
+
+
+def audience_clause(viewer_id: int):
+    """SQL: the current Event row's audience includes viewer_id (indexed PK probe)."""
+    return exists().where(and_(
+        EventAudience.event_id == Event.id,
+        EventAudience.user_id == viewer_id
+    ))
+
+
+def in_audience(db: Session, event_id: int, viewer_id: int) -> bool:
+    """Whether viewer_id is in the stored audience of one event."""
+    return db.query(exists().where(and_(
+        EventAudience.event_id == event_id,
+        EventAudience.user_id == viewer_id
+    ))).scalar()
+
+
+def audience_event_ids(db: Session, event_ids: Iterable[int], viewer_id: int) -> set:
+    """The subset of event_ids whose stored audience includes viewer_id (one query)."""
+    event_ids = list(event_ids)
+    if not event_ids:
+        return set()
+    return {row[0] for row in db.query(EventAudience.event_id).filter(
+        EventAudience.user_id == viewer_id,
+        EventAudience.event_id.in_(event_ids)
+    ).all()}
@@ -0,0 +1,154 @@
+"""
+Unified search over everything that can be tagged: users and tag profiles.
+
+Both kinds are matched with utils/name_search.py, ranked followed-first
+(users the viewer follows, profiles created by users the viewer follows),
+then by match score, then by name, and returned from ONE SQL statement: a
+UNION ALL of the two per-kind searches with the creator's username joined
+in and "followed" computed by an EXISTS probe on follows. No per-result
+lookups, and nothing depends on the graph snapshot cache being warm.
+
+Used by the tagging UI (GET /search/taggable) and by
+GET /tag-profiles/search. scripts/check_tag_search_queries.py asserts the
+statement count.
+"""
+from typing import NamedTuple, Optional, List
+from sqlalchemy import select, union_all, literal, null, cast, exists, case, func, and_, String, Integer
+from sqlalchemy.orm import Session, aliased
+from ..models.user import User
+from ..models.tag_profile import TagProfile
+from ..models.follow import Follow
+from ..utils.name_search import name_match
+
+# Statements one search may issue (checked by scripts/check_tag_search_queries.py)
+TAG_SEARCH_QUERY_BUDGET = 1
+
+
+class TagTarget(NamedTuple):
+    """One search hit, either a user or a tag profile."""
+    type: str  # 'user' or 'profile'
+    id: int
+    name: str
+    display_name: Optional[str]
+    photo_url: Optional[str]
+    username: Optional[str]  # Users only
+    relationship_to_creator: Optional[str]  # Profiles only
+    created_by_id: Optional[int]  # Profiles only
+    created_by_username: Optional[str]  # Profiles only
+    created_by_display_name: Optional[str]  # Profiles only
+    is_followed: bool  # User is followed, or profile's creator is followed
+    score: float
+
+
+def _followed(viewer_id: int, user_id_column):
+    """EXISTS: the viewer follows user_id_column (accepted follow)."""
+    return exists().where(and_(
+        Follow.follower_id == viewer_id,
+        Follow.following_id == user_id_column,
+        Follow.status == "accepted"
+    ))
+
+
+def _user_select(db: Session, viewer_id: int, q: str, limit: int):
+    match, score = name_match(db, [User.username, User.display_name, User.full_name], q)
+    followed = _followed(viewer_id, User.id)
+    return select(
+        literal("user", String).label("type"),
+        User.id.label("id"),
+        func.coalesce(User.display_name, User.full_name, User.username).label("name"),
+        func.coalesce(User.display_name, User.full_name).label("display_name"),
+        User.avatar_url.label("photo_url"),
+        User.username.label("username"),
+        cast(null(), String).label("relationship_to_creator"),
+        cast(null(), Integer).label("created_by_id"),
+        cast(null(), String).label("created_by_username"),
+        cast(null(), String).label("created_by_display_name"),
+        case((followed, 1), else_=0).label("is_followed"),
+        score.label("score")
+    ).where(
+        match,
+        User.id != viewer_id  # Don't include self
+    ).order_by(
+        case((followed, 1), else_=0).desc(),
+        score.desc(),
+        User.username
+    ).limit(limit)
+
+
+def _profile_select(db: Session, viewer_id: int, q: str, limit: int):
+    creator = aliased(User)
+    match, score = name_match(db, [TagProfile.name], q)
+    followed = _followed(viewer_id, TagProfile.created_by_id)
+    return select(
+        literal("profile", String).label("type"),
+        TagProfile.id.label("id"),
+        TagProfile.name.label("name"),
+        cast(null(), String).label("display_name"),
+        TagProfile.photo_url.label("photo_url"),
+        cast(null(), String).label("username"),
+        TagProfile.relationship_to_creator.label("relationship_to_creator"),
+        TagProfile.created_by_id.label("created_by_id"),
+        creator.username.label("created_by_username"),
+        func.coalesce(creator.display_name, creator.full_name).label("created_by_display_name"),
+        case((followed, 1), else_=0).label("is_followed"),
+        score.label("score")
+    ).join(
+        creator, TagProfile.created_by_id == creator.id
+    ).where(
+        match,
+        TagProfile.is_merged == False  # Don't show merged profiles
+    ).order_by(
+        case((followed, 1), else_=0).desc(),
+        score.desc(),
+        TagProfile.name
+    ).limit(limit)
+
+
+def search_tag_targets(
+    db: Session,
+    viewer_id: int,
+    q: str,
+    include_users: bool = True,
+    include_profiles: bool = True,
+    per_kind_limit: int = 10,
+    limit: int = 20
+) -> List[TagTarget]:
+    """Search users and/or tag profiles matching q in a single statement."""
+    q = (q or "").strip()
+    if not q or not (include_users or include_profiles):
+        return []
+
+    # Each branch is limited inside its own subquery (SQLite rejects LIMIT
+    # directly on compound-select members)
+    branches = []
+    if include_users:
+        branches.append(select(_user_select(db, viewer_id, q, per_kind_limit).subquery()))
+    if include_profiles:
+        branches.append(select(_profile_select(db, viewer_id, q, per_kind_limit).subquery()))
+
+    combined = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery("targets")
+    rows = db.execute(
+        select(combined).order_by(
+            combined.c.is_followed.desc(),
+            combined.c.score.desc(),
+            func.lower(combined.c.name)
+        ).limit(limit)
+    ).all()
+
+    return [
+        TagTarget(
+            type=row.type,
+            id=row.id,
+            name=row.name,
+            display_name=row.display_name,
+            photo_url=row.photo_url,
+            username=row.username,
+            relationship_to_creator=row.relationship_to_creator,
+            created_by_id=row.created_by_id,
+            created_by_username=row.created_by_username,
+            created_by_display_name=row.created_by_display_name,
+            is_followed=bool(row.is_followed),
+            score=float(row.score or 0)
+        )
+        for row in rows
+    ]
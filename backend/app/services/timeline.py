@@ -0,0 +1,215 @@
+"""
+Precomputed "following" timelines (fan-out on write).
+
+The home feed used to re-run the joined, filtered and sorted event query
+for every load. For the "following" feed each viewer instead has
+timeline_entries rows - one per event they are eligible to see from people
+they follow or share a custom group with - written when the event is
+published, so a feed page is an index-only keyset scan over
+(user_id, start_date|created_at, event_id) followed by a primary-key load
+of that page's events.
+
+Eligibility mirrors can_view_event() for the author-based rules:
+- the author always sees their own events;
+- public and followers-only events go to accepted followers;
+- close_family events go to followers marked close family;
+- custom_group events go to the group's members;
+- nobody gets events from an author they have muted;
+- private events reach only their author; drafts and deleted events no one.
+Author subscription expiry is applied when reading (author_visible_clause),
+since it flips without touching events.
+
+Everything is computed with INSERT ... SELECT, so keeping timelines current
+costs a couple of statements per change, never a Python loop over followers:
+- fan_out_event(): publish, restore, or privacy/date change of an event
+- remove_event_from_timelines(): unpublish, delete
+- refresh_timeline_pair(): follow accepted, unfollow, close family, mute
+- refresh_group_member(): custom group membership changes
+- refresh_event_timelines(): custom group deleted
+Callers commit. scripts/rebuild_timelines.py backfills existing data.
+"""
+from typing import List, Optional, Tuple, Iterable
+from sqlalchemy import select, union, insert, delete, and_, or_, exists, func
+from sqlalchemy.orm import Session, selectinload
+from ..models.event import Event
+from ..models.follow import Follow
+from ..models.user import User
+from ..models.user_mute import UserMute
+from ..models.custom_group import CustomGroup, CustomGroupMember
+from ..models.timeline_entry import TimelineEntry
+from ..utils.pagination import encode_cursor_payload, decode_cursor
+
+FOLLOWING_FEED = "following"
+# Event fields whose change means the event's timeline rows must be rewritten
+TIMELINE_FIELDS = frozenset({"privacy_level", "custom_group_id", "start_date", "is_published"})
+_ENTRY_COLUMNS = ["user_id", "event_id", "author_id", "start_date", "created_at"]
+
+
+def _entry_select(viewer_column):
+    return select(
+        viewer_column.label("user_id"),
+        Event.id.label("event_id"),
+        Event.author_id.label("author_id"),
+        Event.start_date.label("start_date"),
+        Event.created_at.label("created_at")
+    )
+
+
+def _not_muted(viewer_column):
+    return ~exists().where(and_(
+        UserMute.muter_id == viewer_column,
+        UserMute.muted_user_id == Event.author_id
+    ))
+
+
+def _audience_select(event_clauses: list, viewer_id: Optional[int] = None):
+    """SELECT of timeline rows for the events matching event_clauses (optionally one viewer)."""
+    live = [Event.is_published == True, Event.is_deleted == False, *event_clauses]
+    privacy = func.coalesce(Event.privacy_level, "public")
+
+    own = _entry_select(Event.author_id).where(*live)
+    followers = _entry_select(Follow.follower_id).select_from(Event).join(
+        Follow,
+        and_(Follow.following_id == Event.author_id, Follow.status == "accepted")
+    ).where(
+        *live,
+        or_(
+            privacy.in_(("public", "followers")),
+            and_(privacy == "close_family", Follow.is_close_family == True)
+        ),
+        _not_muted(Follow.follower_id)
+    )
+    members = _entry_select(CustomGroupMember.user_id).select_from(Event).join(
+        CustomGroupMember,
+        CustomGroupMember.group_id == Event.custom_group_id
+    ).where(
+        *live,
+        privacy == "custom_group",
+        _not_muted(CustomGroupMember.user_id)
+    )
+
+    if viewer_id is not None:
+        own = own.where(Event.author_id == viewer_id)
+        followers = followers.where(Follow.follower_id == viewer_id)
+        members = members.where(CustomGroupMember.user_id == viewer_id)
+
+    # UNION (not ALL): a follower who is also a group member gets one row
+    return union(own, followers, members)
+
+
+def _insert_audience(db: Session, event_clauses: list, viewer_id: Optional[int] = None) -> None:
+    db.execute(insert(TimelineEntry).from_select(
+        _ENTRY_COLUMNS,
+        _audience_select(event_clauses, viewer_id)
+    ))
+
+
+def fan_out_event(db: Session, event: Event) -> None:
+    """(Re)write every timeline row for one event. Caller commits."""
+    db.flush()
+    remove_event_from_timelines(db, event.id)
+    if event.is_published and not event.is_deleted:
+        _insert_audience(db, [Event.id == event.id])
+
+
+def remove_event_from_timelines(db: Session, event_id: int) -> None:
+    """Delete an event from all timelines. Caller commits."""
+    db.execute(delete(TimelineEntry).where(TimelineEntry.event_id == event_id))
+
+
+def refresh_timeline_pair(db: Session, viewer_id: int, author_id: int) -> None:
+    """
+    Recompute which of author's events are on viewer's timeline - after a
+    follow is accepted or removed, close family changes, or a mute. Caller commits.
+    """
+    db.flush()
+    db.execute(delete(TimelineEntry).where(
+        TimelineEntry.user_id == viewer_id,
+        TimelineEntry.author_id == author_id
+    ))
+    _insert_audience(db, [Event.author_id == author_id], viewer_id)
+
+
+def refresh_group_member(db: Session, group_id: int, user_ids: Iterable[int]) -> None:
+    """Recompute timelines for users added to or removed from a custom group. Caller commits."""
+    owner_id = db.query(CustomGroup.owner_id).filter(CustomGroup.id == group_id).scalar()
+    if owner_id is None:
+        return
+    for user_id in set(user_ids):
+        refresh_timeline_pair(db, user_id, owner_id)
+
+
+def refresh_event_timelines(db: Session, event_ids: Iterable[int]) -> None:
+    """Rewrite the timeline rows of several events (e.g. a custom group was deleted). Caller commits."""
+    event_ids = list(event_ids)
+    if not event_ids:
+        return
+    db.flush()
+    db.execute(delete(TimelineEntry).where(TimelineEntry.event_id.in_(event_ids)))
+    _insert_audience(db, [Event.id.in_(event_ids)])
+
+
+def rebuild_timelines(db: Session, user_ids: Optional[List[int]] = None) -> None:
+    """Recompute timelines from scratch (all viewers, or only user_ids). Caller commits."""
+    if user_ids is None:
+        db.execute(delete(TimelineEntry))
+        _insert_audience(db, [])
+        return
+    for user_id in user_ids:
+        db.execute(delete(TimelineEntry).where(TimelineEntry.user_id == user_id))
+        _insert_audience(db, [], user_id)
+
+
+def get_timeline_page(
+    db: Session,
+    viewer: User,
+    order_by: str = "event_date",
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    category: Optional[str] = None,
+    event_options: tuple = ()
+) -> Tuple[List[Event], Optional[str]]:
+    """
+    One page of the viewer's "following" feed, newest first.
+
+    The page of event IDs comes from the timeline index alone (keyset on
+    the same cursors as paginate_events); only the page's events are then
+    loaded, by primary key. Returns (events, next_cursor).
+    """
+    from ..utils.privacy import author_visible_clause
+
+    date_col = TimelineEntry.created_at if order_by == "upload_date" else TimelineEntry.start_date
+
+    page = db.query(TimelineEntry.event_id, date_col).filter(TimelineEntry.user_id == viewer.id)
+    if cursor:
+        data = decode_cursor(cursor, order_by)
+        page = page.filter(or_(
+            date_col < data["d"],
+            and_(date_col == data["d"], TimelineEntry.event_id < data["i"])
+        ))
+    if category:
+        # Category is not denormalized; this variant probes events per row
+        page = page.join(Event, Event.id == TimelineEntry.event_id).filter(Event.category == category)
+    rows = page.order_by(date_col.desc(), TimelineEntry.event_id.desc()).limit(limit).all()
+
+    ids = [row[0] for row in rows]
+    if not ids:
+        return [], None
+
+    events_by_id = {e.id: e for e in db.query(Event).options(
+        *event_options,
+        selectinload(Event.author)
+    ).filter(
+        Event.id.in_(ids),
+        Event.is_published == True,
+        Event.is_deleted == False,
+        author_visible_clause(viewer)
+    ).all()}
+    events = [events_by_id[i] for i in ids if i in events_by_id]
+
+    # Cursor from the last index row, even if its event was filtered out above
+    next_cursor = None
+    if len(rows) == limit:
+        last_id, last_date = rows[-1]
+        next_cursor = encode_cursor_payload({"o": order_by, "d": last_date.isoformat(), "i": last_id})
+    return events, next_cursor
@@ -0,0 +1,89 @@
+"""
+Request-scoped batch loading of related rows (DataLoader pattern).
+
+List endpoints used to hydrate each row with its own queries (tagged user,
+tag profile, profile creator, proposer, ...), so a 50-row response cost
+100+ round trips. A BatchLoader collects the IDs it is asked about and
+loads each model with a single `id IN (...)` query on first access, so a
+listing costs one query per table instead of one per row:
+
+    loader.prime(User, (tag.tagged_user_id for tag in tags))
+    loader.prime(TagProfile, (tag.tag_profile_id for tag in tags))
+    # Second level: primed from the profiles, loaded in one more query
+    loader.prime(User, (p.created_by_id for p in loader.get_many(TagProfile)))
+    user = loader.get(User, tag.tagged_user_id)
+
+Endpoints take it as a dependency, `loader: BatchLoader = Depends(get_batch_loader)`;
+FastAPI caches dependencies per request, so every helper in one request
+shares the same loader and never loads a row twice.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from ..core.database import get_db
+
+
+class BatchLoader:
+    """Collects primary keys per model and loads them in one IN query per model."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: Dict[type, set] = defaultdict(set)
+        self._loaded: Dict[type, dict] = defaultdict(dict)
+        self._options: Dict[type, tuple] = {}
+
+    def options(self, model, *options) -> "BatchLoader":
+        """Loader options for every query of model (e.g. event_card_options() to skip descriptions)."""
+        self._options[model] = options
+        return self
+
+    def prime(self, model, ids: Iterable[Optional[int]]) -> "BatchLoader":
+        """Queue IDs to load; None and already-loaded IDs are ignored."""
+        loaded = self._loaded[model]
+        pending = self._pending[model]
+        for id_ in ids:
+            if id_ is not None and id_ not in loaded:
+                pending.add(id_)
+        return self
+
+    def add(self, *rows) -> "BatchLoader":
+        """Register rows the caller already has (e.g. current_user) so they are not reloaded."""
+        for row in rows:
+            if row is not None:
+                self._loaded[type(row)][row.id] = row
+                self._pending[type(row)].discard(row.id)
+        return self
+
+    def _load(self, model) -> None:
+        pending = self._pending.pop(model, None)
+        if not pending:
+            return
+        loaded = self._loaded[model]
+        query = self.db.query(model).filter(model.id.in_(pending))
+        if model in self._options:
+            query = query.options(*self._options[model])
+        for row in query.all():
+            loaded[row.id] = row
+        # Remember misses so they are not queried again
+        for id_ in pending:
+            loaded.setdefault(id_, None)
+
+    def get(self, model, id_: Optional[int]):
+        """Return the row with this ID (loading everything queued for the model), or None."""
+        if id_ is None:
+            return None
+        if id_ not in self._loaded[model]:
+            self._pending[model].add(id_)
+            self._load(model)
+        return self._loaded[model].get(id_)
+
+    def get_many(self, model) -> List:
+        """Load everything queued for model and return all rows known for it."""
+        self._load(model)
+        return [row for row in self._loaded[model].values() if row is not None]
+
+
+def get_batch_loader(db: Session = Depends(get_db)) -> BatchLoader:
+    """FastAPI dependency: one BatchLoader per request, sharing the request's session."""
+    return BatchLoader(db)
@@ -0,0 +1,146 @@
+"""
+Bounded executor for CPU-bound request work (Pillow decode/resize, photo
+clustering), so it runs off the event loop instead of stalling every other
+request on the worker.
+
+Admission is bounded: at most CPU_POOL_WORKERS jobs run and
+CPU_POOL_QUEUE_DEPTH more may wait. Past that, run_cpu_bound() raises
+CPUPoolSaturated straight away and endpoints answer 429 with Retry-After,
+rather than queueing work the client will have given up on.
+
+Jobs must be picklable top-level functions with picklable arguments, so the
+same call works in every mode (see resolve_cpu_pool_mode()).
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from ..core.config import settings
+
+CPU_POOL_MODES = ("process", "thread")
+
+
+class CPUPoolSaturated(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+def resolve_cpu_pool_mode() -> str:
+    """
+    Executor from CPU_POOL_MODE:
+    - "process": ProcessPoolExecutor (spawned workers). True parallelism and
+      no GIL contention with the event loop; for long-running uvicorn workers.
+    - "thread": ThreadPoolExecutor. Pillow releases the GIL while decoding,
+      resampling and encoding, so this still frees the loop; the only option
+      on serverless (Vercel), which has no /dev/shm for process pools.
+    - "auto" (default): "thread" on Vercel, "process" elsewhere.
+    """
+    mode = settings.CPU_POOL_MODE.lower()
+    if mode == "auto":
+        mode = "thread" if os.environ.get("VERCEL") else "process"
+    if mode not in CPU_POOL_MODES:
+        raise ValueError(f"CPU_POOL_MODE must be one of {', '.join(CPU_POOL_MODES)} or auto, got {settings.CPU_POOL_MODE!r}")
+    return mode
+
+
+_pool: Optional[Executor] = None
+_pool_mode: Optional[str] = None
+_lock = threading.Lock()
+_stats = {"in_flight": 0, "peak_in_flight": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+
+def _workers() -> int:
+    return settings.CPU_POOL_WORKERS or min(4, os.cpu_count() or 1)
+
+
+def get_cpu_pool() -> Executor:
+    """The process-wide executor, created on first use."""
+    global _pool, _pool_mode
+    with _lock:
+        if _pool is None:
+            _pool_mode = resolve_cpu_pool_mode()
+            if _pool_mode == "process":
+                # spawn, not fork: forking a process with running threads
+                # (event loop helpers, DB pool) can deadlock the child
+                _pool = ProcessPoolExecutor(
+                    max_workers=_workers(),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _pool = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="cpu")
+        return _pool
+
+
+def _admit() -> None:
+    with _lock:
+        if _stats["in_flight"] >= _workers() + settings.CPU_POOL_QUEUE_DEPTH:
+            _stats["rejected"] += 1
+            raise CPUPoolSaturated()
+        _stats["in_flight"] += 1
+        _stats["peak_in_flight"] = max(_stats["peak_in_flight"], _stats["in_flight"])
+
+
+def _release(future) -> None:
+    with _lock:
+        _stats["in_flight"] -= 1
+        if future.cancelled() or future.exception() is not None:
+            _stats["failed"] += 1
+        else:
+            _stats["completed"] += 1
+
+
+def _discard_pool(pool: Executor) -> None:
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def submit_cpu_bound(fn: Callable, *args: Any):
+    """Submit fn(*args) to the pool; raises CPUPoolSaturated when full."""
+    _admit()
+    try:
+        pool = get_cpu_pool()
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. a decoder segfault); start a fresh pool
+            _discard_pool(pool)
+            future = get_cpu_pool().submit(fn, *args)
+    except Exception:
+        with _lock:
+            _stats["in_flight"] -= 1
+        raise
+    # Released when the job finishes, even if the awaiting request was cancelled
+    future.add_done_callback(_release)
+    return future
+
+
+async def run_cpu_bound(fn: Callable, *args: Any) -> Any:
+    """Run fn(*args) on the pool without blocking the event loop."""
+    return await asyncio.wrap_future(submit_cpu_bound(fn, *args))
+
+
+def get_cpu_pool_status() -> dict:
+    """Mode, limits and admission counters for this process."""
+    with _lock:
+        return {
+            "mode": _pool_mode or resolve_cpu_pool_mode(),
+            "started": _pool is not None,
+            "workers": _workers(),
+            "queue_depth": settings.CPU_POOL_QUEUE_DEPTH,
+            **_stats,
+        }
+
+
+def shutdown_cpu_pool() -> None:
+    """Stop the workers after running jobs finish (app shutdown)."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,70 @@
+"""
+Denormalized like/comment counters on events.
+
+Event.like_count and Event.comment_count are adjusted with an atomic SQL
+increment in the same transaction as the Like/Comment write, so feed and
+detail responses can show real counts without loading the rows.
+
+Writes that bypass these helpers (DB-level cascades when a user is deleted,
+seed scripts, manual SQL) make the counters drift; recount_event_counters()
+rebuilds them from the source tables.
+"""
+from typing import Optional, List
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import Session
+from ..models.event import Event
+from ..models.like import Like
+from ..models.comment import Comment
+
+
+def adjust_like_count(db: Session, event_id: int, delta: int) -> None:
+    """Add delta to an event's like_count. Caller commits."""
+    db.query(Event).filter(Event.id == event_id).update(
+        {Event.like_count: func.coalesce(Event.like_count, 0) + delta},
+        synchronize_session=False
+    )
+
+
+def adjust_comment_count(db: Session, event_id: int, delta: int) -> None:
+    """Add delta to an event's comment_count. Caller commits."""
+    db.query(Event).filter(Event.id == event_id).update(
+        {Event.comment_count: func.coalesce(Event.comment_count, 0) + delta},
+        synchronize_session=False
+    )
+
+
+def recount_event_counters(db: Session, event_ids: Optional[List[int]] = None) -> int:
+    """
+    Recompute like_count and comment_count from the likes/comments tables.
+
+    Only rows that have drifted are rewritten. Pass event_ids to limit the
+    recount to specific events; otherwise every event is checked.
+
+    Returns the number of events whose counters were corrected.
+    """
+    actual_likes = select(func.count(Like.id)).where(
+        Like.event_id == Event.id
+    ).correlate(Event).scalar_subquery()
+
+    actual_comments = select(func.count(Comment.id)).where(
+        Comment.event_id == Event.id
+    ).correlate(Event).scalar_subquery()
+
+    query = db.query(Event).filter(
+        or_(
+            func.coalesce(Event.like_count, -1) != actual_likes,
+            func.coalesce(Event.comment_count, -1) != actual_comments
+        )
+    )
+    if event_ids is not None:
+        query = query.filter(Event.id.in_(event_ids))
+
+    corrected = query.update(
+        {
+            Event.like_count: actual_likes,
+            Event.comment_count: actual_comments
+        },
+        synchronize_session=False
+    )
+    db.commit()
+    return corrected
@@ -0,0 +1,45 @@
+"""
+Column projection for event list endpoints.
+
+Event cards never show the rich-text description (HTML with embedded media,
+often tens of KB per event), so list queries load only the columns a card
+needs. The detail endpoints still load full rows.
+"""
+from sqlalchemy.orm import load_only
+from ..models.event import Event
+
+# Everything a feed/profile card, keyset cursor or privacy check reads
+EVENT_CARD_COLUMNS = (
+    Event.id,
+    Event.slug,
+    Event.title,
+    Event.short_title,
+    Event.summary,
+    Event.start_date,
+    Event.end_date,
+    Event.location_name,
+    Event.latitude,
+    Event.longitude,
+    Event.cover_image_url,
+    Event.has_multiple_locations,
+    Event.author_id,
+    Event.view_count,
+    Event.like_count,
+    Event.comment_count,
+    Event.is_published,
+    Event.is_deleted,
+    Event.privacy_level,
+    Event.category,
+    Event.category_2,
+    Event.custom_group_id,
+    Event.share_enabled,
+    Event.share_expires_at,
+    Event.is_demo_showcase,
+    Event.created_at,
+    Event.updated_at,
+)
+
+
+def event_card_options():
+    """Loader option restricting an Event query to card columns (no description)."""
+    return load_only(*EVENT_CARD_COLUMNS)
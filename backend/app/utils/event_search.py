@@ -0,0 +1,280 @@
+"""
+Full-text search over events.
+
+Postgres keeps a weighted tsvector in events.search_vector (title A,
+summary B, plain text of the description C) behind a GIN index; queries use
+websearch_to_tsquery, ts_rank_cd for ranking and ts_headline for snippets.
+SQLite (local runs) has no tsvector, so the same three fields go into an
+FTS5 table, events_fts, whose rowid is the event id; queries use MATCH,
+bm25() and snippet().
+
+index_event() must run whenever an event's title, summary or description
+is written (create_event/update_event do this). rebuild_search_index()
+backfills or repairs the index. Rows left in events_fts by deleted events
+are harmless: search always joins back to events.
+
+Results are ordered by (rank, id) and keyset-paginated on that pair.
+"""
+import html
+import re
+from html.parser import HTMLParser
+from typing import Optional, List, Tuple, Dict, Iterable
+from fastapi import HTTPException, status
+from sqlalchemy import text, func, and_, or_, bindparam, cast, column, values, Integer, Float, Text
+from sqlalchemy.orm import Session, selectinload
+from ..models.event import Event
+from .event_projection import event_card_options
+from .pagination import encode_cursor_payload, decode_cursor_payload
+from .privacy import filter_events_by_privacy
+
+SEARCH_CONFIG = "english"  # Postgres text search configuration
+
+# Sentinels marking matches in raw snippets; swapped for <mark> after HTML-escaping
+_HIGHLIGHT_START = "⟦"
+_HIGHLIGHT_STOP = "⟧"
+
+_BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "figcaption", "tr"}
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the visible text of rich-text HTML"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html_content: Optional[str]) -> str:
+    """Plain text of an event description (tags dropped, entities decoded)."""
+    if not html_content:
+        return ""
+    parser = _TextExtractor()
+    try:
+        parser.feed(html_content)
+        parser.close()
+        content = "".join(parser.parts)
+    except Exception:
+        # Malformed HTML - fall back to stripping anything tag-shaped
+        content = html.unescape(re.sub(r"<[^>]+>", " ", html_content))
+    return " ".join(content.split())
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _ensure_fts_table(db: Session) -> None:
+    db.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts "
+        "USING fts5(title, summary, body, tokenize='porter unicode61')"
+    ))
+
+
+def _fts5_query(q: str) -> Optional[str]:
+    """Quote user input as FTS5 terms (implicit AND, prefix match on the last term)."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def index_event(db: Session, event: Event) -> None:
+    """Write an event's title, summary and description text into the search index. Caller commits."""
+    body = html_to_text(event.description)
+    if _is_postgres(db):
+        db.execute(
+            text(f"""
+                UPDATE events SET search_vector =
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(:title, '')), 'A') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(:summary, '')), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', :body), 'C')
+                WHERE id = :id
+            """),
+            {"id": event.id, "title": event.title, "summary": event.summary, "body": body}
+        )
+    else:
+        _ensure_fts_table(db)
+        db.execute(text("DELETE FROM events_fts WHERE rowid = :id"), {"id": event.id})
+        db.execute(
+            text("INSERT INTO events_fts (rowid, title, summary, body) VALUES (:id, :title, :summary, :body)"),
+            {"id": event.id, "title": event.title or "", "summary": event.summary or "", "body": body}
+        )
+
+
+def rebuild_search_index(db: Session, event_ids: Optional[Iterable[int]] = None, batch_size: int = 200) -> int:
+    """
+    Re-index every event (or only event_ids), committing per batch.
+
+    Returns the number of events indexed.
+    """
+    query = db.query(Event).order_by(Event.id)
+    if event_ids is not None:
+        query = query.filter(Event.id.in_(list(event_ids)))
+
+    indexed = 0
+    last_id = 0
+    while True:
+        batch = query.filter(Event.id > last_id).limit(batch_size).all()
+        if not batch:
+            break
+        for event in batch:
+            index_event(db, event)
+        db.commit()
+        indexed += len(batch)
+        last_id = batch[-1].id
+        db.expunge_all()
+
+    return indexed
+
+
+def _render_snippet(raw: Optional[str]) -> Optional[str]:
+    """HTML-escape a raw snippet and turn the match sentinels into <mark> tags."""
+    if not raw or not raw.strip():
+        return None
+    escaped = html.escape(raw, quote=False)
+    return escaped.replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_STOP, "</mark>")
+
+
+def _decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    payload = decode_cursor_payload(cursor)
+    try:
+        return float(payload["r"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def search_events(
+    db: Session,
+    q: str,
+    viewer,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[Tuple[Event, float, Optional[str]]], Optional[str]]:
+    """
+    Rank published events matching q that the viewer may see.
+
+    Privacy is applied with filter_events_by_privacy(), exactly as for
+    event lists. Returns ([(event, rank, snippet_html), ...], next_cursor);
+    snippets are HTML-escaped with matches wrapped in <mark>.
+    """
+    q = (q or "").strip()
+    if not q:
+        return [], None
+
+    postgres = _is_postgres(db)
+    if postgres:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # ts_rank_cd returns real; widen it so the value that is selected,
+        # ordered on and written to the cursor is the same float8 the keyset
+        # compares against (a real vs the cursor's double never ties)
+        rank = cast(func.ts_rank_cd(Event.search_vector, tsquery), Float(53))
+        query = db.query(Event).filter(Event.search_vector.op("@@")(tsquery))
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return [], None
+        _ensure_fts_table(db)
+        fts = text(
+            "SELECT rowid AS event_id, -bm25(events_fts, 10.0, 5.0, 1.0) AS rank "
+            "FROM events_fts WHERE events_fts MATCH :match"
+        ).bindparams(match=match).columns(event_id=Integer, rank=Float).subquery("fts")
+        rank = fts.c.rank
+        query = db.query(Event).join(fts, fts.c.event_id == Event.id)
+
+    rank_column = rank.label("rank")
+
+    query = query.add_columns(rank_column).options(
+        event_card_options(),
+        selectinload(Event.author)
+    ).filter(
+        Event.is_published == True,
+        Event.is_deleted == False
+    )
+    query = filter_events_by_privacy(query, viewer, db)
+
+    if cursor:
+        last_rank, last_id = _decode_search_cursor(cursor)
+        query = query.filter(or_(
+            rank < last_rank,
+            and_(rank == last_rank, Event.id < last_id)
+        ))
+
+    # Order by the selected label so DISTINCT (added by the privacy filter) accepts it
+    rows = query.order_by(rank_column.desc(), Event.id.desc()).limit(limit).all()
+    if not rows:
+        return [], None
+
+    snippets = _load_snippets(db, q, [event.id for event, _ in rows], postgres)
+    results = [(event, float(score or 0), snippets.get(event.id)) for event, score in rows]
+
+    next_cursor = None
+    if len(rows) == limit:
+        last_event, last_score = rows[-1]
+        next_cursor = encode_cursor_payload({"r": float(last_score or 0), "i": last_event.id})
+
+    return results, next_cursor
+
+
+def _load_snippets(db: Session, q: str, event_ids: List[int], postgres: bool) -> Dict[int, Optional[str]]:
+    """
+    Highlighted snippets for one page of results. Snippets are cut from the
+    same plain text that is indexed (html_to_text() of the description), so
+    HTML entities are decoded once and escaped once by _render_snippet().
+    """
+    if postgres:
+        # ts_headline runs over bound plain text; the description's HTML
+        # never reaches it (stripping tags in SQL would leave &amp; etc.)
+        documents = [
+            (event_id, f"{summary or ''} {html_to_text(description)}")
+            for event_id, summary, description in db.query(
+                Event.id, Event.summary, Event.description
+            ).filter(Event.id.in_(event_ids)).all()
+        ]
+        if not documents:
+            return {}
+        document = values(column("event_id", Integer), column("body", Text), name="document").data(documents)
+        headline = func.ts_headline(
+            SEARCH_CONFIG,
+            document.c.body,
+            func.websearch_to_tsquery(SEARCH_CONFIG, q),
+            f"StartSel={_HIGHLIGHT_START}, StopSel={_HIGHLIGHT_STOP}, "
+            "MaxFragments=2, MaxWords=25, MinWords=10, FragmentDelimiter=\" … \""
+        )
+        rows = db.query(document.c.event_id, headline).all()
+    else:
+        rows = db.execute(
+            text(
+                "SELECT rowid, snippet(events_fts, -1, :start, :stop, ' … ', 24) "
+                "FROM events_fts WHERE events_fts MATCH :match AND rowid IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {
+                "start": _HIGHLIGHT_START,
+                "stop": _HIGHLIGHT_STOP,
+                "match": _fts5_query(q),
+                "ids": event_ids
+            }
+        ).all()
+
+    return {event_id: _render_snippet(raw) for event_id, raw in rows}
@@ -0,0 +1,120 @@
+"""
+Shared response cache for the anonymous and demo feeds.
+
+Anonymous visitors all see the same feed for a given (category, order_by,
+skip, limit, cursor), and so does every demo account (is_demo_account), so
+GET /events caches the serialized page for those two viewer classes and
+serves it with an ETag. Clients sending If-None-Match get a 304 with no
+body. Regular signed-in users are never cached: their feed depends on their
+own follow graph.
+
+Event writes in events.py (create, update, publish, unpublish, delete,
+restore, permanent delete) call invalidate_feed_cache(). Changes that only
+affect the cards indirectly (likes, comments, an author's subscription
+lapsing) are picked up when the TTL expires. The cache is per process, like
+the social graph snapshots.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from fastapi import Request, Response
+from .pagination import NEXT_CURSOR_HEADER
+
+FEED_CACHE_TTL_SECONDS = 30
+FEED_CACHE_MAX_ENTRIES = 500
+
+
+class CachedFeed(NamedTuple):
+    """One serialized feed page."""
+    body: bytes
+    etag: str
+    next_cursor: Optional[str]
+
+
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, CachedFeed)
+_lock = threading.Lock()
+_generation = 0  # Bumped on every invalidation so in-flight queries don't store stale pages
+
+
+def feed_cache_key(current_user, category, order_by, skip, limit, cursor) -> Optional[tuple]:
+    """Cache key for a feed request, or None if this viewer's feed is personal."""
+    if current_user is None:
+        viewer_class = "anonymous"
+    elif getattr(current_user, "is_demo_account", False):
+        viewer_class = "demo"
+    else:
+        return None
+    return (viewer_class, category, order_by, skip if not cursor else 0, limit, cursor)
+
+
+def feed_cache_generation() -> int:
+    """Current invalidation generation; pass it back to store_feed()."""
+    return _generation
+
+
+def get_cached_feed(key: tuple) -> Optional[CachedFeed]:
+    """Return a cached page if it is still fresh."""
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > now:
+            _cache.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def store_feed(key: tuple, body: bytes, next_cursor: Optional[str], generation: int) -> CachedFeed:
+    """
+    Cache a serialized page and return it.
+
+    The page is only stored if no invalidation happened since generation was
+    read (before the feed query ran); otherwise it is returned uncached.
+    """
+    entry = CachedFeed(
+        body=body,
+        etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        next_cursor=next_cursor
+    )
+    with _lock:
+        if generation == _generation:
+            _cache[key] = (time.monotonic() + FEED_CACHE_TTL_SECONDS, entry)
+            _cache.move_to_end(key)
+            while len(_cache) > FEED_CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return entry
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def feed_response(entry: CachedFeed, request: Request) -> Response:
+    """Serve a cached page, or 304 Not Modified if the client already has it."""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "no-cache"  # Clients may store it but must revalidate
+    }
+    if entry.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = entry.next_cursor
+
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def invalidate_feed_cache() -> None:
+    """Drop every cached feed page (call after committing an event change)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
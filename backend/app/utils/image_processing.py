@@ -0,0 +1,248 @@
+"""
+Pillow work for uploads: EXIF extraction, orientation and the JPEG variants
+(full / medium / thumbnail) stored for every image.
+
+Kept free of FastAPI, database and storage imports so these functions can
+run in a worker process (see utils/cpu_pool.py) without loading the app.
+"""
+import io
+import math
+import time
+from typing import Optional, Dict, Any, NamedTuple
+from PIL import Image, ImageOps
+from PIL.ExifTags import TAGS, GPSTAGS
+
+# Register HEIC/HEIF support for Pillow (iPhone photos)
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:
+    pass  # pillow-heif not installed, HEIC files won't be supported
+
+# Image sizes
+THUMBNAIL_SIZE = (300, 300)
+MEDIUM_SIZE = (1200, 1200)
+FULL_SIZE = (4000, 4000)
+
+# Variant name -> (max size, JPEG quality, storage folder)
+IMAGE_VARIANTS = {
+    "full": (FULL_SIZE, 90, "full"),
+    "medium": (MEDIUM_SIZE, 85, "medium"),
+    "thumbnail": (THUMBNAIL_SIZE, 80, "thumbnails"),
+}
+
+
+def get_decimal_from_dms(dms, ref):
+    """
+    Convert GPS DMS (degrees, minutes, seconds) to decimal degrees
+    """
+    degrees = dms[0]
+    minutes = dms[1] / 60.0
+    seconds = dms[2] / 3600.0
+
+    decimal = degrees + minutes + seconds
+
+    if ref in ['S', 'W']:
+        decimal = -decimal
+
+    return decimal
+
+
+def extract_gps_data(exif_data: Dict) -> Optional[Dict[str, float]]:
+    """
+    Extract GPS coordinates from EXIF data
+    """
+    gps_info = {}
+
+    for tag, value in exif_data.items():
+        decoded = TAGS.get(tag, tag)
+        if decoded == "GPSInfo":
+            for gps_tag in value:
+                gps_decoded = GPSTAGS.get(gps_tag, gps_tag)
+                gps_info[gps_decoded] = value[gps_tag]
+
+    if not gps_info:
+        return None
+
+    try:
+        # Extract latitude and longitude
+        lat = get_decimal_from_dms(
+            gps_info['GPSLatitude'],
+            gps_info['GPSLatitudeRef']
+        )
+        lon = get_decimal_from_dms(
+            gps_info['GPSLongitude'],
+            gps_info['GPSLongitudeRef']
+        )
+
+        return {
+            'latitude': lat,
+            'longitude': lon
+        }
+    except (KeyError, TypeError, IndexError):
+        return None
+
+
+def extract_exif_metadata(image: Image.Image) -> Dict[str, Any]:
+    """
+    Extract useful EXIF metadata from image
+    """
+    metadata = {
+        'has_exif': False,
+        'gps': None,
+        'date_taken': None,
+        'camera': None,
+        'dimensions': {
+            'width': image.width,
+            'height': image.height
+        }
+    }
+
+    try:
+        exif_data = image._getexif()
+        if not exif_data:
+            return metadata
+
+        metadata['has_exif'] = True
+
+        # Extract GPS data
+        metadata['gps'] = extract_gps_data(exif_data)
+
+        # Extract other useful metadata
+        for tag, value in exif_data.items():
+            decoded = TAGS.get(tag, tag)
+
+            if decoded == "DateTime" or decoded == "DateTimeOriginal":
+                try:
+                    metadata['date_taken'] = str(value)
+                except:
+                    pass
+
+            elif decoded == "Model":
+                metadata['camera'] = str(value)
+
+    except Exception as e:
+        # If EXIF extraction fails, just return basic metadata
+        pass
+
+    return metadata
+
+
+def resize_image(image: Image.Image, max_size: tuple, quality: int = 85) -> bytes:
+    """
+    Resize image while maintaining aspect ratio. Works from a full copy of
+    image; render_image_variants() is the cheaper path for all variants.
+    """
+    # Create a copy to avoid modifying the original
+    img = image.copy()
+
+    # Convert RGBA to RGB if needed (for JPEG)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+        img = background
+
+    # Resize maintaining aspect ratio
+    img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    # Save to bytes
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=quality, optimize=True)
+    output.seek(0)
+    return output.getvalue()
+
+
+class RenderedImage(NamedTuple):
+    metadata: Dict[str, Any]  # {} unless extract_metadata
+    variants: Dict[str, bytes]  # variant name -> JPEG bytes
+    timings: Dict[str, float]  # stage -> seconds, in pipeline order
+
+
+def flatten_to_rgb(image: Image.Image) -> Image.Image:
+    """JPEG-encodable copy of image: alpha/palette composited onto white."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
+        return background
+    if image.mode not in ('RGB', 'L'):
+        return image.convert('RGB')
+    return image
+
+
+def fit_within(image: Image.Image, max_size: tuple) -> Image.Image:
+    """Downscale to fit max_size, keeping aspect ratio (never upscales, like thumbnail())."""
+    if image.width <= max_size[0] and image.height <= max_size[1]:
+        return image
+    scale = min(max_size[0] / image.width, max_size[1] / image.height)
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    # reducing_gap: integer box-reduce first, LANCZOS for the last <3x
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def render_image_variants(contents: bytes, extract_metadata: bool = True) -> RenderedImage:
+    """
+    Decode an uploaded image once and encode every IMAGE_VARIANTS size.
+
+    - JPEGs are decoded at reduced scale (Image.draft) when the largest
+      variant is well below the source, e.g. a 48MP photo decodes at 1/2.
+    - One RGB conversion is shared by every variant.
+    - Each variant is resized from the previous (larger) one, not from the
+      original, so only the first resize touches the full-size pixels.
+
+    CPU-bound: run it through utils/cpu_pool.py.
+    """
+    timings = {}
+    clock = time.perf_counter()
+
+    def lap(stage):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[stage] = now - clock
+        clock = now
+
+    image = Image.open(io.BytesIO(contents))
+    lap("open")
+
+    # Extract EXIF metadata before any processing (dimensions are the original's)
+    metadata = extract_exif_metadata(image) if extract_metadata else {}
+    lap("exif")
+
+    largest = max(size for size, _, _ in IMAGE_VARIANTS.values())
+    scale = min(largest[0] / image.width, largest[1] / image.height)
+    if image.format == 'JPEG' and scale < 1:
+        # DCT-domain downscale (1/2, 1/4, 1/8) that still covers the largest
+        # variant, e.g. a 48MP 8064x6048 photo decodes at 4032x3024
+        image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+    image.load()
+    lap("decode")
+
+    # Apply EXIF orientation - this fixes upside-down/rotated photos from phones
+    # Must be done AFTER extracting metadata but BEFORE resizing
+    try:
+        image = ImageOps.exif_transpose(image)
+    except Exception:
+        pass  # If EXIF transpose fails, continue with original image
+    lap("transpose")
+
+    image = flatten_to_rgb(image)
+    lap("convert")
+
+    variants = {}
+    # Largest first, each derived from the one before
+    for name, (max_size, quality, _) in sorted(IMAGE_VARIANTS.items(), key=lambda item: item[1][0], reverse=True):
+        image = fit_within(image, max_size)
+        lap(f"resize:{name}")
+        variants[name] = encode_jpeg(image, quality)
+        lap(f"encode:{name}")
+
+    return RenderedImage(metadata, variants, timings)
@@ -0,0 +1,60 @@
+"""
+Fuzzy name matching for people and tag profile search.
+
+On Postgres, users.username / display_name / full_name and tag_profiles.name
+carry pg_trgm GIN indexes, so both the substring match (ILIKE '%q%') and the
+typo-tolerant word-similarity match (q <% column) are index scans instead of
+sequential scans of the whole table. Matches are scored by trigram word
+similarity, a boost for prefix matches (what autocomplete users type) and a
+boost for social proximity supplied by the caller.
+
+SQLite has no pg_trgm: matching falls back to ILIKE and the score to the
+prefix and proximity boosts, which keeps local runs working.
+"""
+from typing import Sequence, Tuple
+from sqlalchemy import or_, func, case, literal
+from sqlalchemy.orm import Session
+
+# Shorter queries have no complete trigram to compare, so they stay substring-only
+TRIGRAM_MIN_LENGTH = 3
+
+PREFIX_BOOST = 0.5
+FOLLOWED_BOOST = 1.0
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def name_match(db: Session, columns: Sequence, q: str) -> Tuple:
+    """
+    Build (filter_clause, score) for matching q against one or more name columns.
+
+    score is a SQL expression, higher is better; add proximity boosts to it
+    and order by it descending.
+    """
+    q = q.strip()
+    substring = or_(*(column.ilike(f"%{q}%") for column in columns))
+    prefix = or_(*(column.ilike(f"{q}%") for column in columns))
+    prefix_score = case((prefix, PREFIX_BOOST), else_=0.0)
+
+    if not _is_postgres(db):
+        return substring, prefix_score
+
+    similarity = func.greatest(*(
+        func.coalesce(func.word_similarity(q, column), 0.0) for column in columns
+    ))
+
+    if len(q) < TRIGRAM_MIN_LENGTH:
+        return substring, similarity + prefix_score
+
+    # q <% column: word similarity above pg_trgm.word_similarity_threshold (GIN-indexable)
+    fuzzy = or_(*(literal(q).op("<%")(column) for column in columns))
+    return or_(substring, fuzzy), similarity + prefix_score
+
+
+def proximity_boost(column, followed_ids, boost: float = FOLLOWED_BOOST):
+    """Score term adding boost when column (a user id) is someone the viewer follows."""
+    if not followed_ids:
+        return literal(0.0)
+    return case((column.in_(followed_ids), boost), else_=0.0)
@@ -0,0 +1,140 @@
+"""
+Keyset (cursor) pagination for event lists.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last event
+on a page: (start_date, id) or (created_at, id), prefixed with the showcase
+pin when the demo feed pins showcase events to the top. Paging with a cursor
+instead of OFFSET keeps deep pages as cheap as the first one (an index range
+scan on the matching composite index) and avoids duplicates or gaps when new
+events are published mid-scroll.
+
+Every page returns the cursor for the next page in the X-Next-Cursor header,
+so clients can start with a plain request and switch to ?cursor= afterwards.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, List, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, case
+from ..models.event import Event
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_sort_column(order_by: str):
+    """Return the Event date column for an order_by value ("event_date" or "upload_date")."""
+    return Event.created_at if order_by == "upload_date" else Event.start_date
+
+
+def _pin_order():
+    """Demo feed ordering: showcase events (0) before everything else (1)."""
+    return case((Event.is_demo_showcase == True, 0), else_=1)
+
+
+def encode_cursor_payload(payload: dict) -> str:
+    """Pack a small JSON payload into an opaque, URL-safe cursor."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor_payload(cursor: str) -> dict:
+    """Unpack a cursor made by encode_cursor_payload(), raising 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload is not an object")
+        return payload
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def encode_cursor(event: Event, order_by: str = "event_date", pinned: bool = False) -> str:
+    """Encode the sort key of an event as an opaque cursor."""
+    date_value = get_sort_column(order_by).key
+    payload = {
+        "o": order_by,
+        "d": getattr(event, date_value).isoformat(),
+        "i": event.id
+    }
+    if pinned:
+        payload["p"] = 0 if event.is_demo_showcase else 1
+
+    return encode_cursor_payload(payload)
+
+
+def decode_cursor(cursor: str, order_by: str = "event_date", pinned: bool = False) -> dict:
+    """Decode a cursor, raising 400 if it is malformed or was issued for another ordering."""
+    payload = decode_cursor_payload(cursor)
+    try:
+        data = {
+            "o": payload["o"],
+            "d": datetime.fromisoformat(payload["d"]),
+            "i": int(payload["i"]),
+            "p": int(payload["p"]) if "p" in payload else None
+        }
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    if data["o"] != order_by or (data["p"] is not None) != pinned:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match the requested ordering"
+        )
+
+    return data
+
+
+def paginate_events(
+    query,
+    order_by: str = "event_date",
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    pinned: bool = False
+) -> Tuple[List[Event], Optional[str]]:
+    """
+    Order an event query newest-first and fetch one page.
+
+    With a cursor, rows strictly after the cursor's (date, id) are returned
+    and skip is ignored; without one, skip/limit offset paging is used as
+    before. The id tiebreaker makes the ordering total, so both modes are
+    stable across requests.
+
+    Returns (events, next_cursor); next_cursor is None on the last page.
+    """
+    date_col = get_sort_column(order_by)
+    ordering = [date_col.desc(), Event.id.desc()]
+
+    if pinned:
+        ordering.insert(0, _pin_order())
+
+    if cursor:
+        data = decode_cursor(cursor, order_by, pinned)
+        after = or_(
+            date_col < data["d"],
+            and_(date_col == data["d"], Event.id < data["i"])
+        )
+        if pinned:
+            pin = _pin_order()
+            after = or_(pin > data["p"], and_(pin == data["p"], after))
+        query = query.filter(after)
+
+    query = query.order_by(*ordering)
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    events = query.limit(limit).all()
+
+    next_cursor = None
+    if events and len(events) == limit:
+        next_cursor = encode_cursor(events[-1], order_by, pinned)
+
+    return events, next_cursor
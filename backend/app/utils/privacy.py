@@ -1,20 +1,51 @@
 """
 Privacy filtering utilities for events
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import or_, and_, exists, func
 from typing import Optional, List
 from ..models.event import Event
 from ..models.follow import Follow
 from ..models.custom_group import CustomGroupMember
 from ..models.user import User
 from ..models.event_tag import EventTag
+from .social_graph import get_graph_snapshot
+from ..core.config import settings
+
+
+def use_event_audience() -> bool:
+    """Whether visibility is read from the event_audience table (see services/event_audience.py)."""
+    return settings.EVENT_PRIVACY_BACKEND == "audience"
 
 
 def can_view_event(event: Event, viewer: Optional[User], db: Session) -> bool:
     """
     Check if a user can view an event based on privacy settings
 
+    With EVENT_PRIVACY_BACKEND=audience the relationship rules below are
+    answered by one probe of the materialized event_audience table;
+    can_view_event_rules() evaluates them directly.
+    """
+    if not use_event_audience():
+        return can_view_event_rules(event, viewer, db)
+
+    from ..services.event_audience import in_audience
+
+    if viewer and event.author_id == viewer.id:
+        return True
+    if not is_author_content_visible(event.author):
+        return False
+    if event.privacy_level == "public":
+        return True
+    if event.privacy_level == "private" or not viewer:
+        return False
+    return in_audience(db, event.id, viewer.id)
+
+
+def can_view_event_rules(event: Event, viewer: Optional[User], db: Session) -> bool:
+    """
+    Check if a user can view an event based on privacy settings (rule-based)
+
     Privacy levels:
     - public: Anyone can view
     - followers: Only accepted followers can view
@@ -32,7 +63,7 @@ def can_view_event(event: Event, viewer: Optional[User], db: Session) -> bool:
         return True
 
     # For others viewing: check if author's subscription is active
-    if not is_user_subscription_active(event.author):
+    if not is_author_content_visible(event.author):
         return False
 
     # Public events are visible to everyone
@@ -97,6 +128,19 @@ def can_view_event(event: Event, viewer: Optional[User], db: Session) -> bool:
     return False
 
 
+def _decide_by_audience(event: Event, viewer: User, author: Optional[User], allowed_ids: set) -> bool:
+    """In-memory mirror of can_view_event() given the viewer's audience hits."""
+    if event.author_id == viewer.id:
+        return True
+    if not is_author_content_visible(author):
+        return False
+    if event.privacy_level == "public":
+        return True
+    if event.privacy_level == "private":
+        return False
+    return event.id in allowed_ids
+
+
 def is_user_subscription_active(user: User) -> bool:
     """
     Check if a user has an active subscription (trial or paid).
@@ -122,6 +166,74 @@ def is_user_subscription_active(user: User) -> bool:
     return False
 
 
+def is_author_content_visible(user: User) -> bool:
+    """
+    Read the materialized User.content_visible flag (the stored result of
+    is_user_subscription_active()). Falls back to computing it for rows
+    that have not been backfilled.
+    """
+    if not user:
+        return False
+    # The flag cannot see a trial lapse until sweep_expired_trials() runs
+    if user.content_visible is None or user.subscription_status == 'trial':
+        return is_user_subscription_active(user)
+    return user.content_visible
+
+
+def refresh_content_visible(user: User) -> None:
+    """Recompute User.content_visible after a subscription change. Caller commits."""
+    user.content_visible = is_user_subscription_active(user)
+
+
+def sweep_expired_trials(db: Session) -> int:
+    """
+    Hide content from users whose trial has lapsed.
+
+    Trial expiry is the only time-based transition in
+    is_user_subscription_active(); every other change goes through a
+    webhook or endpoint that calls refresh_content_visible(). Readers
+    re-check trial_end_date themselves (author_visible_clause(),
+    is_author_content_visible()), so lapsed trials are hidden even before
+    this runs; the sweep keeps the flag, and its index, accurate. Run it
+    periodically (scripts/sweep_expired_trials.py).
+
+    Returns the number of users whose content was hidden.
+    """
+    from datetime import datetime
+
+    hidden = db.query(User).filter(
+        User.content_visible == True,
+        User.subscription_status == 'trial',
+        User.trial_end_date != None,
+        User.trial_end_date <= datetime.utcnow()
+    ).update({User.content_visible: False}, synchronize_session=False)
+    db.commit()
+    return hidden
+
+
+def author_visible_clause(viewer: Optional[User]):
+    """
+    SQL filter for events whose author's content is visible (or that the
+    viewer authored). Uses the indexed content_visible flag via EXISTS
+    instead of joining users and evaluating subscription columns, plus the
+    trial end date, which the flag only reflects once the sweep has run.
+    """
+    from datetime import datetime
+
+    visible = Event.author.has(and_(
+        User.content_visible == True,
+        or_(
+            User.subscription_status == None,
+            User.subscription_status != 'trial',
+            User.trial_end_date == None,
+            User.trial_end_date > datetime.utcnow()
+        )
+    ))
+    if viewer:
+        return or_(Event.author_id == viewer.id, visible)
+    return visible
+
+
 def filter_events_for_feed(
     query,
     viewer: Optional[User],
@@ -136,24 +248,9 @@ def filter_events_for_feed(
     - Logged-in users: ALL events except PRIVATE
     - Subscription filtering: still enforced (expired author events hidden)
     """
-    from datetime import datetime
-
     # Filter out events from expired users (subscription check)
-    query = query.join(Event.author).filter(
-        or_(
-            # Always show viewer's own events
-            Event.author_id == viewer.id if viewer else False,
-            # Author has premium/family tier with active or canceled status
-            (User.subscription_tier.in_(['premium', 'family'])) &
-            (User.subscription_status.in_(['active', 'canceled'])),
-            # Author is on trial and trial hasn't expired
-            (User.subscription_status == 'trial') &
-            (
-                (User.trial_end_date == None) |  # Legacy users
-                (User.trial_end_date > datetime.utcnow())  # Active trial
-            )
-        )
-    )
+    # Always show viewer's own events
+    query = query.filter(author_visible_clause(viewer))
 
     # Anonymous users: only public events (security - prevents enumeration)
     if not viewer:
@@ -164,15 +261,27 @@ def filter_events_for_feed(
     query = query.filter(Event.privacy_level != "private")
 
     # Filter out events from muted users
-    from ..models.user_mute import UserMute
-    muted_user_ids = db.query(UserMute.muted_user_id).filter(
-        UserMute.muter_id == viewer.id
-    ).subquery()
-    query = query.filter(~Event.author_id.in_(muted_user_ids))
+    muted_ids = get_graph_snapshot(viewer.id, db).muted_ids
+    if muted_ids:
+        query = query.filter(~Event.author_id.in_(muted_ids))
 
     return query
 
 
+def tag_rule_clause():
+    """
+    Events whose visibility can come from a followed user's tag, as in
+    can_view_event_rules(): never private events, followers/close_family
+    events decide on the author follow alone, and a custom_group event
+    without a group is author-only.
+    """
+    privacy = func.coalesce(Event.privacy_level, "")
+    return and_(
+        privacy.notin_(("private", "followers", "close_family")),
+        ~and_(privacy == "custom_group", Event.custom_group_id.is_(None))
+    )
+
+
 def filter_events_by_privacy(
     query,
     viewer: Optional[User],
@@ -181,33 +290,115 @@ def filter_events_by_privacy(
     """
     Filter a SQLAlchemy query to only include events the viewer can see
 
+    The SQL shape follows EVENT_PRIVACY_BACKEND:
+    - "audience": filter_events_by_privacy_audience() (materialized ACL probe)
+    - "exists": filter_events_by_privacy_exists() (same rules, EXISTS branches)
+    - "rules": filter_events_by_privacy_rules() (OR of IN lists + DISTINCT)
+    """
+    backend = settings.EVENT_PRIVACY_BACKEND
+    if backend == "audience":
+        return filter_events_by_privacy_audience(query, viewer, db)
+    if backend == "exists":
+        return filter_events_by_privacy_exists(query, viewer, db)
+    return filter_events_by_privacy_rules(query, viewer, db)
+
+
+def filter_events_by_privacy_audience(
+    query,
+    viewer: Optional[User],
+    db: Session
+):
+    """
+    Own or public events, or an indexed EXISTS probe of event_audience -
+    no OR of IN-subqueries and no DISTINCT over event rows.
+    """
+    from ..services.event_audience import audience_clause
+
+    query = query.filter(author_visible_clause(viewer))
+    if not viewer:
+        return query.filter(Event.privacy_level == "public")
+
+    # Private events never have audience rows
+    return query.filter(or_(
+        Event.author_id == viewer.id,
+        Event.privacy_level == "public",
+        audience_clause(viewer.id)
+    ))
+
+
+def filter_events_by_privacy_exists(
+    query,
+    viewer: Optional[User],
+    db: Session
+):
+    """
+    Same rows as filter_events_by_privacy_rules(), written as correlated
+    EXISTS branches instead of IN lists plus DISTINCT.
+
+    Each branch is a probe of an index keyed by the outer event's columns
+    (follows by follower/following, group members by group/user, event
+    tags by event), and EXISTS never multiplies rows, so no DISTINCT over
+    full event rows is needed. With ORDER BY start_date LIMIT n the planner
+    can walk the (start_date, id) index and stop after n visible events
+    instead of materializing and sorting every candidate. Needs no graph
+    snapshot.
+    """
+    query = query.filter(author_visible_clause(viewer))
+    if not viewer:
+        return query.filter(Event.privacy_level == "public")
+
+    def follows_author(*extra):
+        return exists().where(and_(
+            Follow.follower_id == viewer.id,
+            Follow.following_id == Event.author_id,
+            Follow.status == "accepted",
+            *extra
+        )).correlate(Event)
+
+    tag_follow = aliased(Follow)
+    tagged_followed = exists().where(and_(
+        EventTag.event_id == Event.id,
+        EventTag.status == "accepted",
+        exists().where(and_(
+            tag_follow.follower_id == viewer.id,
+            tag_follow.following_id == EventTag.tagged_user_id,
+            tag_follow.status == "accepted"
+        )).correlate(EventTag)
+    )).correlate(Event)
+
+    return query.filter(or_(
+        Event.author_id == viewer.id,
+        Event.privacy_level == "public",
+        and_(Event.privacy_level == "followers", follows_author()),
+        and_(Event.privacy_level == "close_family", follows_author(Follow.is_close_family == True)),
+        and_(
+            Event.privacy_level == "custom_group",
+            exists().where(and_(
+                CustomGroupMember.group_id == Event.custom_group_id,
+                CustomGroupMember.user_id == viewer.id
+            )).correlate(Event)
+        ),
+        and_(tag_rule_clause(), tagged_followed)
+    ))
+
+
+def filter_events_by_privacy_rules(
+    query,
+    viewer: Optional[User],
+    db: Session
+):
+    """
+    Filter a SQLAlchemy query to only include events the viewer can see (rule-based)
+
     Returns a modified query with privacy filters applied
 
     Subscription rules:
     - Users can ALWAYS see their own events (even if their subscription expired)
     - Events from OTHER expired users are hidden
     """
-    from sqlalchemy.orm import joinedload
-    from datetime import datetime
-
     # Filter out events from expired users (authors without active subscription)
     # EXCEPT: Always allow viewer to see their own events
-    # We need to join with the User table to check subscription status
-    query = query.join(Event.author).filter(
-        or_(
-            # Always show viewer's own events (regardless of subscription)
-            Event.author_id == viewer.id if viewer else False,
-            # Author has premium/family tier with active or canceled status
-            (User.subscription_tier.in_(['premium', 'family'])) &
-            (User.subscription_status.in_(['active', 'canceled'])),
-            # Author is on trial and trial hasn't expired
-            (User.subscription_status == 'trial') &
-            (
-                (User.trial_end_date == None) |  # Legacy users
-                (User.trial_end_date > datetime.utcnow())  # Active trial
-            )
-        )
-    )
+    query = query.filter(author_visible_clause(viewer))
 
     # If no viewer, only show public events
     if not viewer:
@@ -221,55 +412,40 @@ def filter_events_by_privacy(
         Event.privacy_level == "public"
     ]
 
-    # Get user's accepted follows (people they follow)
-    following_ids = db.query(Follow.following_id).filter(
-        Follow.follower_id == viewer.id,
-        Follow.status == "accepted"
-    ).subquery()
+    # Viewer's follows, close family and groups come from the cached snapshot
+    graph = get_graph_snapshot(viewer.id, db)
 
     # Add followers-only events from people user follows
-    conditions.append(
-        (Event.privacy_level == "followers") &
-        (Event.author_id.in_(following_ids))
-    )
-
-    # Get user's close family follows
-    close_family_ids = db.query(Follow.following_id).filter(
-        Follow.follower_id == viewer.id,
-        Follow.status == "accepted",
-        Follow.is_close_family == True
-    ).subquery()
+    if graph.following_ids:
+        conditions.append(
+            (Event.privacy_level == "followers") &
+            (Event.author_id.in_(graph.following_ids))
+        )
 
     # Add close family events
-    conditions.append(
-        (Event.privacy_level == "close_family") &
-        (Event.author_id.in_(close_family_ids))
-    )
-
-    # Get custom groups user is a member of
-    group_ids = db.query(CustomGroupMember.group_id).filter(
-        CustomGroupMember.user_id == viewer.id
-    ).subquery()
+    if graph.close_family_ids:
+        conditions.append(
+            (Event.privacy_level == "close_family") &
+            (Event.author_id.in_(graph.close_family_ids))
+        )
 
     # Add custom group events
-    conditions.append(
-        (Event.privacy_level == "custom_group") &
-        (Event.custom_group_id.in_(group_ids))
-    )
+    if graph.group_ids:
+        conditions.append(
+            (Event.privacy_level == "custom_group") &
+            (Event.custom_group_id.in_(graph.group_ids))
+        )
 
     # Add events where a followed user is tagged (with accepted tag)
-    # This allows viewers to see events where someone they follow is tagged
-    tagged_events = db.query(EventTag.event_id).filter(
-        EventTag.tagged_user_id.in_(
-            db.query(Follow.following_id).filter(
-                Follow.follower_id == viewer.id,
-                Follow.status == "accepted"
-            )
-        ),
-        EventTag.status == "accepted"
-    ).subquery()
+    # This allows viewers to see events where someone they follow is tagged,
+    # for the privacy levels where can_view_event_rules() applies that rule
+    if graph.following_ids:
+        tagged_events = db.query(EventTag.event_id).filter(
+            EventTag.tagged_user_id.in_(graph.following_ids),
+            EventTag.status == "accepted"
+        ).subquery()
 
-    conditions.append(Event.id.in_(tagged_events))
+        conditions.append(and_(tag_rule_clause(), Event.id.in_(tagged_events)))
 
     # Apply all conditions with OR (using distinct to avoid duplicates)
     return query.filter(or_(*conditions)).distinct()
@@ -279,7 +455,7 @@ def is_event_hidden_due_to_expired_subscription(event: Event) -> bool:
     """
     Check if an event is hidden because the author's subscription has expired.
     """
-    return not is_user_subscription_active(event.author)
+    return not is_author_content_visible(event.author)
 
 
 def get_event_privacy_display(event: Event, db: Session) -> dict:
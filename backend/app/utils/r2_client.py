@@ -11,6 +11,7 @@ When R2 is not configured (R2_ACCESS_KEY_ID empty) the callers fall back to
 Supabase Storage, so deploying this code before provisioning R2 is safe.
 """
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 
 from ..core.config import settings
@@ -42,7 +43,11 @@ def get_r2_client():
             aws_access_key_id=settings.R2_ACCESS_KEY_ID,
             aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
             region_name="auto",
-            config=Config(signature_version="s3v4"),
+            # One connection per concurrent upload (utils/storage_uploader.py)
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=max(10, settings.STORAGE_UPLOAD_CONCURRENCY),
+            ),
         )
     return _client
 
@@ -68,6 +73,36 @@ def r2_put(key: str, data: bytes, content_type: str) -> str:
     return r2_public_url(key)
 
 
+def r2_put_stream(key: str, fileobj, content_type: str) -> str:
+    """Stream a file object to R2 and return the public URL.
+
+    Files above STORAGE_MULTIPART_CHUNK_SIZE go up as a multipart upload, so
+    memory stays at a few parts however large the file is.
+    """
+    chunk_size = settings.STORAGE_MULTIPART_CHUNK_SIZE
+    get_r2_client().upload_fileobj(
+        fileobj,
+        settings.R2_BUCKET,
+        key,
+        ExtraArgs={
+            "ContentType": content_type,
+            "CacheControl": "public, max-age=31536000, immutable",
+        },
+        Config=TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=settings.STORAGE_MULTIPART_CONCURRENCY,
+        ),
+    )
+    return r2_public_url(key)
+
+
+def r2_get(key: str):
+    """Open an object for reading: (size in bytes, streaming body). Close the body when done."""
+    obj = get_r2_client().get_object(Bucket=settings.R2_BUCKET, Key=key)
+    return obj["ContentLength"], obj["Body"]
+
+
 def r2_delete(keys: list[str]) -> None:
     """Delete one or more object keys from R2 (best-effort, ignores misses)."""
     keys = [k for k in keys if k]
@@ -0,0 +1,154 @@
+"""
+Fast JSON serialization for list endpoints.
+
+The list endpoints used to build a dict per row, validate it into a Pydantic
+model (EventResponse.model_validate) and let FastAPI re-encode the models.
+Here each row becomes a plain dict that is serialized straight to JSON bytes
+by a precompiled TypeAdapter over a TypedDict: no per-row model
+construction, no validation pass, one call into pydantic-core per page.
+
+The TypedDicts mirror the response shapes the endpoints already returned,
+so clients see the same JSON. Endpoints keep their response_model for the
+OpenAPI schema; returning a Response skips FastAPI's re-validation.
+"""
+from datetime import datetime
+from typing import Any, List, Optional
+from typing_extensions import TypedDict
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class EventCard(TypedDict):
+    """Feed/profile card: EventResponse fields, without description or children."""
+    title: str
+    short_title: Optional[str]
+    summary: Optional[str]
+    description: Optional[str]
+    start_date: datetime
+    end_date: Optional[datetime]
+    location_name: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    cover_image_url: Optional[str]
+    has_multiple_locations: bool
+    privacy_level: str
+    category: Optional[str]
+    category_2: Optional[str]
+    custom_group_id: Optional[int]
+    id: int
+    slug: Optional[str]
+    author_id: int
+    author_username: str
+    author_full_name: Optional[str]
+    view_count: int
+    like_count: int
+    comment_count: int
+    is_published: bool
+    share_enabled: bool
+    share_expires_at: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    content_blocks: List[Any]
+    locations: List[Any]
+    event_images: List[Any]
+
+
+class EventSearchResult(EventCard):
+    """EventCard plus full-text search rank and highlighted snippet."""
+    rank: float
+    snippet: Optional[str]
+
+
+class EventSummary(TypedDict):
+    """Compact card used by tag profile and tagged-events listings."""
+    id: int
+    title: str
+    summary: Optional[str]
+    start_date: Optional[datetime]
+    cover_image_url: Optional[str]
+    author_id: int
+    author_username: Optional[str]
+    author_display_name: Optional[str]
+
+
+class ShareLinkItem(TypedDict):
+    event_id: int
+    event_title: str
+    share_token: str
+    share_url: str
+    expires_at: Optional[datetime]
+    view_count: int
+    is_expired: bool
+    shared_on: Optional[datetime]
+
+
+class ShareLinkList(TypedDict):
+    share_links: List[ShareLinkItem]
+
+
+EVENT_CARDS = TypeAdapter(List[EventCard])
+EVENT_SEARCH_RESULTS = TypeAdapter(List[EventSearchResult])
+EVENT_SUMMARIES = TypeAdapter(List[EventSummary])
+SHARE_LINK_LIST = TypeAdapter(ShareLinkList)
+
+
+def event_card(event) -> dict:
+    """Map an Event row (author loaded) to an EventCard dict."""
+    author = event.author
+    return {
+        "title": event.title,
+        "short_title": event.short_title,
+        "summary": event.summary,
+        "description": "",  # Empty in list view - loaded in detail view only
+        "start_date": event.start_date,
+        "end_date": event.end_date,
+        "location_name": event.location_name,
+        "latitude": event.latitude,
+        "longitude": event.longitude,
+        "cover_image_url": event.cover_image_url,
+        "has_multiple_locations": bool(event.has_multiple_locations),
+        "privacy_level": event.privacy_level or "public",
+        "category": event.category,
+        "category_2": event.category_2,
+        "custom_group_id": event.custom_group_id,
+        "id": event.id,
+        "slug": event.slug,
+        "author_id": event.author_id,
+        "author_username": author.username,
+        "author_full_name": author.full_name,
+        "view_count": event.view_count or 0,
+        "like_count": event.like_count or 0,
+        "comment_count": event.comment_count or 0,
+        "is_published": bool(event.is_published),
+        "share_enabled": event.share_enabled or False,
+        "share_expires_at": event.share_expires_at,
+        "created_at": event.created_at,
+        "updated_at": event.updated_at,
+        "content_blocks": [],  # Empty - content is in description field
+        "locations": [],  # Empty in list view - loaded in detail view
+        "event_images": []
+    }
+
+
+def event_summary(event) -> dict:
+    """Map an Event row to an EventSummary dict."""
+    author = event.author
+    return {
+        "id": event.id,
+        "title": event.title,
+        "summary": event.summary,
+        "start_date": event.start_date,
+        "cover_image_url": event.cover_image_url,
+        "author_id": event.author_id,
+        "author_username": author.username if author else None,
+        "author_display_name": author.display_name or author.full_name if author else None
+    }
+
+
+def json_response(adapter: TypeAdapter, data, headers: Optional[dict] = None) -> Response:
+    """Serialize data with a precompiled adapter into a JSON response."""
+    return Response(
+        content=adapter.dump_json(data),
+        media_type="application/json",
+        headers=headers
+    )
@@ -0,0 +1,108 @@
+"""
+Per-viewer social graph snapshots.
+
+Feed privacy filtering and tag search need the same handful of ID sets for
+the viewer on every request: who they follow, who has marked them close
+family, which custom groups they belong to, and who they have muted.
+get_graph_snapshot() loads all four once and keeps them in a small
+in-process TTL/LRU cache, so privacy and search code can filter on literal
+ID sets instead of re-issuing subqueries.
+
+Writes that change a user's graph must call invalidate_graph_snapshot() for
+every affected viewer. The cache is per process: on serverless deployments
+other instances only see the change once the TTL expires, so keep
+GRAPH_SNAPSHOT_TTL_SECONDS short.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Iterable, Optional
+from sqlalchemy.orm import Session
+from ..models.follow import Follow
+from ..models.custom_group import CustomGroupMember
+from ..models.user_mute import UserMute
+
+GRAPH_SNAPSHOT_TTL_SECONDS = 60
+GRAPH_SNAPSHOT_MAX_ENTRIES = 5000
+
+
+class GraphSnapshot(NamedTuple):
+    """Compact, immutable view of one user's social graph."""
+    user_id: int
+    following_ids: frozenset  # Users this user follows (accepted)
+    close_family_ids: frozenset  # Followed users who marked this user as close family
+    group_ids: frozenset  # Custom groups this user is a member of
+    muted_ids: frozenset  # Users this user has muted
+
+
+_cache: "OrderedDict[int, tuple]" = OrderedDict()  # user_id -> (expires_at, snapshot)
+_lock = threading.Lock()
+
+
+def _load_snapshot(user_id: int, db: Session) -> GraphSnapshot:
+    following_ids = set()
+    close_family_ids = set()
+    for following_id, is_close_family in db.query(
+        Follow.following_id, Follow.is_close_family
+    ).filter(
+        Follow.follower_id == user_id,
+        Follow.status == "accepted"
+    ).all():
+        following_ids.add(following_id)
+        if is_close_family:
+            close_family_ids.add(following_id)
+
+    group_ids = db.query(CustomGroupMember.group_id).filter(
+        CustomGroupMember.user_id == user_id
+    ).all()
+
+    muted_ids = db.query(UserMute.muted_user_id).filter(
+        UserMute.muter_id == user_id
+    ).all()
+
+    return GraphSnapshot(
+        user_id=user_id,
+        following_ids=frozenset(following_ids),
+        close_family_ids=frozenset(close_family_ids),
+        group_ids=frozenset(row[0] for row in group_ids),
+        muted_ids=frozenset(row[0] for row in muted_ids)
+    )
+
+
+def get_graph_snapshot(user_id: int, db: Session) -> GraphSnapshot:
+    """Return the cached graph snapshot for a user, loading it on a miss."""
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    snapshot = _load_snapshot(user_id, db)
+
+    with _lock:
+        _cache[user_id] = (now + GRAPH_SNAPSHOT_TTL_SECONDS, snapshot)
+        _cache.move_to_end(user_id)
+        while len(_cache) > GRAPH_SNAPSHOT_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+    return snapshot
+
+
+def invalidate_graph_snapshot(*user_ids: Optional[int]) -> None:
+    """Drop cached snapshots for the given users (call after committing a graph change)."""
+    with _lock:
+        for user_id in user_ids:
+            if user_id is not None:
+                _cache.pop(user_id, None)
+
+
+def invalidate_graph_snapshots(user_ids: Iterable[int]) -> None:
+    """Drop cached snapshots for every user in an iterable (e.g. all members of a group)."""
+    invalidate_graph_snapshot(*user_ids)
+
+
+def clear_graph_snapshots() -> None:
+    """Drop every cached snapshot."""
+    with _lock:
+        _cache.clear()
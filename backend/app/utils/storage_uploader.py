@@ -0,0 +1,106 @@
+"""
+Concurrent object uploads with bounded parallelism and retries.
+
+Each photo is stored as three objects (full / medium / thumbnail). Uploading
+them one after another costs three round trips to R2 or Supabase per photo;
+put_concurrently() sends them together, so a request pays roughly one.
+
+All uploads in the process share one thread pool of
+STORAGE_UPLOAD_CONCURRENCY workers, so a user adding dozens of photos at
+once cannot open dozens of connections per photo: excess puts wait for a
+free worker. Transient failures (connection errors, timeouts, 408/429/5xx)
+are retried with exponential backoff and jitter; other errors fail at once.
+"""
+import asyncio
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+from ..core.config import settings
+
+RETRYABLE_STATUS = {408, 429}
+
+_pool: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.STORAGE_UPLOAD_CONCURRENCY,
+                thread_name_prefix="storage"
+            )
+        return _pool
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """
+    HTTP status of a botocore ClientError, a Supabase StorageException or
+    an httpx-style error, if any.
+    """
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        return response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    if response is not None:
+        return getattr(response, "status_code", None)
+    # StorageException({"statusCode": 409, "error": "Duplicate", ...});
+    # older storage3 versions pass the body's statusCode, a string
+    error = exc.args[0] if exc.args else None
+    if isinstance(error, dict):
+        try:
+            return int(error.get("statusCode"))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, HTTPException):
+        return False  # Storage not configured, etc.
+    status = _status_code(exc)
+    if status is None:
+        return True  # Connection reset, timeout, DNS...
+    return status >= 500 or status in RETRYABLE_STATUS
+
+
+def with_retries(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Call fn, retrying transient failures STORAGE_UPLOAD_RETRIES times."""
+    attempts = settings.STORAGE_UPLOAD_RETRIES + 1
+    for attempt in range(attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            delay = settings.STORAGE_UPLOAD_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"Warning: storage upload failed ({e}), retry {attempt + 1} in {delay:.2f}s")
+            time.sleep(delay)
+
+
+async def put_concurrently(put: Callable, objects: Sequence[tuple], **kwargs: Any) -> List[Any]:
+    """
+    Run put(*obj, **kwargs) for every obj on the shared upload pool, with
+    retries. Returns results in input order; raises the first failure.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    return await asyncio.gather(*[
+        loop.run_in_executor(pool, functools.partial(with_retries, put, *obj, **kwargs))
+        for obj in objects
+    ])
+
+
+def shutdown_storage_uploader() -> None:
+    """Wait for in-flight uploads, then stop the workers (app shutdown)."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
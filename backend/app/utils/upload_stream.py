@@ -0,0 +1,89 @@
+"""
+Bounded-memory upload ingestion.
+
+Starlette already spools each multipart file into a SpooledTemporaryFile
+(in memory up to 1MB, then on disk) while parsing the request. The cost
+was in the handlers: `await file.read()` pulled the whole file back into
+memory, sometimes twice. These helpers keep uploads in the spool:
+
+- UploadSizeLimitMiddleware rejects an oversized body with 413 before or
+  while it streams in (Content-Length, then a running byte count for
+  chunked bodies), so nothing past the limit is parsed or spooled.
+- upload_size() measures a spooled file by seeking, without reading it,
+  so handlers can check limits and pass the spool on (e.g. to an R2
+  multipart upload) instead of its bytes.
+- detach_spool() lets a streaming response keep using an upload after
+  the handler returns.
+"""
+import io
+from typing import Dict
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+# Room for multipart boundaries and the small form fields next to the file
+FORM_OVERHEAD = 64 * 1024
+
+
+def spool_size(spool) -> int:
+    """Size in bytes of a seekable file; leaves it positioned at the start."""
+    spool.seek(0, 2)
+    size = spool.tell()
+    spool.seek(0)
+    return size
+
+
+def upload_size(file: UploadFile) -> int:
+    """Size in bytes of a spooled upload; leaves it positioned at the start."""
+    return spool_size(file.file)
+
+
+def detach_spool(file: UploadFile):
+    """
+    Take ownership of an upload's spool; the caller must close it.
+    FastAPI closes form files as soon as the endpoint returns, before a
+    StreamingResponse body runs, so a streamed batch detaches its files first.
+    """
+    spool = file.file
+    file.file = io.BytesIO()  # What FastAPI will close instead
+    return spool
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"Upload is too large. Maximum size is {(limit - FORM_OVERHEAD) // (1024 * 1024)}MB."
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware capping request bodies on the upload routes.
+    limits maps a request path to its largest accepted file size in bytes.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = {path: size + FORM_OVERHEAD for path, size in limits.items()}
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": _too_large_detail(limit)})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside form parsing; FastAPI re-raises HTTPException as is
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,186 @@
+"""
+Write-behind buffer for hot counters and last-seen timestamps.
+
+Viewing an event (directly or via share link) used to commit a view_count
+increment on the request's session, and every authenticated request could
+commit last_login - so read endpoints wrote, and a viral event's row was
+locked by every viewer in turn. Instead those writes are accumulated in
+memory per process:
+
+    record_event_view(event.id, shared=True)
+    record_last_seen(user.id, datetime.utcnow())
+
+and applied in batches, one `UPDATE ... FROM (VALUES ...)` per table, by
+flush_write_behind(). main.py runs it every WRITE_BEHIND_FLUSH_SECONDS and
+at shutdown; recording also flushes inline when the buffer is older than
+that, which covers serverless instances whose background loop is frozen
+between requests.
+
+Counts are best effort: a crashed process loses at most one interval of
+views, which is acceptable for these fields. Responses add
+pending_views(event_id) so a viewer still sees their own view counted.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Tuple
+from sqlalchemy import text
+from ..core.config import settings
+
+FLUSH_CHUNK_SIZE = 500  # Rows per UPDATE statement
+
+_lock = threading.Lock()
+# event_id -> [views, share_views]
+_event_views: Dict[int, list] = defaultdict(lambda: [0, 0])
+# user_id -> latest seen timestamp
+_last_seen: Dict[int, datetime] = {}
+_oldest_pending = None  # monotonic time of the first unflushed record
+_flush_lock = threading.Lock()  # One flush at a time
+
+
+def record_event_view(event_id: int, shared: bool = False) -> None:
+    """Count a view of an event (and a share-link view when shared=True)."""
+    global _oldest_pending
+    with _lock:
+        counts = _event_views[event_id]
+        counts[0] += 1
+        if shared:
+            counts[1] += 1
+        if _oldest_pending is None:
+            _oldest_pending = time.monotonic()
+    _maybe_flush()
+
+
+def record_last_seen(user_id: int, seen_at: datetime) -> None:
+    """Remember the latest time a user was seen (written as last_login)."""
+    global _oldest_pending
+    with _lock:
+        previous = _last_seen.get(user_id)
+        if previous is None or seen_at > previous:
+            _last_seen[user_id] = seen_at
+        if _oldest_pending is None:
+            _oldest_pending = time.monotonic()
+    _maybe_flush()
+
+
+def pending_views(event_id: int) -> Tuple[int, int]:
+    """(views, share_views) recorded for an event but not yet written."""
+    with _lock:
+        counts = _event_views.get(event_id)
+        return (counts[0], counts[1]) if counts else (0, 0)
+
+
+def pending_last_seen(user_id: int):
+    with _lock:
+        return _last_seen.get(user_id)
+
+
+def _maybe_flush() -> None:
+    oldest = _oldest_pending
+    if oldest is not None and time.monotonic() - oldest > settings.WRITE_BEHIND_FLUSH_SECONDS:
+        flush_write_behind()
+
+
+def _take_buffers():
+    global _event_views, _last_seen, _oldest_pending
+    with _lock:
+        views, seen = _event_views, _last_seen
+        _event_views = defaultdict(lambda: [0, 0])
+        _last_seen = {}
+        _oldest_pending = None
+    return views, seen
+
+
+def _restore_buffers(views, seen) -> None:
+    """Put back deltas from a failed flush so they go out with the next one."""
+    global _oldest_pending
+    with _lock:
+        for event_id, (v, s) in views.items():
+            counts = _event_views[event_id]
+            counts[0] += v
+            counts[1] += s
+        for user_id, seen_at in seen.items():
+            current = _last_seen.get(user_id)
+            if current is None or seen_at > current:
+                _last_seen[user_id] = seen_at
+        if _oldest_pending is None:
+            _oldest_pending = time.monotonic()
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _flush_event_views(conn, rows) -> None:
+    if conn.dialect.name == "postgresql":
+        for chunk in _chunks(rows, FLUSH_CHUNK_SIZE):
+            params = {}
+            values = []
+            for i, (event_id, views, shares) in enumerate(chunk):
+                params[f"id_{i}"], params[f"v_{i}"], params[f"s_{i}"] = event_id, views, shares
+                values.append(f"(CAST(:id_{i} AS integer), CAST(:v_{i} AS integer), CAST(:s_{i} AS integer))")
+            conn.execute(text(
+                "UPDATE events AS e "
+                "SET view_count = COALESCE(e.view_count, 0) + v.views, "
+                "share_view_count = COALESCE(e.share_view_count, 0) + v.shares "
+                f"FROM (VALUES {', '.join(values)}) AS v(id, views, shares) "
+                "WHERE e.id = v.id"
+            ), params)
+    else:
+        # SQLite has no column list on VALUES; one executemany round instead
+        conn.execute(text(
+            "UPDATE events SET view_count = COALESCE(view_count, 0) + :views, "
+            "share_view_count = COALESCE(share_view_count, 0) + :shares "
+            "WHERE id = :id"
+        ), [{"id": e, "views": v, "shares": s} for e, v, s in rows])
+
+
+def _flush_last_seen(conn, rows) -> None:
+    if conn.dialect.name == "postgresql":
+        for chunk in _chunks(rows, FLUSH_CHUNK_SIZE):
+            params = {}
+            values = []
+            for i, (user_id, seen_at) in enumerate(chunk):
+                params[f"id_{i}"], params[f"t_{i}"] = user_id, seen_at
+                values.append(f"(CAST(:id_{i} AS integer), CAST(:t_{i} AS timestamp))")
+            conn.execute(text(
+                "UPDATE users AS u SET last_login = v.seen "
+                f"FROM (VALUES {', '.join(values)}) AS v(id, seen) "
+                "WHERE u.id = v.id AND (u.last_login IS NULL OR u.last_login < v.seen)"
+            ), params)
+    else:
+        conn.execute(text(
+            "UPDATE users SET last_login = :seen "
+            "WHERE id = :id AND (last_login IS NULL OR last_login < :seen)"
+        ), [{"id": u, "seen": t} for u, t in rows])
+
+
+def flush_write_behind() -> int:
+    """Write all buffered increments and timestamps; returns rows flushed."""
+    from ..core.database import engine
+
+    if not _flush_lock.acquire(blocking=False):
+        return 0  # Another thread is already flushing
+    try:
+        views, seen = _take_buffers()
+        if not views and not seen:
+            return 0
+
+        view_rows = sorted((event_id, v, s) for event_id, (v, s) in views.items())
+        seen_rows = sorted(seen.items())
+        try:
+            # Sorted by ID so concurrent flushers lock rows in the same order
+            with engine.begin() as conn:
+                if view_rows:
+                    _flush_event_views(conn, view_rows)
+                if seen_rows:
+                    _flush_last_seen(conn, seen_rows)
+        except Exception as e:
+            print(f"[WRITE-BEHIND] Flush failed, will retry: {e}")
+            _restore_buffers(views, seen)
+            return 0
+        return len(view_rows) + len(seen_rows)
+    finally:
+        _flush_lock.release()
@@ -0,0 +1,93 @@
+"""
+Benchmark: bytes fetched per feed page with full Event rows vs the card
+column projection used by list endpoints (no description column).
+
+Runs the feed's base query (published, not deleted, newest first) both ways
+against DATABASE_URL and reports the size of the raw column values returned
+by the driver, plus fetch time. Read-only.
+
+Usage:
+    cd backend
+    python scripts/benchmark_feed_payload.py
+    python scripts/benchmark_feed_payload.py --limit 100 --pages 5 --runs 10
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+from app.models import Event
+from app.utils.event_projection import EVENT_CARD_COLUMNS
+
+
+def value_size(value) -> int:
+    """Approximate wire size of one column value."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(str(value).encode("utf-8"))
+
+
+def measure(db, query, columns, runs: int):
+    """
+    Fetch columns for a query's rows, returning (bytes, rows, median seconds).
+    Columns are selected explicitly so rows hold raw values, not Event objects.
+    """
+    statement = query.with_entities(*columns).statement
+    timings = []
+    total_bytes = 0
+    row_count = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = db.execute(statement).all()
+        timings.append(time.perf_counter() - start)
+        total_bytes = sum(value_size(v) for row in rows for v in row)
+        row_count = len(rows)
+    return total_bytes, row_count, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare feed payload size with and without projection")
+    parser.add_argument("--limit", type=int, default=100, help="Events per page")
+    parser.add_argument("--pages", type=int, default=3, help="Pages to measure")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per page (median time reported)")
+    args = parser.parse_args()
+
+    full_columns = tuple(Event.__table__.columns)
+
+    db = SessionLocal()
+    try:
+        base = db.query(Event).filter(
+            Event.is_published == True,
+            Event.is_deleted == False
+        ).order_by(Event.start_date.desc(), Event.id.desc())
+
+        print(f"{'page':>4} {'rows':>5} {'full bytes':>12} {'card bytes':>12} {'saved':>7} {'full ms':>9} {'card ms':>9}")
+        totals = [0, 0]
+        for page in range(args.pages):
+            paged = base.offset(page * args.limit).limit(args.limit)
+            full_bytes, rows, full_time = measure(db, paged, full_columns, args.runs)
+            card_bytes, _, card_time = measure(db, paged, EVENT_CARD_COLUMNS, args.runs)
+            if rows == 0:
+                break
+            totals[0] += full_bytes
+            totals[1] += card_bytes
+            saved = 100 * (1 - card_bytes / full_bytes) if full_bytes else 0
+            print(f"{page + 1:>4} {rows:>5} {full_bytes:>12,} {card_bytes:>12,} {saved:>6.1f}% "
+                  f"{full_time * 1000:>9.2f} {card_time * 1000:>9.2f}")
+
+        if totals[0]:
+            print(f"Total: {totals[0]:,} -> {totals[1]:,} bytes "
+                  f"({100 * (1 - totals[1] / totals[0]):.1f}% less)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic social graph for the feed/privacy benchmarks.
+
+seed_social_graph() bulk-inserts users, follows (some close family), custom
+groups, mutes, events across every privacy level and accepted tags into the
+current transaction. Benchmarks run against it and then roll back, so
+nothing is left behind in DATABASE_URL. Not a script on its own; imported
+by benchmark_timeline.py and benchmark_privacy_filter.py.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, NamedTuple
+from sqlalchemy import insert
+from app.models import (
+    User, Event, Follow, CustomGroup, CustomGroupMember, UserMute, EventTag
+)
+
+PRIVACY_WEIGHTS = [
+    ("public", 50),
+    ("followers", 25),
+    ("close_family", 10),
+    ("custom_group", 10),
+    ("private", 5),
+]
+
+
+class SeededGraph(NamedTuple):
+    user_ids: List[int]
+    event_count: int
+    prefix: str
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def seed_social_graph(
+    db,
+    users: int = 500,
+    events: int = 10000,
+    follows_per_user: int = 30,
+    group_owner_share: float = 0.1,
+    seed: int = 42
+) -> SeededGraph:
+    """Insert a random graph in the session's transaction (caller rolls back)."""
+    rng = random.Random(seed)
+    prefix = f"bench_{uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+
+    db.execute(insert(User), [{
+        "email": f"{prefix}_{i}@example.com",
+        "username": f"{prefix}_{i}",
+        "display_name": f"Bench User {i}",
+        "subscription_tier": "premium",
+        "subscription_status": "active",
+        "content_visible": True,
+        "is_active": True,
+        "created_at": now,
+    } for i in range(users)])
+    user_ids = [row[0] for row in db.query(User.id).filter(User.username.like(f"{prefix}_%")).all()]
+
+    follow_rows = []
+    followers_of = {user_id: [] for user_id in user_ids}
+    for follower_id in user_ids:
+        for following_id in rng.sample(user_ids, min(follows_per_user, len(user_ids) - 1)):
+            if following_id == follower_id:
+                continue
+            follow_rows.append({
+                "follower_id": follower_id,
+                "following_id": following_id,
+                "status": "accepted" if rng.random() < 0.9 else "pending",
+                "is_close_family": rng.random() < 0.2,
+                "created_at": now,
+            })
+            followers_of[following_id].append(follower_id)
+    db.execute(insert(Follow), follow_rows)
+
+    group_of = {}
+    owners = rng.sample(user_ids, int(len(user_ids) * group_owner_share))
+    for owner_id in owners:
+        db.execute(insert(CustomGroup), [{"owner_id": owner_id, "name": f"{prefix} group", "created_at": now, "updated_at": now}])
+    for group_id, owner_id in db.query(CustomGroup.id, CustomGroup.owner_id).filter(
+        CustomGroup.name == f"{prefix} group"
+    ).all():
+        group_of[owner_id] = group_id
+        members = rng.sample(followers_of[owner_id], min(10, len(followers_of[owner_id])))
+        if members:
+            db.execute(insert(CustomGroupMember), [
+                {"group_id": group_id, "user_id": member_id, "added_at": now} for member_id in members
+            ])
+
+    db.execute(insert(UserMute), [
+        {"muter_id": rng.choice(user_ids), "muted_user_id": rng.choice(user_ids), "created_at": now}
+        for _ in range(len(user_ids) // 20)
+    ])
+
+    levels = [level for level, _ in PRIVACY_WEIGHTS]
+    weights = [weight for _, weight in PRIVACY_WEIGHTS]
+    event_rows = []
+    for i in range(events):
+        author_id = rng.choice(user_ids)
+        privacy = rng.choices(levels, weights)[0]
+        if privacy == "custom_group" and author_id not in group_of:
+            privacy = "followers"
+        event_rows.append({
+            "title": f"{prefix} event {i}",
+            "summary": "Benchmark event",
+            "start_date": now - timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+            "created_at": now - timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+            "author_id": author_id,
+            "privacy_level": privacy,
+            "custom_group_id": group_of.get(author_id) if privacy == "custom_group" else None,
+            "is_published": rng.random() < 0.95,
+            "is_deleted": rng.random() < 0.02,
+            "view_count": 0,
+            "like_count": 0,
+            "comment_count": 0,
+        })
+    for start in range(0, len(event_rows), 1000):
+        db.execute(insert(Event), event_rows[start:start + 1000])
+
+    event_ids = [row[0] for row in db.query(Event.id).filter(Event.title.like(f"{prefix} event %")).all()]
+    tag_rows = [{
+        "event_id": event_id,
+        "tagged_user_id": rng.choice(user_ids),
+        "tagged_by_id": rng.choice(user_ids),
+        "status": "accepted",
+        "created_at": now,
+    } for event_id in rng.sample(event_ids, len(event_ids) // 20)]
+    if tag_rows:
+        db.execute(insert(EventTag), tag_rows)
+
+    db.flush()
+    return SeededGraph(user_ids=user_ids, event_count=len(event_ids), prefix=prefix)
@@ -0,0 +1,175 @@
+"""
+Benchmark: per-upload CPU time and peak RSS of variant generation, before
+and after the cascaded draft-mode pipeline.
+
+- before: the previous /upload path - decode at full resolution, then
+  resize_image() three times, each from a full copy of the original.
+- after:  render_image_variants() (app/utils/image_processing.py) - JPEG
+  draft decode, one RGB conversion, each variant derived from the last.
+
+Every (file, pipeline) pair runs in a fresh spawned process so peak RSS is
+that upload's alone; CPU time is process time spent rendering. The "after"
+rows also report the median per-stage timings.
+
+Point it at a folder of phone photos (12-48MP JPEG and HEIC), or let it
+synthesize a corpus: --synthesize writes 12, 24 and 48MP JPEGs (and HEICs
+when pillow-heif is installed) into a temporary directory.
+
+Usage:
+    cd backend
+    python scripts/benchmark_image_variants.py ~/Pictures/phone-samples
+    python scripts/benchmark_image_variants.py --synthesize --runs 3
+"""
+import sys
+import os
+import io
+import time
+import argparse
+import resource
+import statistics
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageOps
+from app.utils.image_processing import (
+    IMAGE_VARIANTS, extract_exif_metadata, resize_image, render_image_variants
+)
+
+EXTENSIONS = {".jpg", ".jpeg", ".heic", ".heif", ".png", ".webp"}
+# Megapixels -> 4:3 dimensions, as shot by recent phone cameras
+SYNTHETIC_SIZES = {12: (4032, 3024), 24: (5712, 4284), 48: (8064, 6048)}
+
+
+def render_before(contents: bytes):
+    """The /upload pipeline before render_image_variants()."""
+    image = Image.open(io.BytesIO(contents))
+    extract_exif_metadata(image)
+    try:
+        image = ImageOps.exif_transpose(image)
+    except Exception:
+        pass
+    return {
+        name: resize_image(image, max_size, quality=quality)
+        for name, (max_size, quality, _) in IMAGE_VARIANTS.items()
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(path: str, pipeline: str) -> dict:
+    """Runs in its own process: render path once, report CPU ms and RSS."""
+    with open(path, "rb") as f:
+        contents = f.read()
+    baseline = peak_rss_mb()
+    started = time.process_time()
+    if pipeline == "before":
+        render_before(contents)
+        timings = {}
+    else:
+        timings = render_image_variants(contents).timings
+    return {
+        "cpu_ms": (time.process_time() - started) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": peak_rss_mb() - baseline,
+        "timings": timings,
+    }
+
+
+def synthesize(directory: str) -> list:
+    """Write noisy-gradient test photos of each SYNTHETIC_SIZES size."""
+    try:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+        formats = [("JPEG", ".jpg"), ("HEIF", ".heic")]
+    except ImportError:
+        print("pillow-heif not installed: synthesizing JPEG only")
+        formats = [("JPEG", ".jpg")]
+
+    paths = []
+    for megapixels, size in SYNTHETIC_SIZES.items():
+        # Noise over a gradient compresses like a photo, unlike a flat fill
+        image = Image.merge("RGB", [
+            Image.linear_gradient("L").resize(size),
+            Image.effect_noise(size, 40),
+            Image.linear_gradient("L").rotate(90).resize(size),
+        ])
+        for image_format, ext in formats:
+            path = os.path.join(directory, f"synthetic_{megapixels}mp{ext}")
+            image.save(path, format=image_format, quality=92)
+            paths.append(path)
+    return paths
+
+
+def collect(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.splitext(name)[1].lower() in EXTENSIONS:
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image variant generation before/after")
+    parser.add_argument("paths", nargs="*", help="Image files or directories")
+    parser.add_argument("--synthesize", action="store_true", help="Generate a 12/24/48MP corpus")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per file and pipeline (median reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = collect(args.paths)
+        if args.synthesize:
+            files += synthesize(tmp)
+        if not files:
+            parser.error("give image paths or --synthesize")
+
+        # One process per measurement: RSS peaks never carry over
+        pool = multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1)
+        try:
+            print(f"{'file':<28} {'MP':>5} {'before cpu':>11} {'after cpu':>10} "
+                  f"{'before rss':>11} {'after rss':>10}")
+            stage_timings = {}
+            totals = {"before": [], "after": []}
+            for path in files:
+                with Image.open(path) as image:
+                    megapixels = image.width * image.height / 1e6
+                row = {}
+                for pipeline in ("before", "after"):
+                    results = [pool.apply(measure, (path, pipeline)) for _ in range(args.runs)]
+                    row[pipeline] = (
+                        statistics.median(r["cpu_ms"] for r in results),
+                        statistics.median(r["rss_growth_mb"] for r in results),
+                    )
+                    totals[pipeline].append(row[pipeline])
+                    for result in results:
+                        for stage, seconds in result["timings"].items():
+                            stage_timings.setdefault(stage, []).append(seconds * 1000)
+                print(f"{os.path.basename(path)[:28]:<28} {megapixels:>5.1f} "
+                      f"{row['before'][0]:>9.0f}ms {row['after'][0]:>8.0f}ms "
+                      f"{row['before'][1]:>9.0f}MB {row['after'][1]:>8.0f}MB")
+
+            print()
+            for pipeline in ("before", "after"):
+                cpu = statistics.median(t[0] for t in totals[pipeline])
+                rss = statistics.median(t[1] for t in totals[pipeline])
+                print(f"median {pipeline:<6}: {cpu:.0f}ms CPU, +{rss:.0f}MB peak RSS per upload")
+
+            print("\nafter, median per stage:")
+            for stage, values in stage_timings.items():
+                print(f"  {stage:<18} {statistics.median(values):>8.1f}ms")
+        finally:
+            pool.close()
+            pool.join()
+
+
+if __name__ == "__main__":
+    main()
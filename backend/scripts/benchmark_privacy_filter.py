@@ -0,0 +1,143 @@
+"""
+Plan-regression benchmark for filter_events_by_privacy().
+
+Seeds a large synthetic graph (see benchmark_graph.py) inside a transaction,
+then runs the feed-shaped query - published, not deleted, newest first,
+one page - through each implementation:
+
+- rules:    filter_events_by_privacy_rules()    OR of IN lists + DISTINCT
+- exists:   filter_events_by_privacy_exists()   correlated EXISTS branches
+- audience: filter_events_by_privacy_audience() event_audience probe
+
+For one viewer it prints the query plan of each (EXPLAIN ANALYZE with
+buffers on Postgres, EXPLAIN QUERY PLAN on SQLite); for every sampled
+viewer it checks that all variants return the same page and reports
+latency percentiles. Everything is rolled back at the end.
+
+Usage:
+    cd backend
+    python scripts/benchmark_privacy_filter.py
+    python scripts/benchmark_privacy_filter.py --users 5000 --events 200000 --viewers 50 --runs 5
+    python scripts/benchmark_privacy_filter.py --no-plans
+"""
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+from app.models import User, Event
+from app.utils.privacy import (
+    filter_events_by_privacy_rules,
+    filter_events_by_privacy_exists,
+    filter_events_by_privacy_audience,
+)
+from app.utils.social_graph import clear_graph_snapshots
+from app.services.event_audience import rebuild_event_audience
+from benchmark_graph import seed_social_graph, percentile
+
+VARIANTS = [
+    ("rules", filter_events_by_privacy_rules),
+    ("exists", filter_events_by_privacy_exists),
+    ("audience", filter_events_by_privacy_audience),
+]
+
+
+def page_query(db, variant, viewer, limit):
+    """One feed page of (id, start_date) rows; main() compares only the ids."""
+    # start_date is selected too: with the rules variant's DISTINCT, Postgres
+    # requires ORDER BY expressions to appear in the select list
+    query = db.query(Event.id, Event.start_date).filter(
+        Event.is_published == True,
+        Event.is_deleted == False
+    )
+    query = variant(query, viewer, db)
+    return query.order_by(Event.start_date.desc(), Event.id.desc()).limit(limit)
+
+
+def show_plan(db, query):
+    """Print the database's plan for a query, executing it on Postgres."""
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        rows = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()
+        for (line,) in rows:
+            print(f"    {line}")
+    else:
+        for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all():
+            print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare filter_events_by_privacy implementations")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--follows", type=int, default=50, help="Follows per user")
+    parser.add_argument("--viewers", type=int, default=20, help="Viewers sampled")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per viewer and variant")
+    parser.add_argument("--limit", type=int, default=20, help="Events per page")
+    parser.add_argument("--no-plans", action="store_true", help="Skip printing query plans")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Seeding {args.users} users, {args.events} events...")
+        graph = seed_social_graph(db, users=args.users, events=args.events, follows_per_user=args.follows)
+        seeded_ids = [row[0] for row in db.query(Event.id).filter(
+            Event.title.like(f"{graph.prefix} event %")
+        ).all()]
+        rebuild_event_audience(db, seeded_ids)
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("ANALYZE"))
+        clear_graph_snapshots()
+
+        viewers = db.query(User).filter(User.id.in_(graph.user_ids[:args.viewers])).all()
+
+        if not args.no_plans:
+            for name, variant in VARIANTS:
+                print(f"\n== {name} plan (viewer {viewers[0].id}) ==")
+                show_plan(db, page_query(db, variant, viewers[0], args.limit))
+            print()
+
+        timings = {name: [] for name, _ in VARIANTS}
+        mismatches = 0
+        for viewer in viewers:
+            pages = {}
+            for name, variant in VARIANTS:
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    ids = [row[0] for row in page_query(db, variant, viewer, args.limit).all()]
+                    timings[name].append((time.perf_counter() - start) * 1000)
+                pages[name] = ids
+            if pages["rules"] != pages["exists"]:
+                mismatches += 1
+                print(f"MISMATCH viewer={viewer.id}: rules and exists return different pages")
+            if pages["rules"] != pages["audience"]:
+                # Expected only where a tag exposes a followers/close_family/private
+                # event in the rules filter but not in can_view_event()
+                print(f"NOTE viewer={viewer.id}: audience page differs from rules "
+                      f"({len(set(pages['rules']) ^ set(pages['audience']))} events)")
+
+        print(f"{'variant':<10} {'runs':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, _ in VARIANTS:
+            values = timings[name]
+            print(f"{name:<10} {len(values):>6} {percentile(values, 50):>9.2f} {percentile(values, 95):>9.2f} "
+                  f"{percentile(values, 99):>9.2f} {max(values):>9.2f}")
+        print(f"{mismatches} rules/exists mismatches over {len(viewers)} viewers")
+        sys.exit(1 if mismatches else 0)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        # Never keep the synthetic graph
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Microbenchmark: serializing a 100-event feed page the old way vs the
+precompiled TypeAdapter path in app/utils/serialization.py.
+
+Old path: build a dict per row, EventResponse.model_validate() it, then let
+FastAPI encode the list of models (jsonable_encoder + json.dumps).
+New path: event_card() per row and one EVENT_CARDS.dump_json() call.
+
+Uses synthetic in-memory rows, so no database is needed.
+
+Usage:
+    cd backend
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --events 100 --runs 500
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from app.schemas.event import EventResponse
+from app.utils.serialization import EVENT_CARDS, event_card
+
+
+def make_events(count: int):
+    """Build fake card rows shaped like Event objects loaded with event_card_options()."""
+    author = SimpleNamespace(username="jpwilson", full_name="JP Wilson", display_name=None)
+    now = datetime(2025, 9, 1, 12, 0, 0)
+    events = []
+    for i in range(count):
+        events.append(SimpleNamespace(
+            id=i + 1,
+            slug=f"summer-trip-{i + 1}",
+            title=f"Summer trip to the coast, day {i + 1}",
+            short_title=None,
+            summary="A long weekend of hiking, swimming and far too much ice cream. " * 2,
+            start_date=now - timedelta(days=i),
+            end_date=now - timedelta(days=i - 2),
+            location_name="Cornwall, United Kingdom",
+            latitude=50.2660,
+            longitude=-5.0527,
+            cover_image_url=f"https://cdn.example.com/events/{i + 1}/cover_medium.jpg",
+            has_multiple_locations=bool(i % 2),
+            author_id=1,
+            author=author,
+            view_count=i * 7,
+            like_count=i % 13,
+            comment_count=i % 5,
+            is_published=True,
+            privacy_level="public",
+            category="travel",
+            category_2=None,
+            custom_group_id=None,
+            share_enabled=False,
+            share_expires_at=None,
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(days=i)
+        ))
+    return events
+
+
+def old_path(events) -> bytes:
+    response = [EventResponse.model_validate(event_card(event)) for event in events]
+    return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+
+def new_path(events) -> bytes:
+    return EVENT_CARDS.dump_json([event_card(event) for event in events])
+
+
+def time_path(func, events, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(events)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare list-endpoint serialization paths")
+    parser.add_argument("--events", type=int, default=100, help="Events per page")
+    parser.add_argument("--runs", type=int, default=200, help="Timed runs per path")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+
+    # Both paths must produce the same document
+    if json.loads(old_path(events)) != json.loads(new_path(events)):
+        print("WARNING: old and new payloads differ")
+
+    # Warm up
+    for _ in range(10):
+        old_path(events)
+        new_path(events)
+
+    old_median, old_p95 = time_path(old_path, events, args.runs)
+    new_median, new_p95 = time_path(new_path, events, args.runs)
+
+    print(f"{args.events} events/page, {args.runs} runs")
+    print(f"{'path':<14} {'median ms':>10} {'p95 ms':>10}")
+    print(f"{'model_validate':<14} {old_median * 1000:>10.3f} {old_p95 * 1000:>10.3f}")
+    print(f"{'TypeAdapter':<14} {new_median * 1000:>10.3f} {new_p95 * 1000:>10.3f}")
+    if new_median:
+        print(f"Speedup: {old_median / new_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
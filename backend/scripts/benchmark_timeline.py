@@ -0,0 +1,133 @@
+"""
+Benchmark: the precomputed "following" timeline against the live feed queries.
+
+Seeds a synthetic graph (10k events by default, see benchmark_graph.py)
+inside a transaction, builds timeline_entries for it, then pages through
+each sampled viewer's feed three ways:
+
+- live all:       get_events' default query (filter_events_for_feed)
+- live following: followed authors' events, filtered by filter_events_by_privacy
+- timeline:       get_timeline_page() (services/timeline.py)
+
+and reports per-page latency percentiles. Everything is rolled back at the
+end, so it is safe to point at a development copy of the real database.
+
+Usage:
+    cd backend
+    python scripts/benchmark_timeline.py
+    python scripts/benchmark_timeline.py --events 50000 --users 2000 --viewers 20 --pages 5
+"""
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+from app.models import User, Event, Follow
+from app.utils.event_projection import event_card_options
+from app.utils.pagination import paginate_events
+from app.utils.privacy import filter_events_for_feed, filter_events_by_privacy
+from app.utils.social_graph import clear_graph_snapshots
+from app.services.timeline import rebuild_timelines, get_timeline_page
+from benchmark_graph import seed_social_graph, percentile
+
+
+def base_query(db):
+    return db.query(Event).options(
+        event_card_options(),
+        selectinload(Event.author)
+    ).filter(
+        Event.is_published == True,
+        Event.is_deleted == False
+    )
+
+
+def live_all_page(db, viewer, cursor, limit):
+    query = filter_events_for_feed(base_query(db), viewer, db)
+    return paginate_events(query, cursor=cursor, limit=limit)
+
+
+def live_following_page(db, viewer, cursor, limit):
+    followed = db.query(Follow.following_id).filter(
+        Follow.follower_id == viewer.id,
+        Follow.status == "accepted"
+    )
+    query = base_query(db).filter(or_(Event.author_id == viewer.id, Event.author_id.in_(followed)))
+    query = filter_events_by_privacy(query, viewer, db)
+    return paginate_events(query, cursor=cursor, limit=limit)
+
+
+def timeline_page(db, viewer, cursor, limit):
+    return get_timeline_page(db, viewer, cursor=cursor, limit=limit, event_options=(event_card_options(),))
+
+
+def run(db, fetch, viewers, pages, limit):
+    """Page through each viewer's feed; returns (per-page ms, rows returned)."""
+    timings = []
+    rows = 0
+    for viewer in viewers:
+        cursor = None
+        for _ in range(pages):
+            db.expunge_all()
+            start = time.perf_counter()
+            events, cursor = fetch(db, viewer, cursor, limit)
+            timings.append((time.perf_counter() - start) * 1000)
+            rows += len(events)
+            if not cursor:
+                break
+    return timings, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the following timeline against live feed queries")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--follows", type=int, default=30, help="Follows per user")
+    parser.add_argument("--viewers", type=int, default=10, help="Viewers sampled")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per viewer")
+    parser.add_argument("--limit", type=int, default=20, help="Events per page")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Seeding {args.users} users, {args.events} events...")
+        graph = seed_social_graph(db, users=args.users, events=args.events, follows_per_user=args.follows)
+
+        start = time.perf_counter()
+        rebuild_timelines(db, graph.user_ids)
+        db.flush()
+        print(f"Built timelines for {len(graph.user_ids)} users in {time.perf_counter() - start:.2f}s")
+
+        viewer_ids = graph.user_ids[:args.viewers]
+        viewers = db.query(User).filter(User.id.in_(viewer_ids)).all()
+        clear_graph_snapshots()
+
+        print(f"{'variant':<16} {'pages':>6} {'rows':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, fetch in [
+            ("live all", live_all_page),
+            ("live following", live_following_page),
+            ("timeline", timeline_page),
+        ]:
+            # Warm-up pass so the first variant does not pay for cold caches
+            run(db, fetch, viewers[:1], 1, args.limit)
+            viewers = db.query(User).filter(User.id.in_(viewer_ids)).all()
+            timings, rows = run(db, fetch, viewers, args.pages, args.limit)
+            print(f"{name:<16} {len(timings):>6} {rows:>7} {percentile(timings, 50):>9.2f} "
+                  f"{percentile(timings, 95):>9.2f} {percentile(timings, 99):>9.2f} {max(timings):>9.2f}")
+    except Exception as e:
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        # Never keep the synthetic graph
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
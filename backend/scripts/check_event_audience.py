@@ -0,0 +1,139 @@
+"""
+Consistency check: the materialized event_audience table and the SQL list
+filters vs the rule-based privacy functions.
+
+For a sample of viewers, decides every event's visibility with
+can_view_event_rules() (follows, groups and tags evaluated directly) and
+compares it with:
+- the viewer's event_audience rows: MISSING means the rules admit the
+  viewer but no row exists, EXTRA means a stale row admits them;
+- each list filter (filter_events_by_privacy_audience/_exists/_rules) run
+  over the same events, so switching EVENT_PRIVACY_BACKEND cannot change
+  list results unnoticed: LIST <backend> lines name the events a filter
+  returns or drops against the rules.
+Exits non-zero on any mismatch, so it can gate a deploy.
+
+--fix rebuilds the audience of every mismatched event; --rebuild recomputes
+the whole table first.
+
+Usage:
+    cd backend
+    python scripts/check_event_audience.py
+    python scripts/check_event_audience.py --viewers 50 --events 5000
+    python scripts/check_event_audience.py --viewer-id 7 --fix
+    python scripts/check_event_audience.py --rebuild
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+from app.models import User, Event
+from app.utils.privacy import (
+    can_view_event_rules,
+    _decide_by_audience,
+    filter_events_by_privacy_audience,
+    filter_events_by_privacy_exists,
+    filter_events_by_privacy_rules,
+)
+from app.services.event_audience import (
+    audience_event_ids, rebuild_event_audience, rebuild_all_audiences
+)
+
+# EVENT_PRIVACY_BACKEND value -> list filter
+LIST_FILTERS = {
+    "audience": filter_events_by_privacy_audience,
+    "exists": filter_events_by_privacy_exists,
+    "rules": filter_events_by_privacy_rules,
+}
+
+
+def list_filter_ids(db, list_filter, viewer, event_ids):
+    """Ids among event_ids that list_filter lets the viewer see."""
+    query = list_filter(db.query(Event.id).filter(Event.id.in_(event_ids)), viewer, db)
+    return {row[0] for row in query.all()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare event_audience with the privacy rules")
+    parser.add_argument("--viewers", type=int, default=20, help="Number of viewers to sample")
+    parser.add_argument("--events", type=int, default=2000, help="Number of events to check")
+    parser.add_argument("--viewer-id", type=int, action="append", dest="viewer_ids",
+                        help="Check this viewer (repeatable, overrides --viewers)")
+    parser.add_argument("--fix", action="store_true", help="Rebuild the audience of mismatched events")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the whole table before checking")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            rebuild_all_audiences(db)
+            db.commit()
+            print("Rebuilt event_audience")
+
+        # Relationship-gated events (the ones with audience rows) plus private
+        # ones, which no list filter may return to anyone but the author
+        events = db.query(Event).filter(or_(
+            Event.privacy_level.is_(None),
+            Event.privacy_level != "public"
+        )).order_by(Event.id.desc()).limit(args.events).all()
+
+        if args.viewer_ids:
+            viewers = db.query(User).filter(User.id.in_(args.viewer_ids)).all()
+        else:
+            viewers = db.query(User).order_by(User.id).limit(args.viewers).all()
+
+        event_ids = [e.id for e in events]
+        mismatches = 0
+        list_mismatches = {backend: 0 for backend in LIST_FILTERS}
+        checked = 0
+        stale_event_ids = set()
+        for viewer in viewers:
+            allowed_ids = audience_event_ids(db, event_ids, viewer.id)
+            visible_ids = set()
+            for event in events:
+                rules = can_view_event_rules(event, viewer, db)
+                audience = _decide_by_audience(event, viewer, event.author, allowed_ids)
+                checked += 1
+                if rules:
+                    visible_ids.add(event.id)
+                if rules != audience:
+                    mismatches += 1
+                    stale_event_ids.add(event.id)
+                    kind = "MISSING" if rules else "EXTRA"
+                    print(f"{kind} viewer={viewer.username} event={event.id} "
+                          f"privacy={event.privacy_level} rules={rules} audience={audience}")
+
+            for backend, list_filter in LIST_FILTERS.items():
+                listed_ids = list_filter_ids(db, list_filter, viewer, event_ids)
+                for event_id in sorted(listed_ids ^ visible_ids):
+                    list_mismatches[backend] += 1
+                    if backend == "audience":
+                        stale_event_ids.add(event_id)
+                    print(f"LIST {backend} viewer={viewer.username} event={event_id} "
+                          f"rules={event_id in visible_ids} list={event_id in listed_ids}")
+
+        print(f"Checked {checked} (viewer, event) pairs over {len(events)} events: {mismatches} mismatches")
+        for backend, count in list_mismatches.items():
+            print(f"  list filter {backend}: {count} mismatches")
+
+        if args.fix and stale_event_ids:
+            rebuild_event_audience(db, stale_event_ids)
+            db.commit()
+            print(f"Rebuilt the audience of {len(stale_event_ids)} events")
+
+        sys.exit(1 if mismatches or any(list_mismatches.values()) else 0)
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
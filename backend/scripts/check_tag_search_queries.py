@@ -0,0 +1,69 @@
+"""
+Assert that tagging search stays within its query budget.
+
+Runs search_tag_targets() (used by /search/taggable and
+/tag-profiles/search) for a set of search terms and counts the SQL
+statements issued per call. Exits with status 1 if any call exceeds
+TAG_SEARCH_QUERY_BUDGET, so it can gate CI or a deploy. Read-only.
+
+Usage:
+    cd backend
+    python scripts/check_tag_search_queries.py
+    python scripts/check_tag_search_queries.py --user-id 5 -q jo -q smith
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app.core.database import SessionLocal, engine
+# Import all models to resolve SQLAlchemy relationships
+import app.models  # noqa: F401
+from app.models.user import User
+from app.services.tag_search import search_tag_targets, TAG_SEARCH_QUERY_BUDGET
+
+DEFAULT_TERMS = ["a", "jo", "smi", "grandma", "xqzv"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check tagging search query counts")
+    parser.add_argument("--user-id", type=int, help="Viewer to search as (default: first user)")
+    parser.add_argument("-q", action="append", dest="terms", help="Search term (repeatable)")
+    args = parser.parse_args()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = SessionLocal()
+    try:
+        viewer_id = args.user_id or db.query(User.id).order_by(User.id).limit(1).scalar()
+        if viewer_id is None:
+            print("No users in the database")
+            return
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        failures = 0
+        for term in args.terms or DEFAULT_TERMS:
+            for label, kwargs in (("taggable", {}), ("profiles", {"include_users": False})):
+                statements.clear()
+                results = search_tag_targets(db, viewer_id, term, **kwargs)
+                status = "ok" if len(statements) <= TAG_SEARCH_QUERY_BUDGET else "OVER BUDGET"
+                if status != "ok":
+                    failures += 1
+                print(f"{label:<9} q={term!r:<12} results={len(results):>3} queries={len(statements)} {status}")
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+        if failures:
+            print(f"{failures} searches exceeded the budget of {TAG_SEARCH_QUERY_BUDGET} queries")
+            sys.exit(1)
+        print(f"All searches within {TAG_SEARCH_QUERY_BUDGET} query budget")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,6 @@ Usage:
 """
 import sys
 import os
-import io
 import re
 import json
 import uuid
@@ -29,12 +28,12 @@ import argparse
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
-from PIL import Image, ImageOps
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
-from app.api.upload import resize_image, THUMBNAIL_SIZE, MEDIUM_SIZE
+from app.utils.cpu_pool import submit_cpu_bound, shutdown_cpu_pool
+from app.utils.image_processing import IMAGE_VARIANTS, render_image_variants
 from app.utils.r2_client import r2_configured, r2_put, r2_public_url
 from app.models import (
     Event, EventImage, User, TagProfile, EventLocation, ContentBlock,
@@ -107,16 +106,12 @@ def migrate_image(url, dry_run):
 
     resp = requests.get(key, timeout=60)
     resp.raise_for_status()
-    image = Image.open(io.BytesIO(resp.content))
-    try:
-        image = ImageOps.exif_transpose(image)
-    except Exception:
-        pass
+    # Same pool and variant code as /upload; a decoder crash fails this asset only
+    rendered = submit_cpu_bound(render_image_variants, resp.content, False).result()
 
     base = f"{uuid.uuid4()}.jpg"
-    r2_put(f"full/{base}", resize_image(image, (4000, 4000), quality=90), "image/jpeg")
-    r2_put(f"medium/{base}", resize_image(image, MEDIUM_SIZE, quality=85), "image/jpeg")
-    r2_put(f"thumbnails/{base}", resize_image(image, THUMBNAIL_SIZE, quality=80), "image/jpeg")
+    for name, image_bytes in rendered.variants.items():
+        r2_put(f"{IMAGE_VARIANTS[name][2]}/{base}", image_bytes, "image/jpeg")
 
     asset_map[key] = base
     save_map()
@@ -249,6 +244,7 @@ def main():
         stats = run(db, args.table, args.limit, args.dry_run)
     finally:
         db.close()
+        shutdown_cpu_pool()
 
     mode = 'DRY RUN' if args.dry_run else 'MIGRATED'
     print(f"\n[{mode}] scalar columns: {stats['scalar']} | html URLs: {stats['html']} | videos: {stats['video']} | errors: {stats['errors']}")
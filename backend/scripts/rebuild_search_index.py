@@ -0,0 +1,43 @@
+"""
+Rebuild the event full-text search index (events.search_vector on Postgres,
+the events_fts table on SQLite) from each event's title, summary and
+description text. Use after the search migration on SQLite, after bulk
+imports or seed scripts, or to repair drift. Idempotent.
+
+Usage:
+    cd backend
+    python scripts/rebuild_search_index.py
+    python scripts/rebuild_search_index.py --event-id 12 --event-id 34
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+import app.models  # noqa: F401
+from app.utils.event_search import rebuild_search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the event search index")
+    parser.add_argument("--event-id", type=int, action="append", dest="event_ids",
+                        help="Only re-index this event (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        indexed = rebuild_search_index(db, args.event_ids)
+        print(f"Indexed {indexed} events")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Rebuild the precomputed "following" timelines (timeline_entries) from
+events, follows, custom groups and mutes. Run once after the
+timeline_entries migration, after bulk imports, or to repair drift.
+Idempotent.
+
+Usage:
+    cd backend
+    python scripts/rebuild_timelines.py
+    python scripts/rebuild_timelines.py --user-id 12 --user-id 34
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+import app.models  # noqa: F401
+from app.models import TimelineEntry
+from app.services.timeline import rebuild_timelines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild following timelines")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids",
+                        help="Only rebuild this user's timeline (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild_timelines(db, args.user_ids)
+        db.commit()
+        total = db.query(TimelineEntry).count()
+        print(f"Rebuilt timelines; {total} timeline entries in total")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Rebuild the denormalized like_count / comment_count columns on events from
+the likes and comments tables. Fixes drift from writes that bypass the API
+(DB-level cascades on user deletion, seed scripts, manual SQL).
+Idempotent - only rows that have drifted are rewritten. Suitable for cron.
+
+Usage:
+    cd backend
+    python scripts/recount_event_counters.py
+    python scripts/recount_event_counters.py --event-id 12 --event-id 34
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+import app.models  # noqa: F401
+from app.utils.event_counters import recount_event_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recount event like/comment counters")
+    parser.add_argument("--event-id", type=int, action="append", dest="event_ids",
+                        help="Only recount this event (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        corrected = recount_event_counters(db, args.event_ids)
+        print(f"Corrected counters on {corrected} events")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Replay the endpoints' hot queries with and without the hot-filter indexes
+(migration d4f1b8c6e230) and report how each plan and timing changes.
+
+The queries are built the way the endpoints build them (follow checks,
+feed and profile pages, drafts, tag requests, comment threads, galleries,
+media likes, the viewer notification rate limit), against the busiest
+real rows: the user following the most people, the most-followed author,
+the most-commented event and the most-liked image.
+
+Both states are measured in one transaction: indexes that already exist
+are dropped for the "before" run, missing ones are created for the "after"
+run, and the database is left as it was found. DROP/CREATE INDEX lock the
+tables until then, so point it at a development copy of the database.
+
+Usage:
+    cd backend
+    python scripts/replay_query_plans.py
+    python scripts/replay_query_plans.py --runs 20 --plans
+    python scripts/replay_query_plans.py --viewer-id 7
+"""
+import sys
+import os
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, func, inspect
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+from app.models import (
+    User, Event, Follow, EventTag, Comment, EventImage, MediaLike, ViewerNotificationLog
+)
+from app.utils.privacy import filter_events_by_privacy
+
+# Indexes added by d4f1b8c6e230, looked up on the model tables
+HOT_INDEXES = {
+    "follows": ["ix_follows_follower_following_status", "ix_follows_following_status"],
+    "events": ["ix_events_live_start_date_id", "ix_events_author_published_start_date"],
+    "event_tags": ["ix_event_tags_tagged_user_status", "ix_event_tags_event_status"],
+    "comments": ["ix_comments_event_created_at"],
+    "event_images": ["ix_event_images_event_order"],
+    "viewer_notification_logs": ["ix_viewer_notification_logs_viewer_author_sent"],
+}
+TABLES = {
+    "follows": Follow, "events": Event, "event_tags": EventTag, "comments": Comment,
+    "event_images": EventImage, "viewer_notification_logs": ViewerNotificationLog,
+}
+
+
+def busiest(db, column):
+    """The value of column that occurs most often (0 if the table is empty)."""
+    row = db.query(column, func.count()).group_by(column).order_by(func.count().desc()).first()
+    return row[0] if row else 0
+
+
+def endpoint_queries(db, viewer, author_id, event_id, image_id):
+    """(name, query) pairs mirroring what the endpoints run."""
+    live = [Event.is_published == True, Event.is_deleted == False]
+    # start_date is selected for ORDER BY under the rules backend's DISTINCT
+    feed = filter_events_by_privacy(db.query(Event.id, Event.start_date).filter(*live), viewer, db)
+    return [
+        ("follow check", db.query(Follow.id).filter(
+            Follow.follower_id == viewer.id,
+            Follow.following_id == author_id,
+            Follow.status == "accepted"
+        ).limit(1)),
+        ("followers list", db.query(Follow.follower_id).filter(
+            Follow.following_id == author_id,
+            Follow.status == "accepted"
+        )),
+        ("feed page", feed.order_by(Event.start_date.desc(), Event.id.desc()).limit(20)),
+        ("profile events", db.query(Event.id).filter(
+            Event.author_id == author_id, *live
+        ).order_by(Event.start_date.desc()).limit(20)),
+        ("drafts", db.query(Event.id).filter(
+            Event.author_id == viewer.id,
+            Event.is_published == False,
+            Event.is_deleted == False
+        ).order_by(Event.start_date.desc())),
+        ("tag requests", db.query(EventTag.id).filter(
+            EventTag.tagged_user_id == viewer.id,
+            EventTag.status == "pending"
+        ).order_by(EventTag.created_at.desc())),
+        ("comment thread", db.query(Comment.id).filter(
+            Comment.event_id == event_id
+        ).order_by(Comment.created_at.asc())),
+        ("gallery", db.query(EventImage.id).filter(
+            EventImage.event_id == event_id
+        ).order_by(EventImage.order_index)),
+        ("media likes", db.query(MediaLike.id).filter(MediaLike.event_image_id == image_id)),
+        ("notify rate limit", db.query(ViewerNotificationLog.id).filter(
+            ViewerNotificationLog.viewer_id == viewer.id,
+            ViewerNotificationLog.event_author_id == author_id,
+            ViewerNotificationLog.sent_at > datetime.utcnow() - timedelta(days=1)
+        ).limit(1)),
+    ]
+
+
+def plan_lines(db, query):
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        return [line for (line,) in db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()]
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()]
+
+
+def access_paths(lines):
+    """The scan nodes of a plan, e.g. 'Index Scan using ix_... on follows'."""
+    paths = []
+    for line in lines:
+        line = line.strip().lstrip("->").strip()
+        if "Scan" in line or line.startswith(("SCAN", "SEARCH")):
+            paths.append(line.split("  (")[0])
+    return paths
+
+
+def measure(db, queries, runs):
+    results = {}
+    for name, query in queries:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            query.all()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[name] = (timings[len(timings) // 2], plan_lines(db, query))
+    return results
+
+
+def set_indexes(db, present):
+    """Create or drop the hot indexes in the current transaction so they all match present."""
+    connection = db.connection()
+    inspector = inspect(connection)
+    changed = []
+    for table_name, names in HOT_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        for index in TABLES[table_name].__table__.indexes:
+            if index.name not in names or (index.name in existing) == present:
+                continue
+            if present:
+                index.create(connection)
+            else:
+                index.drop(connection)
+            changed.append(index)
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("ANALYZE " + ", ".join(HOT_INDEXES)))
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare endpoint query plans with and without the hot-filter indexes")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per query (median reported)")
+    parser.add_argument("--viewer-id", type=int, help="Viewer to replay as (default: user following the most people)")
+    parser.add_argument("--plans", action="store_true", help="Print full plans, not just access paths")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    created = []
+    try:
+        viewer = db.query(User).filter(User.id == (args.viewer_id or busiest(db, Follow.follower_id))).first()
+        if not viewer:
+            print("ERROR: no viewer found")
+            sys.exit(1)
+        author_id = busiest(db, Follow.following_id)
+        event_id = busiest(db, Comment.event_id)
+        image_id = busiest(db, MediaLike.event_image_id)
+        print(f"Replaying as viewer={viewer.id} author={author_id} event={event_id} image={image_id}")
+
+        queries = endpoint_queries(db, viewer, author_id, event_id, image_id)
+        # Warm-up so the first query does not pay for cold caches
+        measure(db, queries, 1)
+
+        dropped = set_indexes(db, present=False)
+        before = measure(db, queries, args.runs)
+        created = set_indexes(db, present=True)
+        after = measure(db, queries, args.runs)
+        print(f"(dropped {len(dropped)} existing, created {len(created)} indexes for the comparison)\n")
+
+        print(f"{'query':<18} {'before ms':>10} {'after ms':>10} {'change':>8}")
+        for name, _ in queries:
+            before_ms, before_plan = before[name]
+            after_ms, after_plan = after[name]
+            change = (after_ms - before_ms) / before_ms * 100 if before_ms else 0.0
+            print(f"{name:<18} {before_ms:>10.2f} {after_ms:>10.2f} {change:>7.0f}%")
+            if args.plans:
+                for label, lines in (("before", before_plan), ("after", after_plan)):
+                    print(f"    -- {label}")
+                    for line in lines:
+                        print(f"    {line}")
+            else:
+                old_paths, new_paths = access_paths(before_plan), access_paths(after_plan)
+                if old_paths != new_paths:
+                    print(f"    before: {'; '.join(old_paths)}")
+                    print(f"    after:  {'; '.join(new_paths)}")
+    except Exception as e:
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        # Never keep the index changes. SQLite's driver commits DDL as it
+        # goes, so undo the creates there by hand; dropped ones are back.
+        if created and db.get_bind().dialect.name != "postgresql":
+            for index in created:
+                index.drop(db.connection())
+            db.commit()
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Flip users.content_visible to false for users whose trial has lapsed, so
+their events drop out of feeds. Trial expiry is the only time-based change
+to author visibility; Stripe webhooks maintain the flag for everything else.
+Idempotent. Run on a schedule (e.g. hourly cron).
+
+Usage:
+    cd backend
+    python scripts/sweep_expired_trials.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+# Import all models to resolve SQLAlchemy relationships
+import app.models  # noqa: F401
+from app.utils.privacy import sweep_expired_trials
+
+
+def main():
+    db = SessionLocal()
+    try:
+        hidden = sweep_expired_trials(db)
+        print(f"Hid content for {hidden} expired trial users")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,6 @@ import styles from './SmartImport.module.css'
  */
 
 const MAX_PHOTOS = 300
-const UPLOAD_CONCURRENCY = 3
 
 const MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
@@ -196,26 +195,21 @@ export default function SmartImport() {
     const records = photosRef.current
     const toUpload = album.photo_ids.map(id => records[id]).filter(Boolean)
 
-    let done = 0
+    // Photos already uploaded (a retry after a partial failure) are skipped
+    const pending = toUpload.filter(r => !r.url)
+    let done = toUpload.length - pending.length
     let failed = 0
-    const queue = [...toUpload]
-    const workers = Array.from({ length: UPLOAD_CONCURRENCY }, async () => {
-      while (queue.length > 0) {
-        const rec = queue.shift()
-        try {
-          if (!rec.url) {
-            const data = await apiService.uploadImage(rec.file)
-            rec.url = data.url || data.urls?.medium
-          }
-        } catch (e) {
-          console.warn('Upload failed for one photo:', e.message)
-          failed += 1
-        }
-        done += 1
-        setUploadDone(done)
+    setUploadDone(done)
+    await apiService.uploadImagesBatch(pending.map(r => r.file), (i, line) => {
+      if (line.ok) {
+        pending[i].url = line.url || line.urls?.medium
+      } else {
+        console.warn('Upload failed for one photo:', line.error)
+        failed += 1
       }
+      done += 1
+      setUploadDone(done)
     })
-    await Promise.all(workers)
     setPhotos([...records])
 
     const uploaded = toUpload.filter(r => r.url)
@@ -8,6 +8,12 @@ const API_URL = import.meta.env.VITE_API_URL
       : 'http://localhost:8000')
 const API_BASE = `${API_URL}/api/v1`
 
+// POST /upload/batch: requests stay under Vercel's 4.5MB body limit and the
+// backend's 50-file cap; a few requests run at once
+const BATCH_BODY_BUDGET = 4 * 1024 * 1024
+const BATCH_MAX_FILES = 50
+const BATCH_REQUEST_CONCURRENCY = 3
+
 // Generate short unique ID for request correlation
 const generateRequestId = () => {
   return Math.random().toString(36).substring(2, 10)
@@ -623,6 +629,100 @@ class ApiService {
     }
   }
 
+  // Upload many images via POST /upload/batch, which streams back one NDJSON
+  // line per image as it finishes. Files are packed into requests under the
+  // body limit; onResult(i, line) fires for files[i] as its line arrives.
+  // Resolves to the lines in input order: { ok: true, url, urls, metadata }
+  // or { ok: false, error }.
+  async uploadImagesBatch(files, onResult = null) {
+    const { data: { session } } = await supabase.auth.getSession()
+    const token = session?.access_token || localStorage.getItem('token')
+
+    const results = new Array(files.length).fill(null)
+    const settle = (i, line) => {
+      results[i] = line
+      if (onResult) onResult(i, line)
+    }
+
+    const sendChunk = async (chunk) => {
+      const formData = new FormData()
+      chunk.forEach(({ file }) => formData.append('files', file, file.name || 'image.jpg'))
+      try {
+        const response = await fetch(`${API_BASE}/upload/batch`, {
+          method: 'POST',
+          headers: { ...(token && { 'Authorization': `Bearer ${token}` }) },
+          body: formData
+        })
+        if (!response.ok) {
+          const error = await response.json().catch(() => ({}))
+          throw new Error(error.detail || 'Failed to upload images')
+        }
+
+        // Lines come in completion order; line.index is the position in this chunk
+        const handleLine = (text) => {
+          if (!text.trim()) return
+          const line = JSON.parse(text)
+          if (line.done) return
+          settle(chunk[line.index].index, line)
+        }
+        const reader = response.body.getReader()
+        const decoder = new TextDecoder()
+        let buffered = ''
+        for (;;) {
+          const { value, done } = await reader.read()
+          buffered += decoder.decode(value, { stream: !done })
+          const lines = buffered.split('\n')
+          buffered = lines.pop()
+          lines.forEach(handleLine)
+          if (done) break
+        }
+        handleLine(buffered)
+      } catch (error) {
+        console.error('Batch upload failed:', error)
+        chunk.forEach(({ index }) => {
+          if (!results[index]) settle(index, { ok: false, error: error.message })
+        })
+      }
+      // A dropped stream leaves items without a line
+      chunk.forEach(({ index }) => {
+        if (!results[index]) settle(index, { ok: false, error: 'Upload was interrupted' })
+      })
+    }
+
+    const inFlight = new Set()
+    const launch = async (chunk) => {
+      const request = sendChunk(chunk).finally(() => inFlight.delete(request))
+      inFlight.add(request)
+      if (inFlight.size >= BATCH_REQUEST_CONCURRENCY) await Promise.race(inFlight)
+    }
+
+    let chunk = []
+    let chunkBytes = 0
+    for (let i = 0; i < files.length; i++) {
+      let file
+      try {
+        // Same preparation as uploadImage(): HEIC to JPEG, then fit the body limit
+        file = this.isHeicFile(files[i]) ? await this.convertHeicToJpeg(files[i]) : files[i]
+        file = await this.compressImage(file)
+      } catch (error) {
+        console.error('Error preparing image:', error)
+        settle(i, { ok: false, error: error.message || 'Could not read image' })
+        continue
+      }
+      if (chunk.length > 0 && (chunkBytes + file.size > BATCH_BODY_BUDGET || chunk.length === BATCH_MAX_FILES)) {
+        await launch(chunk)
+        chunk = []
+        chunkBytes = 0
+      }
+      chunk.push({ index: i, file })
+      chunkBytes += file.size
+    }
+    if (chunk.length > 0) await launch(chunk)
+    await Promise.all(inFlight)
+
+    return results
+  }
+
   // Event Image methods (for caption system)
   // All images now go to Cloudinary for faster global uploads (fixes UK timeout issues)
   // preExtractedExif: Optional - if provided, skip EXIF extraction (for instant preview flow)